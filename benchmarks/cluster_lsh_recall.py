@@ -0,0 +1,177 @@
+"""Recall and speed of the LSH candidate index against brute-force clustering.
+
+Seeds a database with synthetic active stories, then replays a stream of
+query titles (near-duplicates of existing stories mixed with unrelated
+titles). For every query the brute-force pass picks the first story, in
+recency order, that clears the merge guards; the LSH pass does the same over
+its bucket candidates only. Recall is the share of brute-force matches the
+LSH pass also finds. The brute-force scan dominates the run time.
+
+Usage:
+    python benchmarks/cluster_lsh_recall.py [--stories 2000] [--queries 300]
+        [--bands 32] [--rows 2] [--seed 7]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from herald.cluster import StoryIndex, _can_merge, _numbers, cluster, normalize_title  # noqa: E402
+from herald.config import ClusterConfig  # noqa: E402
+from herald.db import Database  # noqa: E402
+from herald.lsh import LshIndex  # noqa: E402
+
+
+def _vocabulary(rng: random.Random, size: int) -> list[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(size)]
+
+
+def _variant(rng: random.Random, title: str, vocab: list[str]) -> str:
+    words = title.split()
+    for _ in range(rng.randint(1, 2)):
+        op = rng.random()
+        if op < 0.35 and len(words) > 5:
+            words.pop(rng.randrange(len(words)))
+        elif op < 0.7:
+            words[rng.randrange(len(words))] = rng.choice(vocab)
+        else:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(vocab))
+    if rng.random() < 0.2:
+        words = ["Show", "HN:"] + words
+    return " ".join(words)
+
+
+def _seed(db: Database, titles: list[str], now: int) -> None:
+    """One active single-article story per title, written directly."""
+    db.execute("INSERT INTO sources (id, name, weight) VALUES ('bench', 'Bench', 0.5)")
+    with db.transaction():
+        db.executemany(
+            """
+            INSERT INTO articles
+                (id, ulid, url_original, url_canonical, title, origin_source_id,
+                 collected_at, score_base, scored_at)
+            VALUES (?, ?, ?, ?, ?, 'bench', ?, 1.0, ?)
+            """,
+            [
+                (i + 1, f"s{i:06d}", f"https://e.com/{i}", f"https://e.com/{i}", t, now - i, now - i)
+                for i, t in enumerate(titles)
+            ],
+        )
+        db.executemany(
+            """
+            INSERT INTO stories
+                (id, ulid, title, score, canonical_article_id, first_seen, last_updated, status)
+            VALUES (?, ?, ?, 1.0, ?, ?, ?, 'active')
+            """,
+            [(i + 1, f"S{i:06d}", t, i + 1, now - i, now - i) for i, t in enumerate(titles)],
+        )
+        db.executemany(
+            "INSERT INTO story_articles (story_id, article_id) VALUES (?, ?)",
+            [(i + 1, i + 1) for i in range(len(titles))],
+        )
+
+
+def _first_match(norm: str, collected_at: int, candidates, cfg: ClusterConfig):
+    numbers = _numbers(norm)
+    for story in candidates:
+        if _can_merge(norm, numbers, set(), None, collected_at, story, cfg):
+            return story.id
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stories", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--bands", type=int, default=ClusterConfig.lsh_bands)
+    parser.add_argument("--rows", type=int, default=ClusterConfig.lsh_rows)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocab = _vocabulary(rng, 4000)
+    base = [" ".join(rng.choice(vocab) for _ in range(rng.randint(6, 12))) for _ in range(args.stories)]
+    queries = [
+        _variant(rng, rng.choice(base), vocab) if rng.random() < 0.6
+        else " ".join(rng.choice(vocab) for _ in range(rng.randint(6, 12)))
+        for _ in range(args.queries)
+    ]
+    now = int(time.time())
+    cfg = ClusterConfig()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / "bench.db")
+        _seed(db, base, now)
+        index = StoryIndex.load(db)
+        t0 = time.perf_counter()
+        lsh = LshIndex.load(db, args.bands, args.rows, ((e.id, e.norm) for e in index.ordered()))
+        backfill_secs = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        LshIndex.load(db, args.bands, args.rows, ((e.id, e.norm) for e in index.ordered()))
+        reload_secs = time.perf_counter() - t0
+
+        brute_hits = lsh_hits = agree = 0
+        candidate_total = 0
+        brute_secs = lsh_secs = 0.0
+        for title in queries:
+            norm = normalize_title(title)
+
+            t0 = time.perf_counter()
+            brute = _first_match(norm, now, index.ordered(), cfg)
+            brute_secs += time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            candidates = index.ordered_subset(lsh.candidates(lsh.keys(norm)))
+            found = _first_match(norm, now, candidates, cfg)
+            lsh_secs += time.perf_counter() - t0
+
+            candidate_total += len(candidates)
+            brute_hits += brute is not None
+            lsh_hits += found is not None
+            agree += brute is not None and brute == found
+        db.close()
+
+    # End-to-end: the query stream clustered on top of the seeded stories
+    # (includes the one-off LSH backfill for the lsh run)
+    timings = {}
+    for mode in ("brute", "lsh"):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(Path(tmp) / "bench.db")
+            _seed(db, base, now)
+            mode_cfg = replace(cfg, candidate_index=mode, lsh_bands=args.bands, lsh_rows=args.rows)
+            db.executemany(
+                """
+                INSERT INTO articles
+                    (ulid, url_original, url_canonical, title, origin_source_id,
+                     collected_at, score_base, scored_at)
+                VALUES (?, ?, ?, ?, 'bench', ?, 1.0, ?)
+                """,
+                [(f"q{i:06d}", f"https://q.com/{i}", f"https://q.com/{i}", t, now, now)
+                 for i, t in enumerate(queries)],
+            )
+            t0 = time.perf_counter()
+            result = cluster(db, mode_cfg)
+            timings[mode] = (time.perf_counter() - t0, result.stories_created)
+            db.close()
+
+    recall = agree / brute_hits if brute_hits else 1.0
+    print(f"stories={args.stories} queries={args.queries} bands={args.bands} rows={args.rows}")
+    print(f"lsh backfill / reload:      {backfill_secs:8.2f}s / {reload_secs:.2f}s")
+    print(f"candidate scan brute / lsh: {brute_secs:8.2f}s / {lsh_secs:.2f}s")
+    print(f"avg lsh candidates:         {candidate_total / len(queries):8.1f} of {len(index)}")
+    print(f"matches brute / lsh:        {brute_hits:8d} / {lsh_hits}")
+    print(f"recall vs brute:            {recall:8.3f}")
+    for mode, (secs, created) in timings.items():
+        print(f"cluster() {mode:5s}:            {secs:8.2f}s  stories_created={created}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Write and read throughput of the SQLite connection profiles.
+
+Builds a synthetic database by ingesting batches of raw items, replays
+batched points updates against copies of it, then runs repeated brief
+generation and FTS searches. Each phase is timed under the pre-profile
+PRAGMAs ("legacy": synchronous=FULL, 2 MiB cache) and under every named
+profile in herald.db.PROFILES.
+
+Usage:
+    python benchmarks/db_profiles.py [--items 60000] [--batch 2000] [--reads 30]
+        [--rounds 50]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from herald.db import PROFILES, Database, DbProfile  # noqa: E402
+from herald.ingest import ingest_items  # noqa: E402
+from herald.models import RawItem, Source  # noqa: E402
+from herald.project import project_brief  # noqa: E402
+
+LEGACY = DbProfile(synchronous="FULL", cache_size_mb=2, temp_store="DEFAULT")
+WORDS = (
+    "python rust release agent model llm open source compiler kernel database "
+    "benchmark paper study framework tool cloud gpu inference training launch"
+).split()
+
+
+def _items(rng: random.Random, count: int, start: int) -> list[RawItem]:
+    return [
+        RawItem(
+            url=f"https://example.com/{rng.randrange(count)}-{start + i}",
+            title=" ".join(rng.choice(WORDS) for _ in range(8)),
+            source_id="bench",
+            published_at=1_700_000_000 + i,
+            points=rng.randrange(500),
+        )
+        for i in range(count)
+    ]
+
+
+def _write_phase(path: Path, profile: DbProfile, batches: list[list[RawItem]]) -> float:
+    sources = {"bench": Source(id="bench", name="Bench", weight=0.5)}
+    with Database(path, profile=profile) as db:
+        db.execute("INSERT INTO sources (id, name, weight) VALUES ('bench', 'Bench', 0.5)")
+        t0 = time.perf_counter()
+        for batch in batches:
+            ingest_items(db, batch, sources, topic_rules={"ai": ["llm", "model"]})
+        db.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        return time.perf_counter() - t0
+
+
+def _update_phase(path: Path, profile: DbProfile, rounds: int, batch: int) -> float:
+    """Points refreshes on random existing articles, as re-seen URLs cause."""
+    rng = random.Random(5)
+    with Database(path, profile=profile) as db:
+        urls = [r[0] for r in db.execute("SELECT url_canonical FROM articles")]
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            with db.transaction():
+                db.executemany(
+                    "UPDATE articles SET points = ?, score_base = ?, scored_at = ? WHERE url_canonical = ?",
+                    [(rng.randrange(1000), rng.random(), 0, rng.choice(urls)) for _ in range(batch)],
+                )
+        db.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        return time.perf_counter() - t0
+
+
+def _seed_stories(path: Path, count: int) -> None:
+    now = int(time.time())
+    with Database(path) as db:
+        ids = [r[0] for r in db.execute("SELECT id FROM articles LIMIT ?", (count,))]
+        with db.transaction():
+            db.executemany(
+                """
+                INSERT INTO stories (id, ulid, title, score, canonical_article_id, first_seen, last_updated)
+                SELECT id, 'S' || ulid, title, score_base, id, ?, ? FROM articles WHERE id = ?
+                """,
+                [(now, now, aid) for aid in ids],
+            )
+            db.executemany(
+                "INSERT INTO story_articles (story_id, article_id) VALUES (?, ?)",
+                [(aid, aid) for aid in ids],
+            )
+        db.maintain()
+
+
+def _read_phase(path: Path, profile: DbProfile, reads: int) -> float:
+    with Database(path, profile=profile) as db:
+        t0 = time.perf_counter()
+        for i in range(reads):
+            project_brief(db, max_stories=500)
+            db.execute(
+                "SELECT rowid FROM articles_fts WHERE articles_fts MATCH ? LIMIT 200",
+                (WORDS[i % len(WORDS)],),
+            ).fetchall()
+            db.execute(
+                "SELECT origin_source_id, COUNT(*), AVG(points) FROM articles GROUP BY 1"
+            ).fetchall()
+        return time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=60000)
+    parser.add_argument("--batch", type=int, default=2000)
+    parser.add_argument("--reads", type=int, default=30)
+    parser.add_argument("--rounds", type=int, default=50, help="update transactions")
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    batches = [
+        _items(rng, args.batch, start)
+        for start in range(0, args.items, args.batch)
+    ]
+    profiles = {"legacy": LEGACY, **PROFILES}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        print(f"items={args.items} batch={args.batch} reads={args.reads}")
+        seeded: Path | None = None
+        for name, profile in profiles.items():
+            path = tmp_path / f"{name}.db"
+            secs = _write_phase(path, profile, batches)
+            print(f"ingest  {name:12s} {secs:7.2f}s  {args.items / secs:9.0f} items/s")
+            seeded = seeded or path
+
+        for name, profile in profiles.items():
+            path = tmp_path / f"update-{name}.db"
+            shutil.copy(seeded, path)
+            secs = _update_phase(path, profile, args.rounds, args.batch)
+            rows = args.rounds * args.batch
+            print(f"update  {name:12s} {secs:7.2f}s  {rows / secs:9.0f} rows/s")
+
+        read_path = tmp_path / "read.db"
+        shutil.copy(seeded, read_path)
+        _seed_stories(read_path, 2000)
+        for name, profile in profiles.items():
+            _read_phase(read_path, profile, 1)  # warm the OS page cache
+            secs = _read_phase(read_path, profile, args.reads)
+            print(f"read    {name:12s} {secs:7.2f}s  {secs / args.reads * 1000:9.1f} ms/iteration")
+
+
+if __name__ == "__main__":
+    main()
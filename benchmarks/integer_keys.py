@@ -0,0 +1,216 @@
+"""Size and join cost of ULID TEXT keys versus integer keys (migration 0010).
+
+Builds a database at schema version 9, where articles and stories are keyed
+by 26-character ULIDs, fills it with synthetic articles, mentions, topics
+and stories, and times the joins the pipeline runs. A copy is then opened
+with the current schema, which applies migration 0010 (timed), and the same
+queries run again. The SQL text is identical on both sides: only the key
+types differ. Sizes are per table including its indexes, after VACUUM.
+
+Usage:
+    python benchmarks/integer_keys.py [--articles 100000] [--repeat 5] [--seed 11]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import herald.db as db_mod  # noqa: E402
+from herald.db import Database  # noqa: E402
+from herald.ulid import generate_ulid  # noqa: E402
+
+TABLES = ("articles", "mentions", "article_topics", "stories", "story_articles", "story_topics", "story_lsh")
+TOPICS = ("ai", "rust", "python", "security", "cloud", "hardware", "research", "release")
+NOW = 1_800_000_000
+
+QUERIES = {
+    # StoryIndex.load: members of active stories
+    "story index members": """
+        SELECT sa.story_id, a.url_canonical, at.topic
+        FROM story_articles sa
+        JOIN stories s ON s.id = sa.story_id AND s.status = 'active'
+        JOIN articles a ON a.id = sa.article_id
+        LEFT JOIN article_topics at ON at.article_id = sa.article_id
+    """,
+    # cluster(): the unclustered anti-join over every article
+    "unclustered anti-join": """
+        SELECT COUNT(*) FROM articles a
+        WHERE a.id NOT IN (SELECT article_id FROM story_articles)
+    """,
+    # fetch_brief_stories: articles and sources of the top 500 stories
+    "brief articles (500)": """
+        SELECT sa.story_id, a.url_canonical, a.title, s.name, s.id
+        FROM story_articles sa
+        JOIN articles a ON a.id = sa.article_id
+        JOIN sources s ON s.id = a.origin_source_id
+        WHERE sa.story_id IN (SELECT id FROM stories ORDER BY score DESC LIMIT 500)
+        ORDER BY a.score_base DESC
+    """,
+    # learn_intervals: mentions joined to their articles
+    "mentions x articles": """
+        SELECT m.source_id, COALESCE(a.published_at, m.discovered_at)
+        FROM mentions m JOIN articles a ON a.id = m.article_id
+    """,
+    # Full story -> article -> topic fan-out
+    "stories x articles x topics": """
+        SELECT COUNT(*) FROM stories s
+        JOIN story_articles sa ON sa.story_id = s.id
+        JOIN articles a ON a.id = sa.article_id
+        JOIN article_topics t ON t.article_id = a.id
+    """,
+}
+
+
+@contextmanager
+def _schema_9():
+    """Open databases as if migration 0010 did not exist yet."""
+    real = db_mod._migration_files
+    files = real()
+    db_mod._migration_files = lambda: tuple(f for f in files if f[0] <= 9)
+    try:
+        yield
+    finally:
+        db_mod._migration_files = real
+
+
+def _seed_v9(path: Path, articles: int, rng: random.Random) -> None:
+    """Write a schema-9 database the way the pre-0010 code would have."""
+    with _schema_9():
+        db = Database(path)
+    with db:
+        db.execute("INSERT INTO sources (id, name, weight) VALUES ('hn', 'Hacker News', 0.5)")
+        db.execute("INSERT INTO sources (id, name, weight) VALUES ('rss', 'Feeds', 0.3)")
+        article_ids = [generate_ulid() for _ in range(articles)]
+        with db.transaction():
+            db.executemany(
+                """
+                INSERT INTO articles
+                    (id, url_original, url_canonical, title, origin_source_id, published_at,
+                     collected_at, points, score_base, scored_at, cluster_pending)
+                VALUES (?, ?, ?, ?, 'hn', ?, ?, ?, ?, ?, 0)
+                """,
+                [
+                    (aid, f"https://e.com/{i}", f"https://e.com/{i}", f"Headline number {i}",
+                     NOW - i * 30, NOW - i * 30, rng.randrange(500), rng.random(), NOW)
+                    for i, aid in enumerate(article_ids)
+                ],
+            )
+            db.executemany(
+                "INSERT INTO mentions (article_id, source_id, url, points, discovered_at) VALUES (?, ?, ?, 0, ?)",
+                [
+                    (aid, src, f"https://e.com/{i}", NOW - i * 30)
+                    for i, aid in enumerate(article_ids)
+                    for src in (("hn", "rss") if i % 3 == 0 else ("hn",))
+                ],
+            )
+            db.executemany(
+                "INSERT INTO article_topics (article_id, topic) VALUES (?, ?)",
+                [(aid, t) for aid in article_ids for t in rng.sample(TOPICS, rng.randint(1, 2))],
+            )
+            # Stories of 1-5 articles; the newest fifth are active
+            story_rows, links = [], []
+            i = 0
+            while i < articles:
+                size = rng.randint(1, 5)
+                sid = generate_ulid()
+                members = article_ids[i:i + size]
+                status = "active" if i < articles // 5 else "inactive"
+                story_rows.append((sid, f"Story {i}", rng.random() * 5, members[0], NOW - i * 30, NOW - i * 30, status))
+                links += [(sid, aid) for aid in members]
+                i += size
+            db.executemany(
+                """
+                INSERT INTO stories
+                    (id, title, score, canonical_article_id, first_seen, last_updated, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                story_rows,
+            )
+            db.executemany("INSERT INTO story_articles (story_id, article_id) VALUES (?, ?)", links)
+            db.executemany(
+                "INSERT INTO story_topics (story_id, topic) VALUES (?, ?)",
+                [(row[0], t) for row in story_rows for t in rng.sample(TOPICS, 2)],
+            )
+            db.executemany(
+                "INSERT INTO story_lsh (scheme, bucket, story_id) VALUES ('b32r2', ?, ?)",
+                [
+                    (rng.getrandbits(63), row[0])
+                    for row in story_rows if row[6] == "active"
+                    for _ in range(32)
+                ],
+            )
+
+
+def _sizes(db: Database) -> dict[str, int]:
+    """Bytes per table, its indexes included."""
+    rows = db.execute(
+        """
+        SELECT m.tbl_name, SUM(d.pgsize)
+        FROM dbstat d JOIN sqlite_master m ON m.name = d.name
+        GROUP BY m.tbl_name
+        """
+    ).fetchall()
+    return {row[0]: row[1] for row in rows}
+
+
+def _timings(db: Database, repeat: int) -> dict[str, float]:
+    """Best-of-*repeat* wall time per query, in milliseconds."""
+    result = {}
+    for name, sql in QUERIES.items():
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            db.execute(sql).fetchall()
+            best = min(best, time.perf_counter() - t0)
+        result[name] = best * 1000
+    return result
+
+
+def _measure(path: Path, repeat: int) -> tuple[int, dict[str, int], dict[str, float]]:
+    with Database(path) as db:
+        db.execute("VACUUM")
+        db.execute("ANALYZE")
+        return db.size_bytes(), _sizes(db), _timings(db, repeat)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before_path = Path(tmp) / "v9.db"
+        after_path = Path(tmp) / "v10.db"
+        _seed_v9(before_path, args.articles, random.Random(args.seed))
+        shutil.copy(before_path, after_path)
+        with _schema_9():
+            before = _measure(before_path, args.repeat)
+
+        t0 = time.perf_counter()
+        Database(after_path).close()
+        migrate_secs = time.perf_counter() - t0
+        after = _measure(after_path, args.repeat)
+
+    print(f"articles={args.articles}  migration 0010: {migrate_secs:.2f}s")
+    print(f"{'':28s} {'ULID TEXT':>12s} {'INTEGER':>12s} {'change':>8s}")
+    print(f"{'file size':28s} {before[0] / 1e6:10.1f}MB {after[0] / 1e6:10.1f}MB {after[0] / before[0] - 1:8.0%}")
+    for table in TABLES:
+        b, a = before[1].get(table, 0), after[1].get(table, 0)
+        print(f"  {table:26s} {b / 1e6:10.1f}MB {a / 1e6:10.1f}MB {a / b - 1 if b else 0:8.0%}")
+    for name in QUERIES:
+        b, a = before[2][name], after[2][name]
+        print(f"{name:28s} {b:10.1f}ms {a:10.1f}ms {a / b - 1:8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Monthly archive databases: archive/YYYY-MM.db next to herald.db.
+
+retention.move_to_archive_days moves inactive stories, with their articles,
+mentions and topics, out of herald.db into the file for the month the story
+was last updated, so the hot database only holds recent data. Each archive
+is a full Herald database (same migrations), so the usual queries run
+against it once it is ATTACHed under a schema name.
+
+Archives are attached only when a request needs them: a story lookup
+attaches the one month recorded in ``archived_stories``, a search the
+months of its since/until range. SQLite allows ten attached databases per
+connection, so callers attach one month at a time.
+"""
+from __future__ import annotations
+
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+from herald.db import Database, schema_version
+
+ARCHIVE_DIR = "archive"
+
+
+def archive_dir(db: Database) -> Path:
+    return Path(db.path).parent / ARCHIVE_DIR
+
+
+def archive_path(db: Database, month: str) -> Path:
+    return archive_dir(db) / f"{month}.db"
+
+
+def month_of(ts: int) -> str:
+    """'YYYY-MM' (UTC) of a Unix timestamp."""
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m")
+
+
+def month_bounds(month: str) -> tuple[int, int]:
+    """[start, end) Unix timestamps of a 'YYYY-MM' month."""
+    start = datetime.strptime(month, "%Y-%m").replace(tzinfo=timezone.utc)
+    end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+    return int(start.timestamp()), int(end.timestamp())
+
+
+def archived_months(db: Database, since: int, until: int | None = None) -> list[str]:
+    """Months with an archive file between *since* and *until* (default now), oldest first."""
+    first, last = month_of(since), month_of(int(time.time()) if until is None else until)
+    return sorted(
+        p.stem for p in archive_dir(db).glob("????-??.db") if first <= p.stem <= last
+    )
+
+
+@contextmanager
+def attached(db: Database, month: str, *, write: bool = False) -> Iterator[str | None]:
+    """ATTACH archive/<month>.db and yield its schema name, DETACHing after.
+
+    Readers get a read-only attachment and None when the file is missing or
+    has another schema version (the next move into it migrates it). With
+    *write* the file is created or migrated first. Must not be called inside
+    a transaction.
+    """
+    path = archive_path(db, month)
+    schema = "archive_" + month.replace("-", "_")
+    if write:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        Database(path).close()
+        db.execute(f"ATTACH DATABASE ? AS {schema}", (str(path),))
+    else:
+        if not path.exists():
+            yield None
+            return
+        db.execute(f"ATTACH DATABASE ? AS {schema}", (f"{path.resolve().as_uri()}?mode=ro",))
+    try:
+        version = db.execute(f"PRAGMA {schema}.user_version").fetchone()[0]
+        if version != schema_version():
+            print(
+                f"[archive] WARN skipping {path}: schema version {version}, expected {schema_version()}",
+                file=sys.stderr,
+            )
+            yield None
+        else:
+            yield schema
+    finally:
+        db.execute(f"DETACH DATABASE {schema}")
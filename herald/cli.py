@@ -1,22 +1,27 @@
 """Herald v2 CLI entry point.
 
-Subcommands: init, run, brief, status
+Subcommands: init, run, daemon, brief, serve, status, import, compact
 Data directory: XDG_DATA_HOME/herald (default ~/.local/share/herald),
   fallback to ~/.herald for legacy installs.
 Override via --data-dir flag or HERALD_DATA_DIR env var.
+
+Only sqlite3-level modules are imported at load time. Each command imports
+what it needs when it runs, so ``herald status`` and ``herald brief`` (run
+by hooks with a tight timeout) never load yaml, httpx or the pipeline.
+tests/v2/test_cli_startup.py holds the import-time budget.
 """
 from __future__ import annotations
 
 import argparse
-import datetime
 import os
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from herald.db import PROFILES, Database, profile_from_config
 
-from herald.config import load_config
-from herald.db import Database
-from herald.pipeline import run_pipeline
-from herald.project import project_brief
+if TYPE_CHECKING:
+    from herald.metrics import StageMetrics
 
 
 def _default_data_dir() -> Path:
@@ -82,6 +87,9 @@ def cmd_init(args: argparse.Namespace) -> int:
 
 
 def cmd_run(args: argparse.Namespace) -> int:
+    from herald.config import load_config
+    from herald.pipeline import run_pipeline
+
     data_dir = _resolve_data_dir(args)
     config_path = data_dir / "config.yaml"
 
@@ -104,10 +112,13 @@ def cmd_run(args: argparse.Namespace) -> int:
     try:
         config = load_config(config_path)
         db_path = data_dir / "herald.db"
-        db = Database(db_path)
+        db = Database(db_path, profile=profile_from_config(config.database))
         try:
             adapter_map = {s.id: s.type for s in config.sources}
-            result = run_pipeline(config, db, adapter_map=adapter_map, data_dir=data_dir)
+            result = run_pipeline(
+                config, db, adapter_map=adapter_map, data_dir=data_dir,
+                force_all=args.force_all,
+            )
         finally:
             db.close()
 
@@ -123,7 +134,47 @@ def cmd_run(args: argparse.Namespace) -> int:
         return 1
 
 
+def cmd_daemon(args: argparse.Namespace) -> int:
+    import signal
+    from contextlib import ExitStack
+
+    from herald.daemon import Daemon
+    from herald.lockfile import exclusive
+
+    data_dir = _resolve_data_dir(args)
+    config_path = data_dir / "config.yaml"
+
+    if not config_path.exists():
+        print(
+            f"Error: config file not found: {config_path}\n"
+            "Run 'herald init' to create a default configuration.",
+            file=sys.stderr,
+        )
+        return 1
+
+    with ExitStack() as stack:
+        try:
+            stack.enter_context(exclusive(data_dir, "daemon"))
+            daemon = Daemon(data_dir)
+        except Exception as exc:
+            print(f"Error starting daemon: {exc}", file=sys.stderr)
+            return 1
+
+        # SIGTERM (service managers) stops after the current run, like Ctrl-C
+        signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop.set())
+        print(f"herald daemon running (data dir: {data_dir})", file=sys.stderr)
+        try:
+            daemon.serve()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            daemon.close()
+    return 0
+
+
 def cmd_brief(args: argparse.Namespace) -> int:
+    from herald.project import cached_brief
+
     data_dir = _resolve_data_dir(args)
     db_path = data_dir / "herald.db"
 
@@ -136,9 +187,11 @@ def cmd_brief(args: argparse.Namespace) -> int:
         return 1
 
     try:
-        db = Database(db_path)
+        db = Database(db_path, profile=PROFILES["read-mostly"])
         try:
-            brief = project_brief(db)
+            brief = cached_brief(
+                db, hours=args.hours, max_stories=args.max_stories, topic_filter=args.topic
+            )
         finally:
             db.close()
 
@@ -153,7 +206,67 @@ def cmd_brief(args: argparse.Namespace) -> int:
         return 1
 
 
-def cmd_status(args: argparse.Namespace) -> int:
+def cmd_import(args: argparse.Namespace) -> int:
+    from herald.config import load_config
+    from herald.importer import DEFAULT_BATCH_SIZE, import_jsonl, legacy_raw_dir
+    from herald.ingest import sync_sources
+    from herald.lockfile import exclusive
+    from herald.manifest import remove_manifest
+
+    data_dir = _resolve_data_dir(args)
+    config_path = data_dir / "config.yaml"
+
+    if not config_path.exists():
+        print(
+            f"Error: config file not found: {config_path}\n"
+            "Run 'herald init' to create a default configuration.",
+            file=sys.stderr,
+        )
+        return 1
+
+    if args.paths:
+        paths = [Path(p) for p in args.paths]
+    else:
+        paths = sorted(legacy_raw_dir().glob("*.jsonl"))
+    missing = [p for p in paths if not p.is_file()]
+    if missing:
+        print(f"Error: file not found: {missing[0]}", file=sys.stderr)
+        return 1
+    if not paths:
+        print(f"Error: no JSONL files found in {legacy_raw_dir()}", file=sys.stderr)
+        return 1
+
+    try:
+        config = load_config(config_path)
+        # One write transaction for the whole import: never alongside the daemon
+        with exclusive(data_dir, "import"):
+            db = Database(data_dir / "herald.db", profile=profile_from_config(config.database))
+            try:
+                sync_sources(db, config.sources)
+                result = import_jsonl(
+                    db, paths, config.sources,
+                    topic_rules=config.topics or None,
+                    batch_size=args.batch_size or DEFAULT_BATCH_SIZE,
+                )
+            finally:
+                db.close()
+        # Its counts predate the import; status falls back to SQLite until the next run
+        remove_manifest(data_dir)
+
+        print(
+            f"Imported {result.rows_read} rows from {len(paths)} file(s): "
+            f"{result.articles_new} new, {result.articles_updated} updated, "
+            f"{result.skipped} skipped"
+        )
+        print(f"{result.seconds:.2f}s ({result.rows_per_sec:.0f} rows/s)")
+        return 0
+
+    except Exception as exc:
+        print(f"Error importing: {exc}", file=sys.stderr)
+        return 1
+
+
+def cmd_compact(args: argparse.Namespace) -> int:
     data_dir = _resolve_data_dir(args)
     db_path = data_dir / "herald.db"
 
@@ -168,26 +281,139 @@ def cmd_status(args: argparse.Namespace) -> int:
     try:
         db = Database(db_path)
         try:
-            article_count = db.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
-            story_count = db.execute(
-                "SELECT COUNT(*) FROM stories WHERE status = 'active'"
-            ).fetchone()[0]
-            last_run_row = db.execute(
-                "SELECT finished_at FROM pipeline_runs ORDER BY id DESC LIMIT 1"
-            ).fetchone()
+            before, after = db.compact()
         finally:
             db.close()
+    except Exception as exc:
+        print(f"Error compacting database: {exc}", file=sys.stderr)
+        return 1
+
+    mb = 1024 * 1024
+    print(f"Compacted {db_path}: {before / mb:.1f} MB -> {after / mb:.1f} MB")
+    return 0
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    import signal
+
+    from herald.server import DEFAULT_PORT, open_server
+
+    data_dir = _resolve_data_dir(args)
+    db_path = data_dir / "herald.db"
+
+    if not db_path.exists():
+        print(
+            f"Error: database not found: {db_path}\n"
+            "Run 'herald init' and 'herald run' first.",
+            file=sys.stderr,
+        )
+        return 1
+
+    try:
+        server = open_server(
+            db_path,
+            host=args.host,
+            port=args.port or DEFAULT_PORT,
+            socket_path=Path(args.socket) if args.socket else None,
+        )
+    except Exception as exc:
+        print(f"Error starting server: {exc}", file=sys.stderr)
+        return 1
+
+    where = args.socket or f"http://{args.host}:{args.port or DEFAULT_PORT}"
+    print(f"herald serve listening on {where}", file=sys.stderr)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def _print_stage_metrics(runs: list[tuple[int, list[StageMetrics]]]) -> None:
+    """Wall time per stage for each run, the average, and the latest run in detail."""
+    print()
+    if not runs:
+        print("No stage metrics recorded yet.")
+        return
+    stages: list[str] = []
+    for _, metrics in reversed(runs):
+        for m in metrics:
+            if m.stage not in stages:
+                stages.append(m.stage)
+
+    print(f"Stage wall time, ms (last {len(runs)} runs)")
+    print(f"{'run':>6}" + "".join(f"{name:>12}" for name in stages) + f"{'total':>12}")
+    totals: dict[str, list[float]] = {name: [] for name in stages}
+    for run_id, metrics in runs:
+        by_stage = {m.stage: m.wall_ms for m in metrics}
+        cells = ""
+        for name in stages:
+            if name in by_stage:
+                totals[name].append(by_stage[name])
+                cells += f"{by_stage[name]:>12.1f}"
+            else:
+                cells += f"{'-':>12}"
+        print(f"{run_id:>6}{cells}{sum(by_stage.values()):>12.1f}")
+    avgs = {name: sum(v) / len(v) for name, v in totals.items() if v}
+    print(
+        f"{'avg':>6}"
+        + "".join(f"{avgs[name]:>12.1f}" if name in avgs else f"{'-':>12}" for name in stages)
+        + f"{sum(avgs.values()):>12.1f}"
+    )
+
+    run_id, metrics = runs[0]
+    print()
+    print(f"Run {run_id}")
+    print(f"{'stage':<12}{'wall ms':>10}{'cpu ms':>10}{'sql':>8}{'in':>8}{'out':>8}{'rss MB':>9}")
+    for m in metrics:
+        items_in = "-" if m.items_in is None else str(m.items_in)
+        items_out = "-" if m.items_out is None else str(m.items_out)
+        rss = "-" if m.peak_rss_bytes is None else f"{m.peak_rss_bytes / (1024 * 1024):.1f}"
+        print(
+            f"{m.stage:<12}{m.wall_ms:>10.1f}{m.cpu_ms:>10.1f}{m.sql_statements:>8}"
+            f"{items_in:>8}{items_out:>8}{rss:>9}"
+        )
+
+
+def cmd_status(args: argparse.Namespace) -> int:
+    from herald.manifest import read_manifest
+    from herald.query import render_status, status_summary
+
+    data_dir = _resolve_data_dir(args)
+    db_path = data_dir / "herald.db"
 
-        last_run = "never"
-        if last_run_row is not None and last_run_row[0] is not None:
-            ts = last_run_row[0]
-            last_run = datetime.datetime.fromtimestamp(
-                ts, tz=datetime.timezone.utc
-            ).strftime("%Y-%m-%dT%H:%M:%SZ")
+    if not db_path.exists():
+        print(
+            f"Error: database not found: {db_path}\n"
+            "Run 'herald init' first.",
+            file=sys.stderr,
+        )
+        return 1
+
+    # The last run's status.json answers without opening SQLite
+    manifest = None if args.metrics else read_manifest(data_dir)
+    if manifest is not None:
+        print(render_status(manifest), end="")
+        return 0
+
+    try:
+        db = Database(db_path, profile=PROFILES["read-mostly"])
+        try:
+            status = status_summary(db)
+            stage_runs = []
+            if args.metrics:
+                from herald.metrics import load_stage_metrics
+
+                stage_runs = load_stage_metrics(db, args.runs)
+        finally:
+            db.close()
 
-        print(f"Articles: {article_count}")
-        print(f"Stories:  {story_count}")
-        print(f"Last run: {last_run}")
+        print(render_status(status), end="")
+        if args.metrics:
+            _print_stage_metrics(stage_runs)
         return 0
 
     except FileNotFoundError as exc:
@@ -213,9 +439,68 @@ def build_parser() -> argparse.ArgumentParser:
     subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
 
     subparsers.add_parser("init", help="Initialize data directory and database")
-    subparsers.add_parser("run", help="Run the collection pipeline")
-    subparsers.add_parser("brief", help="Print latest brief to stdout")
-    subparsers.add_parser("status", help="Show database statistics")
+    run_parser = subparsers.add_parser("run", help="Run the collection pipeline")
+    run_parser.add_argument(
+        "--force-all",
+        action="store_true",
+        help="Collect every source, ignoring adaptive per-source due times",
+    )
+    subparsers.add_parser(
+        "daemon", help="Run the pipeline on schedule in one long-lived process"
+    )
+    brief_parser = subparsers.add_parser("brief", help="Print latest brief to stdout")
+    brief_parser.add_argument(
+        "--hours", type=int, default=24,
+        help="Look-back window in hours (default: 24)",
+    )
+    brief_parser.add_argument(
+        "--max-stories", type=int, default=25, metavar="N",
+        help="Maximum number of stories (default: 25)",
+    )
+    brief_parser.add_argument(
+        "--topic", default=None,
+        help="Only stories tagged with this topic",
+    )
+    serve_parser = subparsers.add_parser(
+        "serve", help="Serve brief, stories, search and status from a local read-only server"
+    )
+    serve_parser.add_argument(
+        "--host", default="127.0.0.1",
+        help="Loopback address to listen on (default: 127.0.0.1)",
+    )
+    serve_parser.add_argument(
+        "--port", type=int, default=None,
+        help="TCP port (default: 8765)",
+    )
+    serve_parser.add_argument(
+        "--socket", metavar="PATH", default=None,
+        help="Listen on a Unix domain socket instead of TCP",
+    )
+    status_parser = subparsers.add_parser("status", help="Show database statistics")
+    status_parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Show per-stage timing and resource metrics of recent runs",
+    )
+    status_parser.add_argument(
+        "--runs", type=int, default=10, metavar="N",
+        help="Number of recent runs for --metrics (default: 10)",
+    )
+    import_parser = subparsers.add_parser(
+        "import", help="Bulk-import JSONL history (legacy raw files by default)"
+    )
+    import_parser.add_argument(
+        "paths", nargs="*", metavar="PATH",
+        help="JSONL files to import (default: legacy raw directory)",
+    )
+    import_parser.add_argument(
+        "--batch-size", type=int, default=None,
+        help="Items per write batch (default: 5000)",
+    )
+    subparsers.add_parser(
+        "compact",
+        help="Reclaim free space, merge full-text indexes and refresh query statistics",
+    )
 
     return parser
 
@@ -231,8 +516,12 @@ def main(argv: list[str] | None = None) -> int:
     commands = {
         "init": cmd_init,
         "run": cmd_run,
+        "daemon": cmd_daemon,
         "brief": cmd_brief,
+        "serve": cmd_serve,
         "status": cmd_status,
+        "import": cmd_import,
+        "compact": cmd_compact,
     }
     return commands[args.command](args)
 
@@ -11,7 +11,8 @@ from dataclasses import dataclass, field
 from difflib import SequenceMatcher
 
 from herald.config import ClusterConfig
-from herald.db import Database
+from herald.db import Database, chunked
+from herald.lsh import LshIndex
 from herald.scoring import _extract_paper_id, effective_source_count, story_score
 from herald.ulid import generate_ulid
 
@@ -38,6 +39,20 @@ _SUFFIX_RE = re.compile(
 # Digits or version strings used for conflict detection
 _NUMBER_RE = re.compile(r"\d+(?:\.\d+)*")
 
+# Word and version tokens for the shared-token pre-filter
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:\.[0-9]+)*")
+
+# Words too common in headlines to count as evidence of the same story
+_STOPWORDS = frozenset(
+    """
+    a about after all an and are as at be been but by can do does for from
+    get gets has have how i if in into is it its just more my new no not now
+    of on one or our out over so than that the their them there these they
+    this to up us use using via vs was we what when where which who why will
+    with without you your
+    """.split()
+)
+
 
 def normalize_title(title: str) -> str:
     """Normalize a title for similarity comparison."""
@@ -56,37 +71,269 @@ def normalize_title(title: str) -> str:
     return t
 
 
-def _has_version_conflict(norm_a: str, norm_b: str) -> bool:
-    """Return True if the two titles have different numeric/version tokens."""
-    nums_a = set(_NUMBER_RE.findall(norm_a))
-    nums_b = set(_NUMBER_RE.findall(norm_b))
+def _numbers(norm: str) -> frozenset[str]:
+    """Numeric/version tokens of a normalized title."""
+    return frozenset(_NUMBER_RE.findall(norm))
+
+
+def _has_version_conflict(nums_a: frozenset[str], nums_b: frozenset[str]) -> bool:
+    """Return True if two titles' numeric/version token sets differ."""
     if not nums_a and not nums_b:
         return False
     # If both have numbers and they differ, it's a conflict
     return nums_a != nums_b
 
 
+def _tokens(norm: str) -> frozenset[str]:
+    """Non-stopword tokens of a normalized title."""
+    return frozenset(t for t in _TOKEN_RE.findall(norm) if t not in _STOPWORDS)
+
+
 def _title_similarity(norm_a: str, norm_b: str) -> float:
     return SequenceMatcher(None, norm_a, norm_b).ratio()
 
 
-def _get_article_topics(db: Database, article_id: str) -> set[str]:
-    rows = db.execute(
-        "SELECT topic FROM article_topics WHERE article_id = ?",
-        (article_id,),
-    ).fetchall()
-    return {row[0] for row in rows}
+def _load_article_topics(db: Database, article_ids: list[int]) -> dict[int, set[str]]:
+    """Map article id -> topic set for the given articles (absent when none)."""
+    topics: dict[int, set[str]] = {}
+    for chunk in chunked(article_ids):
+        placeholders = ",".join("?" * len(chunk))
+        rows = db.execute(
+            f"SELECT article_id, topic FROM article_topics WHERE article_id IN ({placeholders})",
+            tuple(chunk),
+        ).fetchall()
+        for row in rows:
+            topics.setdefault(row[0], set()).add(row[1])
+    return topics
 
 
-def _get_story_member_ids(db: Database, story_id: str) -> list[str]:
-    rows = db.execute(
-        "SELECT article_id FROM story_articles WHERE story_id = ?",
-        (story_id,),
-    ).fetchall()
-    return [row[0] for row in rows]
+@dataclass
+class _StoryEntry:
+    """Everything the merge guards need about one active story."""
+    id: int
+    title: str
+    norm: str
+    numbers: frozenset[str]
+    tokens: frozenset[str]
+    last_updated: int  # ties break on id, i.e. creation order
+    canonical_article_id: int | None
+    topics: set[str] = field(default_factory=set)  # union of member article topics
+    paper_ids: set[str] = field(default_factory=set)  # arxiv ids of member articles
+
+    def retitle(self, title: str) -> None:
+        self.title = title
+        self.norm = normalize_title(title)
+        self.numbers = _numbers(self.norm)
+        self.tokens = _tokens(self.norm)
+
+
+class StoryIndex:
+    """In-memory view of active stories, loaded once and updated in place.
+
+    Holds pre-normalized titles, cached number sets, aggregated member topics
+    and paper IDs so the merge guards never go back to SQL per candidate, plus
+    an inverted index from title tokens to story IDs for the shared-token
+    pre-filter.
+    """
 
+    def __init__(self) -> None:
+        self._entries: dict[int, _StoryEntry] = {}
+        self._by_token: dict[str, set[int]] = {}
+        self._ordered: list[_StoryEntry] = []
+        self._dirty = False
 
-def _sync_story_topics(db: Database, story_id: str) -> None:
+    @classmethod
+    def load(cls, db: Database) -> StoryIndex:
+        index = cls()
+        rows = db.execute(
+            """
+            SELECT id, title, last_updated, canonical_article_id
+            FROM stories
+            WHERE status = 'active'
+            """,
+        ).fetchall()
+        for row in rows:
+            entry = _StoryEntry(
+                id=row[0],
+                title="",
+                norm="",
+                numbers=frozenset(),
+                tokens=frozenset(),
+                last_updated=row[2],
+                canonical_article_id=row[3],
+            )
+            entry.retitle(row[1])
+            index._entries[entry.id] = entry
+            index._index_tokens(entry)
+
+        members = db.execute(
+            """
+            SELECT sa.story_id, a.url_canonical, at.topic
+            FROM story_articles sa
+            JOIN stories s ON s.id = sa.story_id AND s.status = 'active'
+            JOIN articles a ON a.id = sa.article_id
+            LEFT JOIN article_topics at ON at.article_id = sa.article_id
+            """,
+        ).fetchall()
+        for row in members:
+            entry = index._entries.get(row[0])
+            if entry is None:
+                continue
+            if row[2] is not None:
+                entry.topics.add(row[2])
+            paper_id = _extract_paper_id(row[1])
+            if paper_id is not None:
+                entry.paper_ids.add(paper_id)
+
+        index._dirty = True
+        return index
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, story_id: int) -> _StoryEntry | None:
+        return self._entries.get(story_id)
+
+    def ordered(self) -> list[_StoryEntry]:
+        """Active stories, most recently updated first."""
+        if self._dirty:
+            self._ordered = sorted(
+                self._entries.values(), key=lambda e: (-e.last_updated, e.id)
+            )
+            self._dirty = False
+        return self._ordered
+
+    def token_candidates(self, tokens: frozenset[str], min_overlap: int) -> set[int]:
+        """Stories sharing at least *min_overlap* tokens with *tokens*.
+
+        The requirement is capped at the smaller token set so titles with
+        fewer content words than *min_overlap* can still be compared.
+        """
+        counts: dict[int, int] = {}
+        for token in tokens:
+            for story_id in self._by_token.get(token, ()):
+                counts[story_id] = counts.get(story_id, 0) + 1
+        need = min(min_overlap, len(tokens))
+        return {
+            story_id
+            for story_id, shared in counts.items()
+            if shared >= min(need, len(self._entries[story_id].tokens))
+        }
+
+    def ordered_subset(self, story_ids: set[int]) -> list[_StoryEntry]:
+        """The given active stories, in the same order as ordered()."""
+        entries = [self._entries[sid] for sid in story_ids if sid in self._entries]
+        entries.sort(key=lambda e: (-e.last_updated, e.id))
+        return entries
+
+    def add(
+        self,
+        story_id: int,
+        title: str,
+        last_updated: int,
+        canonical_article_id: int | None,
+    ) -> _StoryEntry:
+        entry = _StoryEntry(
+            id=story_id,
+            title=title,
+            norm="",
+            numbers=frozenset(),
+            tokens=frozenset(),
+            last_updated=last_updated,
+            canonical_article_id=canonical_article_id,
+        )
+        entry.retitle(title)
+        self._entries[story_id] = entry
+        self._index_tokens(entry)
+        self._dirty = True
+        return entry
+
+    def retitle(self, entry: _StoryEntry, title: str) -> None:
+        for token in entry.tokens:
+            postings = self._by_token[token]
+            postings.discard(entry.id)
+            if not postings:
+                del self._by_token[token]
+        entry.retitle(title)
+        self._index_tokens(entry)
+
+    def _index_tokens(self, entry: _StoryEntry) -> None:
+        for token in entry.tokens:
+            self._by_token.setdefault(token, set()).add(entry.id)
+
+    def add_member(self, entry: _StoryEntry, topics: set[str], paper_id: str | None) -> None:
+        entry.topics |= topics
+        if paper_id is not None:
+            entry.paper_ids.add(paper_id)
+
+    def touch(self, entry: _StoryEntry, last_updated: int) -> None:
+        if last_updated != entry.last_updated:
+            entry.last_updated = last_updated
+            self._dirty = True
+
+    def prune(self, cutoff: int) -> list[int]:
+        """Drop stories last updated before *cutoff*, as deactivate_stale does in SQL."""
+        stale = [e for e in self._entries.values() if e.last_updated < cutoff]
+        for entry in stale:
+            for token in entry.tokens:
+                postings = self._by_token[token]
+                postings.discard(entry.id)
+                if not postings:
+                    del self._by_token[token]
+            del self._entries[entry.id]
+        if stale:
+            self._dirty = True
+        return [e.id for e in stale]
+
+
+class ClusterCache:
+    """Active-story indexes kept warm across cluster() calls by a long-lived process.
+
+    The StoryIndex (and LshIndex, when enabled) built by one pass is reused by
+    the next instead of being reloaded from SQL. They are rebuilt when the
+    candidate-index settings change, when another connection has written to
+    the database since the last pass (PRAGMA data_version moved), or after a
+    pass failed part-way.
+    """
+
+    def __init__(self) -> None:
+        self.index: StoryIndex | None = None
+        self.lsh: LshIndex | None = None
+        self._settings: tuple | None = None
+        self._data_version: int | None = None
+
+    def indexes(self, db: Database, cfg: ClusterConfig) -> tuple[StoryIndex, LshIndex | None]:
+        settings = (cfg.candidate_index, cfg.lsh_bands, cfg.lsh_rows)
+        version = db.data_version()
+        if self.index is None or settings != self._settings or version != self._data_version:
+            self.index, self.lsh = _load_indexes(db, cfg)
+            self._settings = settings
+            self._data_version = version
+        return self.index, self.lsh
+
+    def prune(self, cutoff: int) -> None:
+        if self.index is None:
+            return
+        for story_id in self.index.prune(cutoff):
+            if self.lsh is not None:
+                self.lsh.discard(story_id)
+
+    def invalidate(self) -> None:
+        self.index = None
+        self.lsh = None
+
+
+def _load_indexes(db: Database, cfg: ClusterConfig) -> tuple[StoryIndex, LshIndex | None]:
+    index = StoryIndex.load(db)
+    lsh: LshIndex | None = None
+    if cfg.candidate_index == "lsh":
+        lsh = LshIndex.load(
+            db, cfg.lsh_bands, cfg.lsh_rows, ((e.id, e.norm) for e in index.ordered())
+        )
+    return index, lsh
+
+
+def _sync_story_topics(db: Database, story_id: int) -> None:
     """Recompute story_topics from member article_topics (top 5 by frequency)."""
     rows = db.execute(
         """
@@ -108,7 +355,7 @@ def _sync_story_topics(db: Database, story_id: str) -> None:
         )
 
 
-def _recompute_story_score(db: Database, story_id: str, cfg: ClusterConfig) -> float:
+def _recompute_story_score(db: Database, story_id: int, cfg: ClusterConfig) -> float:
     """Recompute the story score from member articles."""
     now = int(time.time())
     cutoff = now - cfg.max_time_gap_days * 86400
@@ -133,82 +380,86 @@ def _recompute_story_score(db: Database, story_id: str, cfg: ClusterConfig) -> f
 
 
 def _can_merge(
-    article_id: str,
     article_norm: str,
+    article_numbers: frozenset[str],
     article_topics: set[str],
+    article_paper_id: str | None,
     article_collected_at: int,
-    story: dict,
+    story: _StoryEntry,
     cfg: ClusterConfig,
-    db: Database,
 ) -> bool:
     """Apply 5 merge guards. Return True if the article can merge into story."""
     # Guard 1: title similarity
-    story_norm = normalize_title(story["title"])
-    if _title_similarity(article_norm, story_norm) < cfg.threshold:
+    if _title_similarity(article_norm, story.norm) < cfg.threshold:
         return False
 
     # Guard 2: time gap
     max_gap_secs = cfg.max_time_gap_days * 86400
-    if abs(article_collected_at - story["last_updated"]) > max_gap_secs:
+    if abs(article_collected_at - story.last_updated) > max_gap_secs:
         return False
 
     # Guard 3: version/number conflict
-    if _has_version_conflict(article_norm, story_norm):
+    if _has_version_conflict(article_numbers, story.numbers):
         return False
 
     # Guard 4: topic overlap (only blocks if both sides have topics)
-    story_topics: set[str] = set()
-    member_ids = _get_story_member_ids(db, story["id"])
-    for mid in member_ids:
-        story_topics |= _get_article_topics(db, mid)
-
-    if article_topics and story_topics and not (article_topics & story_topics):
+    if article_topics and story.topics and not (article_topics & story.topics):
         return False
 
     # Guard 5: paper ID conflict — different arxiv papers must not merge
-    article_url_row = db.execute(
-        "SELECT url_canonical FROM articles WHERE id = ?", (article_id,)
-    ).fetchone()
-    if article_url_row:
-        article_paper_id = _extract_paper_id(article_url_row[0])
-        if article_paper_id is not None:
-            member_urls = db.execute(
-                """
-                SELECT a.url_canonical
-                FROM story_articles sa
-                JOIN articles a ON a.id = sa.article_id
-                WHERE sa.story_id = ?
-                """,
-                (story["id"],),
-            ).fetchall()
-            for row in member_urls:
-                member_paper_id = _extract_paper_id(row[0])
-                if member_paper_id is not None and member_paper_id != article_paper_id:
-                    return False
+    if article_paper_id is not None:
+        if any(pid != article_paper_id for pid in story.paper_ids):
+            return False
 
     return True
 
 
-def cluster(db: Database, cfg: ClusterConfig | None = None) -> ClusterResult:
+def cluster(
+    db: Database,
+    cfg: ClusterConfig | None = None,
+    cache: ClusterCache | None = None,
+) -> ClusterResult:
     """Cluster unclustered articles into stories.
 
     For each unclustered article (not in story_articles), attempt to merge
     into an existing active story. If no match found, create a new story.
+    Active stories are loaded once into a StoryIndex that is kept in step
+    with every story created or merged during the pass. With
+    ``candidate_index: lsh`` only stories sharing a MinHash band bucket with
+    the article are checked against the merge guards. A ClusterCache keeps
+    the indexes between calls.
     """
     if cfg is None:
         cfg = ClusterConfig()
+    try:
+        return _cluster(db, cfg, cache)
+    except Exception:
+        # The in-memory indexes may be ahead of what was committed
+        if cache is not None:
+            cache.invalidate()
+        raise
+
 
+def _cluster(db: Database, cfg: ClusterConfig, cache: ClusterCache | None) -> ClusterResult:
     result = ClusterResult()
 
-    # Fetch all unclustered articles ordered by collected_at ascending
+    # Fetch unclustered articles ordered by collected_at ascending. Only
+    # pending ones are read (partial index), not the whole history.
     unclustered = db.execute(
         """
-        SELECT a.id, a.title, a.collected_at, a.score_base, a.origin_source_id, a.story_type
+        SELECT a.id, a.title, a.collected_at, a.score_base, a.origin_source_id, a.story_type,
+               a.url_canonical
         FROM articles a
-        WHERE a.id NOT IN (SELECT article_id FROM story_articles)
+        WHERE a.cluster_pending = 1
+          AND a.id NOT IN (SELECT article_id FROM story_articles)
         ORDER BY a.collected_at ASC
         """,
     ).fetchall()
+    if not unclustered:
+        return result
+
+    index, lsh = cache.indexes(db, cfg) if cache is not None else _load_indexes(db, cfg)
+    topics_by_article = _load_article_topics(db, [row[0] for row in unclustered])
 
     for article_row in unclustered:
         article_id = article_row[0]
@@ -223,75 +474,73 @@ def cluster(db: Database, cfg: ClusterConfig | None = None) -> ClusterResult:
         if len(norm.split()) < cfg.min_title_words:
             continue
 
-        article_topics = _get_article_topics(db, article_id)
+        article_topics = topics_by_article.get(article_id, set())
+        article_numbers = _numbers(norm)
+        article_paper_id = _extract_paper_id(article_row[6])
 
-        # Find matching active stories (ordered by last_updated desc for recency)
-        active_stories = db.execute(
-            """
-            SELECT id, title, last_updated, canonical_article_id
-            FROM stories
-            WHERE status = 'active'
-            ORDER BY last_updated DESC
-            """,
-        ).fetchall()
+        # Narrow the active stories to cheap candidates before the exact
+        # guards: shared title tokens and/or LSH buckets
+        pool: set[int] | None = None
+        if cfg.min_token_overlap > 0:
+            pool = index.token_candidates(_tokens(norm), cfg.min_token_overlap)
+        if lsh is not None:
+            lsh_keys = lsh.keys(norm)
+            bucketed = lsh.candidates(lsh_keys)
+            pool = bucketed if pool is None else pool & bucketed
 
-        matched_story_id: str | None = None
-        for story_row in active_stories:
-            story = {
-                "id": story_row[0],
-                "title": story_row[1],
-                "last_updated": story_row[2],
-                "canonical_article_id": story_row[3],
-            }
+        # Find matching active stories (ordered by last_updated desc for recency)
+        candidates = index.ordered() if pool is None else index.ordered_subset(pool)
+        matched: _StoryEntry | None = None
+        for story in candidates:
             if _can_merge(
-                article_id,
                 norm,
+                article_numbers,
                 article_topics,
+                article_paper_id,
                 collected_at,
                 story,
                 cfg,
-                db,
             ):
-                matched_story_id = story["id"]
+                matched = story
                 break
 
         now = int(time.time())
         cutoff = now - cfg.max_time_gap_days * 86400
 
         with db.transaction():
-            if matched_story_id is None:
+            if matched is None:
                 # Create new story — use story_score() for consistent scoring
-                story_id = generate_ulid()
                 has_recent = collected_at >= cutoff
                 initial_score = story_score(score_base, 1, has_recent)
-                db.execute(
+                story_id = db.execute(
                     """
                     INSERT INTO stories
-                        (id, title, story_type, score, canonical_article_id, first_seen, last_updated, status)
+                        (ulid, title, story_type, score, canonical_article_id, first_seen, last_updated, status)
                     VALUES (?, ?, ?, ?, ?, ?, ?, 'active')
                     """,
-                    (story_id, title, story_type, initial_score, article_id, collected_at, collected_at),
-                )
+                    (generate_ulid(), title, story_type, initial_score, article_id, collected_at, collected_at),
+                ).lastrowid
                 db.execute(
                     "INSERT INTO story_articles (story_id, article_id) VALUES (?, ?)",
                     (story_id, article_id),
                 )
                 _sync_story_topics(db, story_id)
+                entry = index.add(story_id, title, collected_at, article_id)
+                index.add_member(entry, article_topics, article_paper_id)
+                if lsh is not None:
+                    lsh.put(db, story_id, entry.norm, lsh_keys)
                 result.stories_created += 1
                 result.articles_clustered += 1
             else:
                 # Merge into existing story
+                matched_story_id = matched.id
                 db.execute(
                     "INSERT INTO story_articles (story_id, article_id) VALUES (?, ?)",
                     (matched_story_id, article_id),
                 )
 
                 # Canonical re-election with hysteresis
-                canon_row = db.execute(
-                    "SELECT canonical_article_id FROM stories WHERE id = ?",
-                    (matched_story_id,),
-                ).fetchone()
-                canon_id = canon_row[0] if canon_row else None
+                canon_id = matched.canonical_article_id
 
                 new_canonical = canon_id
                 if canon_id is not None:
@@ -311,15 +560,14 @@ def cluster(db: Database, cfg: ClusterConfig | None = None) -> ClusterResult:
 
                 # Use max(current, collected_at) to prevent backward regression
                 # when a late-arriving old article is added
-                story_last_updated = story["last_updated"]
-                updated_at = max(story_last_updated, collected_at)
+                updated_at = max(matched.last_updated, collected_at)
 
                 # Fetch title and story_type from canonical article
                 canon_fields = db.execute(
                     "SELECT title, story_type FROM articles WHERE id = ?",
                     (new_canonical,),
                 ).fetchone()
-                new_title = canon_fields[0] if canon_fields else story["title"]
+                new_title = canon_fields[0] if canon_fields else matched.title
                 new_story_type = canon_fields[1] if canon_fields else "news"
 
                 db.execute(
@@ -332,16 +580,34 @@ def cluster(db: Database, cfg: ClusterConfig | None = None) -> ClusterResult:
                     (updated_at, new_score, new_canonical, new_title, new_story_type, matched_story_id),
                 )
                 _sync_story_topics(db, matched_story_id)
+
+                matched.canonical_article_id = new_canonical
+                if new_title != matched.title:
+                    index.retitle(matched, new_title)
+                    if lsh is not None:
+                        lsh.put(db, matched.id, matched.norm)
+                index.touch(matched, updated_at)
+                index.add_member(matched, article_topics, article_paper_id)
                 result.stories_updated += 1
                 result.articles_clustered += 1
 
+    # Clustered or skipped, none of these needs looking at again
+    with db.transaction():
+        for ids in chunked([row[0] for row in unclustered]):
+            placeholders = ",".join("?" * len(ids))
+            db.execute(f"UPDATE articles SET cluster_pending = 0 WHERE id IN ({placeholders})", tuple(ids))
     return result
 
 
-def deactivate_stale(db: Database, cfg: ClusterConfig | None = None) -> int:
+def deactivate_stale(
+    db: Database,
+    cfg: ClusterConfig | None = None,
+    cache: ClusterCache | None = None,
+) -> int:
     """Set status='inactive' on stories not updated within max_time_gap_days.
 
-    Returns the number of stories deactivated.
+    Stories dropped here are pruned from *cache* too. Returns the number of
+    stories deactivated.
     """
     if cfg is None:
         cfg = ClusterConfig()
@@ -355,4 +621,12 @@ def deactivate_stale(db: Database, cfg: ClusterConfig | None = None) -> int:
         """,
         (cutoff,),
     )
+    db.execute(
+        """
+        DELETE FROM story_lsh
+        WHERE story_id IN (SELECT id FROM stories WHERE status = 'inactive')
+        """,
+    )
+    if cache is not None:
+        cache.prune(cutoff)
     return cursor.rowcount
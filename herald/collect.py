@@ -1,15 +1,32 @@
 """Herald v2 Collect stage: RSS, Hacker News, and Tavily adapters."""
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import os
 import sys
 import time
+from contextlib import asynccontextmanager, nullcontext
 from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
 
 import httpx
 
-from herald.models import RawItem, Source
+from herald.config import CollectConfig
+from herald.http import ConnectionStats, HttpSession, build_async_client, build_client
+from herald.metrics import peak_rss_bytes
+from herald.models import FetchLog, FetchState, RawItem, Source
+
+_HN_API_URL = "https://hn.algolia.com/api/v1/search?tags=front_page&hitsPerPage={limit}"
+_TAVILY_API_URL = "https://api.tavily.com/search"
+_MAX_FEED_BYTES = 10 * 1024 * 1024
+
+
+def _report_peak_rss() -> None:
+    peak = peak_rss_bytes()
+    if peak is not None:
+        print(f"[collect] peak RSS: {peak / (1024 * 1024):.1f} MB", file=sys.stderr)
 
 
 def _parse_published(value: str | None) -> int | None:
@@ -31,15 +48,157 @@ def _parse_published(value: str | None) -> int | None:
     return None
 
 
-def _fetch_with_retry(client: httpx.Client, url: str, retries: int = 3) -> httpx.Response | None:
+def _parse_feed(source: Source, content: str | bytes) -> list[RawItem]:
+    """Parse an RSS/Atom document into RawItems. Entries without a URL are skipped."""
+    import fastfeedparser
+
+    result = fastfeedparser.parse(content)
+    entries = getattr(result, "entries", []) or []
+
+    items: list[RawItem] = []
+    for entry in entries:
+        entry_url = getattr(entry, "link", None) or getattr(entry, "id", None)
+        if not entry_url:
+            continue
+        title = getattr(entry, "title", "") or ""
+        published_str = None
+        for attr in ("published", "updated", "created", "pubDate"):
+            val = getattr(entry, attr, None)
+            if val:
+                published_str = str(val)
+                break
+
+        items.append(RawItem(
+            url=entry_url,
+            title=title.strip(),
+            source_id=source.id,
+            published_at=_parse_published(published_str),
+            points=0,
+            extra=None,
+        ))
+    return items
+
+
+def _parse_hn_hits(source: Source, data: dict, min_points: int) -> list[RawItem]:
+    """Convert an Algolia search response into RawItems, dropping hits below min_points."""
+    items: list[RawItem] = []
+    for hit in data.get("hits", []):
+        points = hit.get("points") or 0
+        if points < min_points:
+            continue
+        url = hit.get("url") or f"https://news.ycombinator.com/item?id={hit.get('objectID', '')}"
+        title = hit.get("title") or ""
+        published_str = hit.get("created_at") or None
+        items.append(RawItem(
+            url=url,
+            title=title,
+            source_id=source.id,
+            published_at=_parse_published(published_str),
+            points=int(points),
+            extra=None,
+        ))
+    return items
+
+
+def _parse_tavily_results(source: Source, data: dict) -> list[RawItem]:
+    """Convert a Tavily search response into RawItems, skipping results without a URL."""
+    items: list[RawItem] = []
+    for result in data.get("results", []):
+        url = result.get("url") or ""
+        if not url:
+            continue
+        title = result.get("title") or ""
+        published_str = result.get("published_date") or None
+        items.append(RawItem(
+            url=url,
+            title=title,
+            source_id=source.id,
+            published_at=_parse_published(published_str),
+            points=0,
+            extra=None,
+        ))
+    return items
+
+
+def _trace_kwargs(marks: dict[str, float], log: FetchLog | None, *, is_async: bool = False) -> dict:
+    """Request kwargs whose httpcore trace timestamps connection setup into *marks*.
+
+    Empty when *log* is None, so unlogged requests are sent exactly as before.
+    """
+    if log is None:
+        return {}
+    if is_async:
+        async def trace(event_name, info):
+            marks[event_name] = time.perf_counter()
+    else:
+        def trace(event_name, info):
+            marks[event_name] = time.perf_counter()
+    return {"extensions": {"trace": trace}}
+
+
+def _span_ms(marks: dict[str, float], step: str) -> float:
+    start = marks.get(f"connection.{step}.started")
+    end = marks.get(f"connection.{step}.complete")
+    return (end - start) * 1000 if start is not None and end is not None else 0.0
+
+
+def _log_attempt(
+    log: FetchLog | None,
+    started: float,
+    marks: dict[str, float],
+    resp: httpx.Response | None,
+    body_size: int = 0,
+) -> None:
+    """Add one attempt's latency, status and bytes to *log*; later calls for the same attempt are ignored.
+
+    Bytes are as transferred (before content decoding) when httpx counted
+    them, otherwise *body_size*.
+    """
+    if log is None or "logged" in marks:
+        return
+    marks["logged"] = 0.0
+    log.total_ms += (time.perf_counter() - started) * 1000
+    log.connect_ms += _span_ms(marks, "connect_tcp")
+    log.tls_ms += _span_ms(marks, "start_tls")
+    if resp is not None:
+        log.status = resp.status_code
+        log.bytes += resp.num_bytes_downloaded or body_size
+
+
+def _log_error(log: FetchLog | None, exc: Exception) -> None:
+    if log is not None:
+        log.error = str(exc)
+
+
+def _log_failure(log: FetchLog | None, exc: Exception, will_retry: bool) -> None:
+    if log is None:
+        return
+    if will_retry:
+        log.retries += 1
+    else:
+        _log_error(log, exc)
+
+
+def _fetch_with_retry(
+    client: httpx.Client,
+    url: str,
+    retries: int = 3,
+    *,
+    log: FetchLog | None = None,
+) -> httpx.Response | None:
     """GET with exponential backoff (1s, 2s, 4s). Returns None on all failures."""
     delay = 1.0
     for attempt in range(retries):
+        marks: dict[str, float] = {}
+        started = time.perf_counter()
         try:
-            resp = client.get(url)
+            resp = client.get(url, **_trace_kwargs(marks, log))
+            _log_attempt(log, started, marks, resp, len(resp.content))
             resp.raise_for_status()
             return resp
         except Exception as exc:
+            _log_attempt(log, started, marks, getattr(exc, "response", None))
+            _log_failure(log, exc, attempt < retries - 1)
             if attempt < retries - 1:
                 time.sleep(delay)
                 delay *= 2
@@ -48,15 +207,28 @@ def _fetch_with_retry(client: httpx.Client, url: str, retries: int = 3) -> httpx
     return None
 
 
-def _post_with_retry(client: httpx.Client, url: str, *, json: dict, headers: dict, retries: int = 3) -> httpx.Response | None:
+def _post_with_retry(
+    client: httpx.Client,
+    url: str,
+    *,
+    json: dict,
+    headers: dict,
+    retries: int = 3,
+    log: FetchLog | None = None,
+) -> httpx.Response | None:
     """POST with exponential backoff (1s, 2s, 4s). Returns None on all failures."""
     delay = 1.0
     for attempt in range(retries):
+        marks: dict[str, float] = {}
+        started = time.perf_counter()
         try:
-            resp = client.post(url, json=json, headers=headers)
+            resp = client.post(url, json=json, headers=headers, **_trace_kwargs(marks, log))
+            _log_attempt(log, started, marks, resp, len(resp.content))
             resp.raise_for_status()
             return resp
         except Exception as exc:
+            _log_attempt(log, started, marks, getattr(exc, "response", None))
+            _log_failure(log, exc, attempt < retries - 1)
             if attempt < retries - 1:
                 time.sleep(delay)
                 delay *= 2
@@ -65,90 +237,220 @@ def _post_with_retry(client: httpx.Client, url: str, *, json: dict, headers: dic
     return None
 
 
-def fetch_rss(source: Source, *, timeout: int = 10, retries: int = 3) -> list[RawItem]:
-    """Fetch and parse a single RSS/Atom feed. Returns empty list on failure."""
-    import fastfeedparser
+class _FeedTooLarge(Exception):
+    """Raised when a feed body exceeds _MAX_FEED_BYTES; never retried."""
+
+    def __init__(self, size: int) -> None:
+        super().__init__(f"response too large ({size} bytes)")
+        self.size = size
+
+
+def _check_declared_length(resp: httpx.Response, max_bytes: int) -> None:
+    """Reject a response up front when Content-Length already exceeds the cap."""
+    declared = resp.headers.get("Content-Length", "")
+    if declared.isdigit() and int(declared) > max_bytes:
+        raise _FeedTooLarge(int(declared))
+
+
+def _read_capped(resp: httpx.Response, max_bytes: int) -> bytes:
+    """Read a streamed body, aborting as soon as it grows past *max_bytes*."""
+    _check_declared_length(resp, max_bytes)
+    buf = bytearray()
+    for chunk in resp.iter_bytes():
+        buf += chunk
+        if len(buf) > max_bytes:
+            raise _FeedTooLarge(len(buf))
+    return bytes(buf)
+
+
+async def _aread_capped(resp: httpx.Response, max_bytes: int) -> bytes:
+    """Async counterpart of _read_capped."""
+    _check_declared_length(resp, max_bytes)
+    buf = bytearray()
+    async for chunk in resp.aiter_bytes():
+        buf += chunk
+        if len(buf) > max_bytes:
+            raise _FeedTooLarge(len(buf))
+    return bytes(buf)
+
+
+def _stream_with_retry(
+    client: httpx.Client,
+    url: str,
+    retries: int = 3,
+    *,
+    headers: dict | None = None,
+    max_bytes: int = _MAX_FEED_BYTES,
+    log: FetchLog | None = None,
+) -> tuple[httpx.Response, bytes] | None:
+    """Streamed GET with exponential backoff (1s, 2s, 4s).
+
+    Returns (response, body) or None on all failures. A 304 is returned with
+    an empty body. _FeedTooLarge propagates to the caller without retrying.
+    """
+    delay = 1.0
+    for attempt in range(retries):
+        marks: dict[str, float] = {}
+        started = time.perf_counter()
+        try:
+            with client.stream("GET", url, headers=headers, **_trace_kwargs(marks, log)) as resp:
+                if resp.status_code == 304:  # Not Modified answers a conditional GET
+                    _log_attempt(log, started, marks, resp)
+                    return resp, b""
+                resp.raise_for_status()
+                body = _read_capped(resp, max_bytes)
+                _log_attempt(log, started, marks, resp, len(body))
+                return resp, body
+        except _FeedTooLarge:
+            _log_attempt(log, started, marks, None)
+            raise
+        except Exception as exc:
+            _log_attempt(log, started, marks, getattr(exc, "response", None))
+            _log_failure(log, exc, attempt < retries - 1)
+            if attempt < retries - 1:
+                time.sleep(delay)
+                delay *= 2
+            else:
+                print(f"[collect] ERROR fetching {url}: {exc}", file=sys.stderr)
+    return None
+
+
+def _client_scope(client: httpx.Client | None, timeout: int, **kwargs):
+    """Borrow *client* when given (left open), otherwise open a short-lived one."""
+    if client is not None:
+        return nullcontext(client)
+    return httpx.Client(timeout=timeout, **kwargs)
+
 
+def _conditional_headers(state: FetchState | None) -> dict:
+    """Build If-None-Match / If-Modified-Since headers from stored validators."""
+    headers: dict[str, str] = {}
+    if state is None:
+        return headers
+    if state.etag:
+        headers["If-None-Match"] = state.etag
+    if state.last_modified:
+        headers["If-Modified-Since"] = state.last_modified
+    return headers
+
+
+def _feed_unchanged(
+    source: Source,
+    resp: httpx.Response,
+    body: bytes,
+    state: FetchState | None,
+) -> bool:
+    """Record validators from *resp* into *state*; return True when the feed need not be parsed.
+
+    A feed is unchanged when the server answers 304 or the body hashes to the
+    same digest as the previous fetch.
+    """
+    if state is None:
+        return False
+    state.fetched_at = int(time.time())
+    state.etag = resp.headers.get("ETag") or state.etag
+    state.last_modified = resp.headers.get("Last-Modified") or state.last_modified
+    if resp.status_code == 304:
+        print(f"[collect] {source.name}: not modified", file=sys.stderr)
+        return True
+    body_hash = hashlib.sha256(body).hexdigest()
+    if body_hash == state.body_hash:
+        print(f"[collect] {source.name}: body unchanged", file=sys.stderr)
+        return True
+    state.body_hash = body_hash
+    return False
+
+
+def _forget_validators(state: FetchState | None) -> None:
+    """Drop stored validators so a feed that failed to parse is fetched in full next run."""
+    if state is not None:
+        state.etag = None
+        state.last_modified = None
+        state.body_hash = None
+
+
+def fetch_rss(
+    source: Source,
+    *,
+    timeout: int = 10,
+    retries: int = 3,
+    state: FetchState | None = None,
+    client: httpx.Client | None = None,
+    log: FetchLog | None = None,
+) -> list[RawItem]:
+    """Fetch and parse a single RSS/Atom feed. Returns empty list on failure.
+
+    When *state* is given the request is conditional, and a 304 or an
+    identical body skips parsing. *state* is updated in place. A shared
+    *client* is used when given instead of opening one per call. *log*, when
+    given, receives the request telemetry.
+    """
     if not source.url:
         return []
 
     items: list[RawItem] = []
     try:
-        with httpx.Client(timeout=timeout, follow_redirects=True) as client:
-            resp = _fetch_with_retry(client, source.url, retries=retries)
-            if resp is None:
-                return []
-            if len(resp.content) > 10 * 1024 * 1024:
-                print(
-                    f"[collect] SKIP {source.name}: response too large ({len(resp.content)} bytes)",
-                    file=sys.stderr,
-                )
-                return []
-            content = resp.text
-
-        result = fastfeedparser.parse(content)
-        entries = getattr(result, "entries", []) or []
-
-        for entry in entries:
-            entry_url = getattr(entry, "link", None) or getattr(entry, "id", None)
-            if not entry_url:
-                continue
-            title = getattr(entry, "title", "") or ""
-            published_str = None
-            for attr in ("published", "updated", "created", "pubDate"):
-                val = getattr(entry, attr, None)
-                if val:
-                    published_str = str(val)
-                    break
-
-            items.append(RawItem(
-                url=entry_url,
-                title=title.strip(),
-                source_id=source.id,
-                published_at=_parse_published(published_str),
-                points=0,
-                extra=None,
-            ))
+        with _client_scope(client, timeout, follow_redirects=True) as client:
+            fetched = _stream_with_retry(
+                client, source.url, retries=retries, headers=_conditional_headers(state), log=log,
+            )
+        if fetched is None:
+            return []
+        resp, body = fetched
+        if _feed_unchanged(source, resp, body, state):
+            return []
+
+        items = _parse_feed(source, body)
+    except _FeedTooLarge as exc:
+        _log_error(log, exc)
+        print(f"[collect] SKIP {source.name}: {exc}", file=sys.stderr)
     except Exception as exc:
+        _forget_validators(state)
+        _log_error(log, exc)
         print(f"[collect] ERROR parsing feed {source.name} ({source.url}): {exc}", file=sys.stderr)
 
     return items
 
 
-def fetch_hn(source: Source, *, min_points: int = 100, limit: int = 200, timeout: int = 10, retries: int = 3) -> list[RawItem]:
+def fetch_hn(
+    source: Source,
+    *,
+    min_points: int = 100,
+    limit: int = 200,
+    timeout: int = 10,
+    retries: int = 3,
+    client: httpx.Client | None = None,
+    log: FetchLog | None = None,
+) -> list[RawItem]:
     """Fetch HN front-page stories via Algolia API, filter by min_points."""
-    api_url = f"https://hn.algolia.com/api/v1/search?tags=front_page&hitsPerPage={limit}"
+    api_url = _HN_API_URL.format(limit=limit)
     items: list[RawItem] = []
 
     try:
-        with httpx.Client(timeout=timeout, follow_redirects=True) as client:
-            resp = _fetch_with_retry(client, api_url, retries=retries)
+        with _client_scope(client, timeout, follow_redirects=True) as client:
+            resp = _fetch_with_retry(client, api_url, retries=retries, log=log)
             if resp is None:
                 return []
             data = resp.json()
 
-        for hit in data.get("hits", []):
-            points = hit.get("points") or 0
-            if points < min_points:
-                continue
-            url = hit.get("url") or f"https://news.ycombinator.com/item?id={hit.get('objectID', '')}"
-            title = hit.get("title") or ""
-            published_str = hit.get("created_at") or None
-            items.append(RawItem(
-                url=url,
-                title=title,
-                source_id=source.id,
-                published_at=_parse_published(published_str),
-                points=int(points),
-                extra=None,
-            ))
+        items = _parse_hn_hits(source, data, min_points)
     except Exception as exc:
+        _log_error(log, exc)
         print(f"[collect] ERROR fetching HN stories: {exc}", file=sys.stderr)
 
     return items
 
 
-def fetch_tavily(source: Source, *, queries: list[str] | None = None, timeout: int = 10, retries: int = 3, api_key: str | None = None) -> list[RawItem]:
+def fetch_tavily(
+    source: Source,
+    *,
+    queries: list[str] | None = None,
+    timeout: int = 10,
+    retries: int = 3,
+    api_key: str | None = None,
+    client: httpx.Client | None = None,
+    log: FetchLog | None = None,
+) -> list[RawItem]:
     """Search via Tavily API. Returns [] silently when TAVILY_API_KEY is not set."""
     api_key = api_key or os.environ.get("TAVILY_API_KEY", "")
     if not api_key:
@@ -158,35 +460,335 @@ def fetch_tavily(source: Source, *, queries: list[str] | None = None, timeout: i
         queries = [source.name]
 
     items: list[RawItem] = []
-    with httpx.Client(timeout=timeout) as client:
+    with _client_scope(client, timeout) as client:
         for query in queries:
             try:
                 payload = {"query": query, "max_results": 5, "search_depth": "basic"}
                 headers = {"Authorization": f"Bearer {api_key}"}
-                resp = _post_with_retry(client, "https://api.tavily.com/search", json=payload, headers=headers, retries=retries)
+                resp = _post_with_retry(
+                    client, _TAVILY_API_URL, json=payload, headers=headers, retries=retries, log=log,
+                )
                 if resp is None:
                     continue
-                data = resp.json()
-                for result in data.get("results", []):
-                    url = result.get("url") or ""
-                    if not url:
-                        continue
-                    title = result.get("title") or ""
-                    published_str = result.get("published_date") or None
-                    items.append(RawItem(
-                        url=url,
-                        title=title,
-                        source_id=source.id,
-                        published_at=_parse_published(published_str),
-                        points=0,
-                        extra=None,
-                    ))
+                items.extend(_parse_tavily_results(source, resp.json()))
             except Exception as exc:
+                _log_error(log, exc)
                 print(f"[collect] ERROR Tavily query '{query}': {exc}", file=sys.stderr)
 
     return items
 
 
+# ---------------------------------------------------------------------------
+# Async engine
+# ---------------------------------------------------------------------------
+
+
+class _HostLimiter:
+    """Bound in-flight requests globally and per host.
+
+    A request takes its host slot before the global slot so that a queue of
+    requests to one slow host never holds global capacity while it waits.
+    """
+
+    def __init__(self, max_concurrency: int, per_host_limit: int) -> None:
+        self._global = asyncio.Semaphore(max(max_concurrency, 1))
+        self._per_host_limit = max(per_host_limit, 1)
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = (urlparse(url).hostname or "").lower()
+        sem = self._hosts.get(host)
+        if sem is None:
+            sem = asyncio.Semaphore(self._per_host_limit)
+            self._hosts[host] = sem
+        return sem
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Hold both the host slot and a global slot for the duration of the block."""
+        async with self._host_semaphore(url):
+            async with self._global:
+                yield
+
+
+def _slot(limiter: _HostLimiter | None, url: str):
+    return limiter.slot(url) if limiter is not None else nullcontext()
+
+
+async def _afetch_with_retry(
+    client: httpx.AsyncClient,
+    url: str,
+    retries: int = 3,
+    *,
+    limiter: _HostLimiter | None = None,
+    log: FetchLog | None = None,
+) -> httpx.Response | None:
+    """Async GET with exponential backoff (1s, 2s, 4s). Returns None on all failures.
+
+    Slots are released between attempts, so backoff sleeps never block other sources.
+    """
+    delay = 1.0
+    for attempt in range(retries):
+        marks: dict[str, float] = {}
+        started = time.perf_counter()
+        try:
+            async with _slot(limiter, url):
+                # Time spent queued for a slot is not fetch latency
+                started = time.perf_counter()
+                resp = await client.get(url, **_trace_kwargs(marks, log, is_async=True))
+            _log_attempt(log, started, marks, resp, len(resp.content))
+            resp.raise_for_status()
+            return resp
+        except Exception as exc:
+            _log_attempt(log, started, marks, getattr(exc, "response", None))
+            _log_failure(log, exc, attempt < retries - 1)
+            if attempt < retries - 1:
+                await asyncio.sleep(delay)
+                delay *= 2
+            else:
+                print(f"[collect] ERROR fetching {url}: {exc}", file=sys.stderr)
+    return None
+
+
+async def _apost_with_retry(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    json: dict,
+    headers: dict,
+    retries: int = 3,
+    limiter: _HostLimiter | None = None,
+    log: FetchLog | None = None,
+) -> httpx.Response | None:
+    """Async POST with exponential backoff (1s, 2s, 4s). Returns None on all failures."""
+    delay = 1.0
+    for attempt in range(retries):
+        marks: dict[str, float] = {}
+        started = time.perf_counter()
+        try:
+            async with _slot(limiter, url):
+                # Time spent queued for a slot is not fetch latency
+                started = time.perf_counter()
+                resp = await client.post(
+                    url, json=json, headers=headers, **_trace_kwargs(marks, log, is_async=True)
+                )
+            _log_attempt(log, started, marks, resp, len(resp.content))
+            resp.raise_for_status()
+            return resp
+        except Exception as exc:
+            _log_attempt(log, started, marks, getattr(exc, "response", None))
+            _log_failure(log, exc, attempt < retries - 1)
+            if attempt < retries - 1:
+                await asyncio.sleep(delay)
+                delay *= 2
+            else:
+                print(f"[collect] ERROR posting {url}: {exc}", file=sys.stderr)
+    return None
+
+
+async def _astream_with_retry(
+    client: httpx.AsyncClient,
+    url: str,
+    retries: int = 3,
+    *,
+    headers: dict | None = None,
+    limiter: _HostLimiter | None = None,
+    max_bytes: int = _MAX_FEED_BYTES,
+    log: FetchLog | None = None,
+) -> tuple[httpx.Response, bytes] | None:
+    """Async counterpart of _stream_with_retry; slots are released between attempts."""
+    delay = 1.0
+    for attempt in range(retries):
+        marks: dict[str, float] = {}
+        started = time.perf_counter()
+        try:
+            async with _slot(limiter, url):
+                # Time spent queued for a slot is not fetch latency
+                started = time.perf_counter()
+                trace = _trace_kwargs(marks, log, is_async=True)
+                async with client.stream("GET", url, headers=headers, **trace) as resp:
+                    if resp.status_code == 304:  # Not Modified answers a conditional GET
+                        _log_attempt(log, started, marks, resp)
+                        return resp, b""
+                    resp.raise_for_status()
+                    body = await _aread_capped(resp, max_bytes)
+                    _log_attempt(log, started, marks, resp, len(body))
+                    return resp, body
+        except _FeedTooLarge:
+            _log_attempt(log, started, marks, None)
+            raise
+        except Exception as exc:
+            _log_attempt(log, started, marks, getattr(exc, "response", None))
+            _log_failure(log, exc, attempt < retries - 1)
+            if attempt < retries - 1:
+                await asyncio.sleep(delay)
+                delay *= 2
+            else:
+                print(f"[collect] ERROR fetching {url}: {exc}", file=sys.stderr)
+    return None
+
+
+async def afetch_rss(
+    client: httpx.AsyncClient,
+    source: Source,
+    *,
+    retries: int = 3,
+    limiter: _HostLimiter | None = None,
+    state: FetchState | None = None,
+    log: FetchLog | None = None,
+) -> list[RawItem]:
+    """Async counterpart of fetch_rss using a shared client. Returns [] on failure."""
+    if not source.url:
+        return []
+
+    try:
+        fetched = await _astream_with_retry(
+            client, source.url, retries=retries,
+            headers=_conditional_headers(state), limiter=limiter, log=log,
+        )
+        if fetched is None:
+            return []
+        resp, body = fetched
+        if _feed_unchanged(source, resp, body, state):
+            return []
+        # Parsing is CPU-bound; keep the event loop free for other downloads.
+        # The parser takes bytes directly, so the body is never decoded to str.
+        return await asyncio.to_thread(_parse_feed, source, body)
+    except _FeedTooLarge as exc:
+        _log_error(log, exc)
+        print(f"[collect] SKIP {source.name}: {exc}", file=sys.stderr)
+        return []
+    except Exception as exc:
+        _forget_validators(state)
+        _log_error(log, exc)
+        print(f"[collect] ERROR parsing feed {source.name} ({source.url}): {exc}", file=sys.stderr)
+        return []
+
+
+async def afetch_hn(
+    client: httpx.AsyncClient,
+    source: Source,
+    *,
+    min_points: int = 100,
+    limit: int = 200,
+    retries: int = 3,
+    limiter: _HostLimiter | None = None,
+    log: FetchLog | None = None,
+) -> list[RawItem]:
+    """Async counterpart of fetch_hn using a shared client."""
+    try:
+        resp = await _afetch_with_retry(
+            client, _HN_API_URL.format(limit=limit), retries=retries, limiter=limiter, log=log,
+        )
+        if resp is None:
+            return []
+        return _parse_hn_hits(source, resp.json(), min_points)
+    except Exception as exc:
+        _log_error(log, exc)
+        print(f"[collect] ERROR fetching HN stories: {exc}", file=sys.stderr)
+        return []
+
+
+async def afetch_tavily(
+    client: httpx.AsyncClient,
+    source: Source,
+    *,
+    queries: list[str] | None = None,
+    retries: int = 3,
+    api_key: str | None = None,
+    limiter: _HostLimiter | None = None,
+    log: FetchLog | None = None,
+) -> list[RawItem]:
+    """Async counterpart of fetch_tavily. Returns [] silently without an API key."""
+    api_key = api_key or os.environ.get("TAVILY_API_KEY", "")
+    if not api_key:
+        return []
+
+    if not queries:
+        queries = [source.name]
+
+    items: list[RawItem] = []
+    for query in queries:
+        try:
+            payload = {"query": query, "max_results": 5, "search_depth": "basic"}
+            headers = {"Authorization": f"Bearer {api_key}"}
+            resp = await _apost_with_retry(
+                client, _TAVILY_API_URL, json=payload, headers=headers,
+                retries=retries, limiter=limiter, log=log,
+            )
+            if resp is None:
+                continue
+            items.extend(_parse_tavily_results(source, resp.json()))
+        except Exception as exc:
+            _log_error(log, exc)
+            print(f"[collect] ERROR Tavily query '{query}': {exc}", file=sys.stderr)
+
+    return items
+
+
+async def acollect_all(
+    sources: list[Source],
+    *,
+    adapter_map: dict[str, str] | None = None,
+    tavily_api_key: str | None = None,
+    cfg: CollectConfig | None = None,
+    client: httpx.AsyncClient | None = None,
+    fetch_state: dict[str, FetchState] | None = None,
+    fetch_log: dict[str, FetchLog] | None = None,
+) -> list[RawItem]:
+    """Fetch all sources concurrently and return their items in source order.
+
+    Concurrency is bounded by cfg.max_concurrency overall and cfg.per_host_limit
+    per hostname, so wall-clock time tracks the slowest feed rather than the sum
+    of all feeds. A client is created for the call unless one is passed in.
+    fetch_state and fetch_log behave as in collect_all.
+    """
+    cfg = cfg or CollectConfig()
+    adapter_map = adapter_map or {}
+    limiter = _HostLimiter(cfg.max_concurrency, cfg.per_host_limit)
+    _module = sys.modules[__name__]
+
+    async def _one(ac: httpx.AsyncClient, source: Source) -> list[RawItem]:
+        adapter_name = adapter_map.get(source.id, "rss")
+        log = fetch_log.get(source.id) if fetch_log is not None else None
+        if adapter_name not in _ADAPTER_NAMES:
+            _log_error(log, ValueError(f"unknown adapter '{adapter_name}'"))
+            print(f"[collect] WARN unknown adapter '{adapter_name}' for source '{source.id}'", file=sys.stderr)
+            return []
+        fetch_fn = getattr(_module, f"afetch_{adapter_name}")
+        try:
+            kwargs = {"retries": cfg.retries, "limiter": limiter}
+            if adapter_name == "rss" and fetch_state is not None:
+                kwargs["state"] = fetch_state.setdefault(source.id, FetchState(source_id=source.id))
+            if adapter_name == "tavily" and tavily_api_key:
+                kwargs["api_key"] = tavily_api_key
+            if log is not None:
+                kwargs["log"] = log
+            items = await fetch_fn(ac, source, **kwargs)
+            if log is not None:
+                log.items_parsed = len(items)
+            print(f"[collect] {source.name}: {len(items)} items", file=sys.stderr)
+            return items
+        except Exception as exc:
+            _log_error(log, exc)
+            print(f"[collect] ERROR source '{source.id}': {exc}", file=sys.stderr)
+            return []
+
+    async def _gather(ac: httpx.AsyncClient) -> list[list[RawItem]]:
+        return await asyncio.gather(*(_one(ac, s) for s in sources))
+
+    if client is not None:
+        results = await _gather(client)
+    else:
+        async with build_async_client(cfg) as ac:
+            results = await _gather(ac)
+
+    all_items: list[RawItem] = []
+    for items in results:
+        all_items.extend(items)
+    return all_items
+
+
 _ADAPTER_NAMES = {"rss", "hn", "tavily"}
 
 
@@ -195,31 +797,106 @@ def collect_all(
     *,
     adapter_map: dict[str, str] | None = None,
     tavily_api_key: str | None = None,
+    cfg: CollectConfig | None = None,
+    fetch_state: dict[str, FetchState] | None = None,
+    session: HttpSession | None = None,
+    fetch_log: dict[str, FetchLog] | None = None,
 ) -> list[RawItem]:
     """Dispatch fetch per source using adapter_map (source.id -> adapter name).
 
     Each source is isolated: an exception in one source does not stop others.
     adapter_map keys are source ids; values are one of 'rss', 'hn', 'tavily'.
     If adapter_map is None or a source id is not in it, defaults to 'rss'.
+
+    With cfg.mode == 'async' the sources are fetched concurrently through
+    acollect_all on *session*'s pooled client (a session is opened for the
+    call when none is given). With cfg.mode == 'sync' sources are fetched
+    one after another over a single shared client; without cfg each adapter
+    opens its own client. Connection reuse and peak RSS are reported when
+    collect ends.
+
+    fetch_state (source.id -> FetchState) enables conditional GETs for RSS
+    sources; entries are created for new sources and updated in place.
+
+    fetch_log (source.id -> FetchLog) collects per-source telemetry: latency,
+    bytes, HTTP status, retries and items parsed. Only sources that already
+    have an entry are logged.
     """
+    if cfg is not None and cfg.mode == "async":
+        owned = session is None
+        if owned:
+            session = HttpSession(cfg)
+        try:
+            before = session.stats.snapshot()
+            items = session.run(acollect_all(
+                sources,
+                adapter_map=adapter_map,
+                tavily_api_key=tavily_api_key,
+                cfg=cfg,
+                client=session.client,
+                fetch_state=fetch_state,
+                fetch_log=fetch_log,
+            ))
+            print(f"[collect] connections: {session.stats.since(before).summary()}", file=sys.stderr)
+            _report_peak_rss()
+            return items
+        finally:
+            if owned:
+                session.close()
+
+    if cfg is not None:
+        stats = ConnectionStats()
+        with build_client(cfg, stats=stats) as client:
+            items = _collect_sequential(
+                sources, adapter_map, tavily_api_key, fetch_state,
+                dict(timeout=cfg.timeout, retries=cfg.retries, client=client),
+                fetch_log,
+            )
+        print(f"[collect] connections: {stats.summary()}", file=sys.stderr)
+        _report_peak_rss()
+        return items
+
+    items = _collect_sequential(sources, adapter_map, tavily_api_key, fetch_state, {}, fetch_log)
+    _report_peak_rss()
+    return items
+
+
+def _collect_sequential(
+    sources: list[Source],
+    adapter_map: dict[str, str] | None,
+    tavily_api_key: str | None,
+    fetch_state: dict[str, FetchState] | None,
+    base_kwargs: dict,
+    fetch_log: dict[str, FetchLog] | None = None,
+) -> list[RawItem]:
+    """Fetch sources one after another with the synchronous adapters."""
     adapter_map = adapter_map or {}
     all_items: list[RawItem] = []
     _module = sys.modules[__name__]
 
     for source in sources:
         adapter_name = adapter_map.get(source.id, "rss")
+        log = fetch_log.get(source.id) if fetch_log is not None else None
         if adapter_name not in _ADAPTER_NAMES:
+            _log_error(log, ValueError(f"unknown adapter '{adapter_name}'"))
             print(f"[collect] WARN unknown adapter '{adapter_name}' for source '{source.id}'", file=sys.stderr)
             continue
         fetch_fn = getattr(_module, f"fetch_{adapter_name}")
         try:
-            kwargs = {}
+            kwargs = dict(base_kwargs)
+            if adapter_name == "rss" and fetch_state is not None:
+                kwargs["state"] = fetch_state.setdefault(source.id, FetchState(source_id=source.id))
             if adapter_name == "tavily" and tavily_api_key:
                 kwargs["api_key"] = tavily_api_key
+            if log is not None:
+                kwargs["log"] = log
             items = fetch_fn(source, **kwargs)
+            if log is not None:
+                log.items_parsed = len(items)
             print(f"[collect] {source.name}: {len(items)} items", file=sys.stderr)
             all_items.extend(items)
         except Exception as exc:
+            _log_error(log, exc)
             print(f"[collect] ERROR source '{source.id}': {exc}", file=sys.stderr)
 
     return all_items
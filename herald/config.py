@@ -19,11 +19,55 @@ class ClusterConfig:
     max_time_gap_days: int = 7
     min_title_words: int = 4
     canonical_delta: float = 0.1
+    min_token_overlap: int = 2  # shared non-stopword title tokens; 0 disables
+    candidate_index: str = "brute"  # brute | lsh
+    lsh_bands: int = 32
+    lsh_rows: int = 2
 
 
 @dataclass
 class ScheduleConfig:
     interval_hours: int = 4
+    adaptive: bool = False
+    min_interval_minutes: int = 15
+    max_interval_hours: int = 168
+
+
+@dataclass
+class CollectConfig:
+    mode: str = "async"  # async | sync
+    max_concurrency: int = 16
+    per_host_limit: int = 2
+    timeout: int = 10
+    retries: int = 3
+    max_connections: int = 32
+    max_keepalive_connections: int = 16
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+
+
+@dataclass
+class DatabaseConfig:
+    profile: str = "default"  # default | bulk-load | read-mostly
+    bulk_profile: str = "bulk-load"  # used for the ingest and cluster stages
+    synchronous: str | None = None  # overrides applied on top of `profile`
+    cache_size_mb: int | None = None
+    mmap_size_mb: int | None = None
+    temp_store: str | None = None
+    maintenance_every_runs: int = 10  # wal_checkpoint(TRUNCATE) + optimize; 0 disables
+
+
+@dataclass
+class RetentionConfig:
+    move_to_archive_days: int = 0  # move inactive stories idle this long to archive/YYYY-MM.db; 0 keeps them
+    inactive_story_days: int = 0  # delete inactive stories (and their articles) idle this long; 0 keeps all
+    run_history_days: int = 0  # pipeline runs with their stage metrics and fetch log; 0 keeps all
+    archive: bool = False  # append deleted articles to {data_dir}/archive/YYYY-MM.jsonl first
+    batch_size: int = 200  # stories deleted per write transaction
+
+    @property
+    def enabled(self) -> bool:
+        return self.move_to_archive_days > 0 or self.inactive_story_days > 0 or self.run_history_days > 0
 
 
 @dataclass
@@ -31,6 +75,9 @@ class HeraldConfig:
     sources: list[Source] = field(default_factory=list)
     clustering: ClusterConfig = field(default_factory=ClusterConfig)
     schedule: ScheduleConfig = field(default_factory=ScheduleConfig)
+    collect: CollectConfig = field(default_factory=CollectConfig)
+    database: DatabaseConfig = field(default_factory=DatabaseConfig)
+    retention: RetentionConfig = field(default_factory=RetentionConfig)
     topics: dict = field(default_factory=dict)
     tavily_api_key: str | None = None
 
@@ -134,11 +181,51 @@ def _parse_config(data: dict) -> HeraldConfig:
         max_time_gap_days=cluster_data.get("max_time_gap_days", 7),
         min_title_words=cluster_data.get("min_title_words", 4),
         canonical_delta=cluster_data.get("canonical_delta", 0.1),
+        min_token_overlap=cluster_data.get("min_token_overlap", 2),
+        candidate_index=cluster_data.get("candidate_index", "brute"),
+        lsh_bands=cluster_data.get("lsh_bands", 32),
+        lsh_rows=cluster_data.get("lsh_rows", 2),
     )
 
     sched_data = data.get("schedule", {})
     schedule = ScheduleConfig(
         interval_hours=sched_data.get("interval_hours", 4),
+        adaptive=bool(sched_data.get("adaptive", False)),
+        min_interval_minutes=sched_data.get("min_interval_minutes", 15),
+        max_interval_hours=sched_data.get("max_interval_hours", 168),
+    )
+
+    collect_data = data.get("collect", {})
+    collect = CollectConfig(
+        mode=collect_data.get("mode", "async"),
+        max_concurrency=collect_data.get("max_concurrency", 16),
+        per_host_limit=collect_data.get("per_host_limit", 2),
+        timeout=collect_data.get("timeout", 10),
+        retries=collect_data.get("retries", 3),
+        max_connections=collect_data.get("max_connections", 32),
+        max_keepalive_connections=collect_data.get("max_keepalive_connections", 16),
+        keepalive_expiry=collect_data.get("keepalive_expiry", 30.0),
+        http2=bool(collect_data.get("http2", False)),
+    )
+
+    db_data = data.get("database", {})
+    database = DatabaseConfig(
+        profile=db_data.get("profile", "default"),
+        bulk_profile=db_data.get("bulk_profile", "bulk-load"),
+        synchronous=db_data.get("synchronous"),
+        cache_size_mb=db_data.get("cache_size_mb"),
+        mmap_size_mb=db_data.get("mmap_size_mb"),
+        temp_store=db_data.get("temp_store"),
+        maintenance_every_runs=db_data.get("maintenance_every_runs", 10),
+    )
+
+    ret_data = data.get("retention", {})
+    retention = RetentionConfig(
+        move_to_archive_days=ret_data.get("move_to_archive_days", 0),
+        inactive_story_days=ret_data.get("inactive_story_days", 0),
+        run_history_days=ret_data.get("run_history_days", 0),
+        archive=bool(ret_data.get("archive", False)),
+        batch_size=ret_data.get("batch_size", 200),
     )
 
     topics = data.get("topics", {})
@@ -148,6 +235,9 @@ def _parse_config(data: dict) -> HeraldConfig:
         sources=sources,
         clustering=clustering,
         schedule=schedule,
+        collect=collect,
+        database=database,
+        retention=retention,
         topics=topics,
         tavily_api_key=tavily_api_key,
     )
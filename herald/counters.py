@@ -0,0 +1,44 @@
+"""Row counts maintained by triggers (migration 0006).
+
+Reading a count is one primary-key lookup instead of a COUNT(*) scan. The
+triggers keep the ``counters`` table exact under normal writes; bulk paths
+that defer them (herald import) call recompute_counters() afterwards.
+"""
+from __future__ import annotations
+
+from herald.db import Database
+
+_RECOMPUTE_SQL = """
+INSERT INTO counters (scope, key, value)
+    SELECT 'table', 'articles', COUNT(*) FROM articles
+    UNION ALL SELECT 'table', 'mentions', COUNT(*) FROM mentions
+    UNION ALL SELECT 'table', 'stories', COUNT(*) FROM stories
+    UNION ALL SELECT 'table', 'story_articles', COUNT(*) FROM story_articles
+    UNION ALL SELECT 'source', origin_source_id, COUNT(*) FROM articles GROUP BY origin_source_id
+    UNION ALL SELECT 'story_status', status, COUNT(*) FROM stories GROUP BY status
+    UNION ALL SELECT 'article_topic', topic, COUNT(*) FROM article_topics GROUP BY topic
+    UNION ALL SELECT 'story_topic', topic, COUNT(*) FROM story_topics GROUP BY topic
+"""
+
+
+def counter(db: Database, scope: str, key: str) -> int:
+    """One count, e.g. counter(db, "story_status", "active"); 0 when absent."""
+    row = db.execute(
+        "SELECT value FROM counters WHERE scope = ? AND key = ?", (scope, key)
+    ).fetchone()
+    return row[0] if row is not None else 0
+
+
+def counters(db: Database, scope: str) -> dict[str, int]:
+    """Non-zero counts in *scope* (e.g. "article_topic"), largest first."""
+    rows = db.execute(
+        "SELECT key, value FROM counters WHERE scope = ? AND value > 0 ORDER BY value DESC, key",
+        (scope,),
+    ).fetchall()
+    return {row[0]: row[1] for row in rows}
+
+
+def recompute_counters(db: Database) -> None:
+    """Rebuild every counter from the tables. Caller owns the transaction."""
+    db.execute("DELETE FROM counters")
+    db.execute(_RECOMPUTE_SQL)
@@ -0,0 +1,136 @@
+"""Long-running scheduler for the Herald pipeline (``herald daemon``).
+
+A scheduled ``herald run`` pays interpreter start-up, module imports, config
+parsing, schema checks and index rebuilding every time. The daemon does that
+once and then calls run_pipeline on a timer, keeping warm across runs:
+
+- the SQLite connection (and its page cache),
+- the pooled HTTP session,
+- the compiled topic matcher and the cluster indexes (WarmState).
+
+config.yaml is re-read whenever its mtime changes. Without adaptive polling
+a run starts every ``schedule.interval_hours``; with it the daemon wakes when
+the earliest source is due, but no sooner than ``min_interval_minutes``
+after the previous run.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+from herald.config import HeraldConfig, load_config
+from herald.db import Database, profile_from_config
+from herald.http import HttpSession
+from herald.pipeline import PipelineResult, WarmState, run_pipeline
+from herald.polling import next_due_at
+
+# How often to check config.yaml while waiting for the next run
+_CONFIG_POLL_SECS = 30.0
+
+
+class Daemon:
+    """Run the pipeline repeatedly in one process with warm state."""
+
+    def __init__(
+        self,
+        data_dir: Path,
+        *,
+        stop: threading.Event | None = None,
+        clock=time.time,
+    ) -> None:
+        self.data_dir = data_dir
+        self.config_path = data_dir / "config.yaml"
+        self.stop = stop or threading.Event()
+        self._clock = clock
+        self.config: HeraldConfig = load_config(self.config_path)
+        self._mtime = self.config_path.stat().st_mtime_ns
+        self.db = Database(data_dir / "herald.db", profile=profile_from_config(self.config.database))
+        self.session = HttpSession(self.config.collect)
+        self.warm = WarmState()
+        self.last_started: float | None = None
+
+    def reload_config_if_changed(self) -> bool:
+        """Re-read config.yaml if its mtime moved. Returns True when reloaded.
+
+        A config that fails to load is reported and the previous one is kept.
+        """
+        try:
+            mtime = self.config_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime
+        try:
+            config = load_config(self.config_path)
+        except Exception as exc:
+            print(f"[daemon] ERROR reloading {self.config_path}: {exc}; keeping previous config", file=sys.stderr)
+            return False
+
+        if config.collect != self.config.collect:
+            self.session.close()
+            self.session = HttpSession(config.collect)
+        if config.database != self.config.database:
+            self.db.profile = profile_from_config(config.database)
+            self.db.apply_profile(self.db.profile)
+        self.config = config
+        print(f"[daemon] reloaded {self.config_path}", file=sys.stderr)
+        return True
+
+    def run_once(self) -> PipelineResult | None:
+        """Run the pipeline once. Failures are reported, not raised."""
+        self.last_started = self._clock()
+        try:
+            result = run_pipeline(
+                self.config,
+                self.db,
+                adapter_map={s.id: s.type for s in self.config.sources},
+                data_dir=self.data_dir,
+                http_session=self.session,
+                warm=self.warm,
+            )
+        except Exception as exc:
+            print(f"[daemon] ERROR run failed: {exc}", file=sys.stderr)
+            return None
+        print(f"[daemon] run {result.run_id} complete: {result.articles_new} new articles", file=sys.stderr)
+        return result
+
+    def next_run_at(self) -> float:
+        """When the next run should start."""
+        if self.last_started is None:
+            return self._clock()
+        schedule = self.config.schedule
+        if not schedule.adaptive:
+            return self.last_started + schedule.interval_hours * 3600
+        earliest = self.last_started + schedule.min_interval_minutes * 60
+        due = next_due_at(self.db, self.config.sources)
+        return max(earliest, due if due is not None else earliest)
+
+    def serve(self, max_runs: int | None = None) -> None:
+        """Run until stop is set (or *max_runs* runs have completed)."""
+        runs = 0
+        while not self.stop.is_set():
+            self.reload_config_if_changed()
+            wait = self.next_run_at() - self._clock()
+            if wait > 0:
+                self.stop.wait(min(wait, _CONFIG_POLL_SECS))
+                continue
+            self.run_once()
+            runs += 1
+            if max_runs is not None and runs >= max_runs:
+                break
+
+    def close(self) -> None:
+        try:
+            self.session.close()
+        finally:
+            self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
@@ -1,32 +1,275 @@
 from __future__ import annotations
 
+import re
 import sqlite3
 from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from herald.config import DatabaseConfig
 
-_SCHEMA = Path(__file__).parent / "schema.sql"
+
+_MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+_MIGRATION_RE = re.compile(r"^(\d+)_\w+\.sql$")
+
+# Stay well below SQLITE_MAX_VARIABLE_NUMBER (999 on older builds)
+_MAX_PARAMS = 500
+
+
+def chunked(items: list, size: int = _MAX_PARAMS):
+    """Yield consecutive slices of *items* small enough for one IN (...) list."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+_FTS_TABLES = ("articles_fts", "stories_fts")
+
+_SYNCHRONOUS = ("OFF", "NORMAL", "FULL", "EXTRA")
+_TEMP_STORE = ("DEFAULT", "FILE", "MEMORY")
+# How long a statement waits for another connection's write lock
+_BUSY_TIMEOUT_MS = 5000
+
+
+@dataclass(frozen=True)
+class DbProfile:
+    """Per-connection performance PRAGMAs."""
+    synchronous: str = "NORMAL"  # WAL: durable on checkpoint, never corrupt
+    cache_size_mb: int = 16
+    mmap_size_mb: int = 0
+    temp_store: str = "MEMORY"
+    wal_autocheckpoint: int = 1000  # pages; 0 leaves checkpoints to maintain()
+
+
+PROFILES: dict[str, DbProfile] = {
+    "default": DbProfile(),
+    # Large batched writes: big page cache, no automatic checkpoints mid-batch
+    "bulk-load": DbProfile(cache_size_mb=128, mmap_size_mb=256, wal_autocheckpoint=0),
+    # brief/status/search: reads served from the page cache and mmap
+    "read-mostly": DbProfile(cache_size_mb=64, mmap_size_mb=256),
+}
+
+
+def resolve_profile(name: str, **overrides) -> DbProfile:
+    """Named profile with any non-None *overrides* applied."""
+    if name not in PROFILES:
+        raise ValueError(f"Unknown database profile: {name!r} (expected one of {', '.join(PROFILES)})")
+    changes = {k: v for k, v in overrides.items() if v is not None}
+    return replace(PROFILES[name], **changes)
+
+
+def profile_from_config(cfg: DatabaseConfig) -> DbProfile:
+    """Base connection profile for a ``database:`` config section."""
+    return resolve_profile(
+        cfg.profile,
+        synchronous=cfg.synchronous,
+        cache_size_mb=cfg.cache_size_mb,
+        mmap_size_mb=cfg.mmap_size_mb,
+        temp_store=cfg.temp_store,
+    )
+
+
+@lru_cache(maxsize=1)
+def _migration_files() -> tuple[tuple[int, Path], ...]:
+    """Numbered migration scripts, ordered by version."""
+    found = []
+    for path in _MIGRATIONS_DIR.iterdir():
+        m = _MIGRATION_RE.match(path.name)
+        if m:
+            found.append((int(m.group(1)), path))
+    return tuple(sorted(found))
+
+
+def schema_version() -> int:
+    """Version of the newest migration shipped with this package."""
+    files = _migration_files()
+    return files[-1][0] if files else 0
+
+
+def _pending_migrations(current: int) -> list[tuple[int, str]]:
+    """(version, script) for every migration newer than *current*."""
+    return [(v, path.read_text()) for v, path in _migration_files() if v > current]
+
+
+def _statements(script: str):
+    """Split a SQL script into complete statements (trigger bodies included)."""
+    buf = ""
+    for line in script.splitlines(keepends=True):
+        buf += line
+        if sqlite3.complete_statement(buf):
+            yield buf.strip()
+            buf = ""
+    rest = "\n".join(ln for ln in buf.splitlines() if not ln.strip().startswith("--")).strip()
+    if rest:
+        raise ValueError(f"Incomplete SQL statement in migration: {rest[:80]}")
 
 
 class Database:
-    def __init__(self, path: Path) -> None:
+    def __init__(
+        self,
+        path: Path,
+        profile: DbProfile | None = None,
+        *,
+        read_only: bool = False,
+    ) -> None:
         if not path.parent.exists():
             raise FileNotFoundError(f"Parent directory does not exist: {path.parent}")
-        self._conn = sqlite3.connect(str(path), isolation_level=None)
+        if read_only:
+            if not path.exists():
+                raise FileNotFoundError(f"Database does not exist: {path}")
+            # Readers may be handed to a server thread; callers serialize access
+            self._conn = sqlite3.connect(
+                f"{path.resolve().as_uri()}?mode=ro",
+                isolation_level=None,
+                uri=True,
+                check_same_thread=False,
+            )
+        else:
+            # uri=True lets herald.archive ATTACH archives with ?mode=ro;
+            # a plain path is still opened as a plain file
+            self._conn = sqlite3.connect(str(path), isolation_level=None, uri=True)
         self._conn.row_factory = sqlite3.Row
-        self._conn.execute("PRAGMA journal_mode=WAL")
-        self._conn.execute("PRAGMA foreign_keys=ON")
-        self._conn.execute("PRAGMA busy_timeout=5000")
-        self._apply_schema()
+        self.path = path
+        self.read_only = read_only
+        try:
+            if not read_only:
+                # Only takes effect on a new file (before WAL or any table);
+                # older databases are converted by compact()
+                self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.execute(f"PRAGMA busy_timeout={_BUSY_TIMEOUT_MS:d}")
+            self.profile = profile or PROFILES["default"]
+            # Statements issued through execute/executemany, for stage metrics
+            self.statements = 0
+            self.apply_profile(self.profile)
+            if read_only:
+                self._check_schema()
+            else:
+                self._migrate()
+        except Exception:
+            self._conn.close()
+            raise
+
+    def apply_profile(self, profile: DbProfile) -> None:
+        if profile.synchronous.upper() not in _SYNCHRONOUS:
+            raise ValueError(f"Invalid synchronous mode: {profile.synchronous!r}")
+        if profile.temp_store.upper() not in _TEMP_STORE:
+            raise ValueError(f"Invalid temp_store: {profile.temp_store!r}")
+        self._conn.execute(f"PRAGMA synchronous={profile.synchronous.upper()}")
+        # Negative cache_size is in KiB rather than pages
+        self._conn.execute(f"PRAGMA cache_size=-{int(profile.cache_size_mb) * 1024:d}")
+        self._conn.execute(f"PRAGMA mmap_size={int(profile.mmap_size_mb) * 1024 * 1024:d}")
+        self._conn.execute(f"PRAGMA temp_store={profile.temp_store.upper()}")
+        self._conn.execute(f"PRAGMA wal_autocheckpoint={int(profile.wal_autocheckpoint):d}")
+
+    @contextmanager
+    def use_profile(self, profile: DbProfile):
+        """Temporarily switch PRAGMAs, restoring this connection's profile after.
+
+        WAL frames held back by a disabled autocheckpoint are checkpointed on
+        the way out.
+        """
+        self.apply_profile(profile)
+        try:
+            yield self
+        finally:
+            self.apply_profile(self.profile)
+            if profile.wal_autocheckpoint == 0:
+                self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    @contextmanager
+    def busy_timeout(self, ms: int):
+        """Temporarily wait at most *ms* for a lock, e.g. around an optional write."""
+        self._conn.execute(f"PRAGMA busy_timeout={int(ms):d}")
+        try:
+            yield self
+        finally:
+            self._conn.execute(f"PRAGMA busy_timeout={_BUSY_TIMEOUT_MS:d}")
+
+    def data_version(self) -> int:
+        """PRAGMA data_version: changes when another connection commits a write."""
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def maintain(self) -> None:
+        """Merge FTS segments, truncate the WAL and refresh planner statistics."""
+        self.optimize_fts()
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._conn.execute("PRAGMA optimize")
+
+    def compact(self) -> tuple[int, int]:
+        """Merge FTS segments, return free pages to the filesystem and ANALYZE.
+
+        Returns the database size in bytes before and after. A database
+        created without auto_vacuum=INCREMENTAL is converted by one full
+        VACUUM, which rewrites the file; later calls only run the cheap
+        incremental vacuum.
+        """
+        before = self.size_bytes()
+        self.optimize_fts()
+        if self._conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            self._conn.execute("VACUUM")
+        else:
+            # execute() steps the pragma once, freeing a single page;
+            # executescript() runs it to completion
+            self._conn.executescript("PRAGMA incremental_vacuum;")
+        self._conn.execute("ANALYZE")
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return before, self.size_bytes()
+
+    def size_bytes(self) -> int:
+        """Size of the database in pages, as bytes (excludes the WAL)."""
+        page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+        return page_count * self._conn.execute("PRAGMA page_size").fetchone()[0]
+
+    def optimize_fts(self) -> None:
+        """Merge each FTS5 index down to a single b-tree segment."""
+        with self.transaction():
+            for table in _FTS_TABLES:
+                self._conn.execute(f"INSERT INTO {table}({table}) VALUES ('optimize')")
+
+    def _migrate(self) -> None:
+        """Bring the schema up to date via PRAGMA user_version.
+
+        The common case (already current) costs one PRAGMA read and no DDL.
+        Each pending migration runs in its own IMMEDIATE transaction and
+        re-checks the version under the write lock, so concurrent openers
+        never apply the same migration twice.
+        """
+        target = schema_version()
+        current = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if current == target:
+            return
+        if current > target:
+            raise RuntimeError(
+                f"Database schema version {current} is newer than this Herald supports ({target})"
+            )
+        for version, script in _pending_migrations(current):
+            with self.transaction():
+                if self._conn.execute("PRAGMA user_version").fetchone()[0] >= version:
+                    continue
+                for stmt in _statements(script):
+                    self._conn.execute(stmt)
+                self._conn.execute(f"PRAGMA user_version = {version:d}")
 
-    def _apply_schema(self) -> None:
-        schema = _SCHEMA.read_text()
-        self._conn.executescript(schema)
+    def _check_schema(self) -> None:
+        """A read-only connection cannot migrate; refuse a schema it does not know."""
+        current = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if current != schema_version():
+            raise RuntimeError(
+                f"Database schema version {current} does not match this Herald ({schema_version()}); "
+                "open it read-write once (e.g. 'herald run') to migrate"
+            )
 
     def execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        self.statements += 1
         return self._conn.execute(sql, params)
 
     def executemany(self, sql: str, params) -> sqlite3.Cursor:
+        self.statements += 1
         return self._conn.executemany(sql, params)
 
     @contextmanager
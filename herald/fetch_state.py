@@ -0,0 +1,71 @@
+"""Persistence for per-source conditional-GET state (ETag / Last-Modified / body hash)
+and per-run fetch telemetry."""
+from __future__ import annotations
+
+from herald.db import Database
+from herald.models import FetchLog, FetchState
+
+
+def load_fetch_state(db: Database) -> dict[str, FetchState]:
+    """Return stored fetch state keyed by source id."""
+    rows = db.execute(
+        "SELECT source_id, etag, last_modified, body_hash, fetched_at FROM source_fetch_state"
+    ).fetchall()
+    return {
+        row[0]: FetchState(
+            source_id=row[0],
+            etag=row[1],
+            last_modified=row[2],
+            body_hash=row[3],
+            fetched_at=row[4],
+        )
+        for row in rows
+    }
+
+
+def save_fetch_state(db: Database, states: dict[str, FetchState]) -> None:
+    """Upsert every state that has been fetched at least once."""
+    rows = [
+        (st.source_id, st.etag, st.last_modified, st.body_hash, st.fetched_at)
+        for st in states.values()
+        if st.fetched_at is not None
+    ]
+    if not rows:
+        return
+    with db.transaction():
+        db.executemany(
+            """
+            INSERT INTO source_fetch_state (source_id, etag, last_modified, body_hash, fetched_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(source_id) DO UPDATE SET
+                etag = excluded.etag,
+                last_modified = excluded.last_modified,
+                body_hash = excluded.body_hash,
+                fetched_at = excluded.fetched_at
+            """,
+            rows,
+        )
+
+
+def save_fetch_log(db: Database, run_id: int, logs: dict[str, FetchLog]) -> None:
+    """Write one source_fetch_log row per logged source for *run_id*."""
+    rows = [
+        (
+            run_id, log.source_id, log.status, log.retries, log.bytes,
+            log.connect_ms, log.tls_ms, log.total_ms,
+            log.items_parsed, log.items_new, log.error,
+        )
+        for log in logs.values()
+    ]
+    if not rows:
+        return
+    with db.transaction():
+        db.executemany(
+            """
+            INSERT OR REPLACE INTO source_fetch_log
+                (run_id, source_id, status, retries, bytes,
+                 connect_ms, tls_ms, total_ms, items_parsed, items_new, error)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
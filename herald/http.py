@@ -0,0 +1,172 @@
+"""Shared pooled HTTP session for the collect stage.
+
+One HttpSession is opened per pipeline run (or per daemon lifetime) and every
+adapter borrows its client, so feeds on the same host reuse keep-alive
+connections instead of paying a fresh TCP+TLS handshake each.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import sys
+from dataclasses import dataclass, replace
+
+import httpx
+
+from herald.config import CollectConfig
+
+
+@dataclass
+class ConnectionStats:
+    requests: int = 0
+    connections_opened: int = 0
+
+    @property
+    def reused(self) -> int:
+        return max(self.requests - self.connections_opened, 0)
+
+    def since(self, earlier: ConnectionStats) -> ConnectionStats:
+        """Return the counts accumulated after *earlier* was snapshotted."""
+        return ConnectionStats(
+            requests=self.requests - earlier.requests,
+            connections_opened=self.connections_opened - earlier.connections_opened,
+        )
+
+    def snapshot(self) -> ConnectionStats:
+        return replace(self)
+
+    def summary(self) -> str:
+        return (
+            f"{self.requests} requests over {self.connections_opened} new connections "
+            f"({self.reused} reused)"
+        )
+
+    def _on_trace(self, event_name: str) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+
+    def sync_hooks(self) -> dict:
+        """Event hooks for httpx.Client that count requests and new connections.
+
+        A trace callback already set on the request (per-source fetch
+        telemetry) keeps receiving events.
+        """
+        def _on_request(request: httpx.Request) -> None:
+            self.requests += 1
+            inner = request.extensions.get("trace")
+
+            def _trace(event_name, info):
+                self._on_trace(event_name)
+                if inner is not None:
+                    inner(event_name, info)
+
+            request.extensions["trace"] = _trace
+
+        return {"request": [_on_request]}
+
+    def async_hooks(self) -> dict:
+        """Event hooks for httpx.AsyncClient that count requests and new connections."""
+        async def _on_request(request: httpx.Request) -> None:
+            self.requests += 1
+            inner = request.extensions.get("trace")
+
+            async def _trace(event_name, info):
+                self._on_trace(event_name)
+                if inner is not None:
+                    await inner(event_name, info)
+
+            request.extensions["trace"] = _trace
+
+        return {"request": [_on_request]}
+
+
+def _http2_enabled(cfg: CollectConfig) -> bool:
+    """HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 without it."""
+    if not cfg.http2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        print("[collect] WARN http2 requested but 'h2' is not installed; using HTTP/1.1", file=sys.stderr)
+        return False
+    return True
+
+
+def _limits(cfg: CollectConfig) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=max(cfg.max_connections, 1),
+        max_keepalive_connections=max(cfg.max_keepalive_connections, 0),
+        keepalive_expiry=cfg.keepalive_expiry,
+    )
+
+
+def build_async_client(
+    cfg: CollectConfig,
+    *,
+    stats: ConnectionStats | None = None,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
+    """Return a pooled AsyncClient configured from *cfg*."""
+    return httpx.AsyncClient(
+        timeout=cfg.timeout,
+        follow_redirects=True,
+        limits=_limits(cfg),
+        http2=_http2_enabled(cfg) if transport is None else False,
+        transport=transport,
+        event_hooks=stats.async_hooks() if stats is not None else None,
+    )
+
+
+def build_client(
+    cfg: CollectConfig,
+    *,
+    stats: ConnectionStats | None = None,
+    transport: httpx.BaseTransport | None = None,
+) -> httpx.Client:
+    """Return a pooled synchronous Client configured from *cfg*."""
+    return httpx.Client(
+        timeout=cfg.timeout,
+        follow_redirects=True,
+        limits=_limits(cfg),
+        http2=_http2_enabled(cfg) if transport is None else False,
+        transport=transport,
+        event_hooks=stats.sync_hooks() if stats is not None else None,
+    )
+
+
+class HttpSession:
+    """A pooled AsyncClient bound to its own event loop.
+
+    The loop outlives individual collect calls, so the connection pool stays
+    warm across them. Pass *transport* (e.g. httpx.MockTransport) in tests.
+    """
+
+    def __init__(
+        self,
+        cfg: CollectConfig | None = None,
+        *,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.cfg = cfg or CollectConfig()
+        self.stats = ConnectionStats()
+        # asyncio.Runner would do, but it needs Python 3.11
+        self._loop = asyncio.new_event_loop()
+        self.client = build_async_client(self.cfg, stats=self.stats, transport=transport)
+
+    def run(self, coro):
+        """Run *coro* to completion on the session loop."""
+        return self._loop.run_until_complete(coro)
+
+    def close(self) -> None:
+        if self._loop.is_closed():
+            return
+        try:
+            self._loop.run_until_complete(self.client.aclose())
+            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+        finally:
+            self._loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
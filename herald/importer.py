@@ -0,0 +1,257 @@
+"""Bulk import of historical items into the Herald v2 database.
+
+Reads JSONL files record by record: either v2 ``RawItem`` dicts or the legacy
+``src/pipeline`` raw format (``source`` name, ``published``/``collected_at``
+strings, HN points under ``extra``). Records go through the same validation
+and UPSERT logic as the ingest stage, in batches, inside one transaction
+during which the secondary indexes, FTS triggers and counter triggers of
+the article tables are dropped. They are recreated, ``articles_fts`` is
+rebuilt and the counters are recomputed before commit, so an interrupted
+import leaves the database untouched.
+
+The import therefore needs exclusive write access for its whole length:
+committing per batch would expose a database without its indexes and FTS
+triggers, and let a concurrent pipeline run write rows the dropped triggers
+never index. Readers (``herald serve``, ``herald brief``) keep working from
+the pre-import snapshot under WAL; ``herald import`` refuses to start while
+``herald daemon`` holds the data-dir lock (herald/lockfile.py), and vice
+versa.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from herald.counters import recompute_counters
+from herald.db import PROFILES, Database
+from herald.ingest import IngestResult, _prepare_item, _write_batch
+from herald.models import RawItem, Source
+from herald.project import invalidate_brief_cache
+from herald.topics import TopicMatcher
+
+# Tables whose secondary indexes and FTS triggers are deferred during import
+_DEFERRED_TABLES = ("articles", "mentions", "article_topics")
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+@dataclass
+class ImportResult:
+    rows_read: int = 0
+    articles_new: int = 0
+    articles_updated: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+    unknown_sources: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows_read / self.seconds if self.seconds > 0 else 0.0
+
+
+def legacy_raw_dir() -> Path:
+    """Raw JSONL directory of the legacy pipeline (src/pipeline/paths.raw_dir)."""
+    base = os.environ.get("XDG_DATA_HOME") or str(Path.home() / ".local" / "share")
+    return Path(base) / "herald" / "data" / "raw"
+
+
+def _parse_time(value) -> int | None:
+    """Unix seconds from an int, ISO-8601 or RFC 2822 value; None if unparseable."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    if not isinstance(value, str) or not value.strip():
+        return None
+    text = value.strip()
+    try:
+        dt = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            dt = parsedate_to_datetime(text)
+        except (TypeError, ValueError):
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+class _SourceResolver:
+    """Map legacy source names to configured source IDs."""
+
+    def __init__(self, sources: list[Source]) -> None:
+        self._by_key: dict[str, str] = {}
+        for src in sources:
+            self._by_key.setdefault(src.id.lower(), src.id)
+            self._by_key.setdefault(src.name.lower(), src.id)
+        self._tavily = next((s.id for s in sources if s.type == "tavily"), None)
+        self._hn = next((s.id for s in sources if s.type == "hn"), None)
+
+    def __call__(self, name: str) -> str | None:
+        key = name.strip().lower()
+        if key in self._by_key:
+            return self._by_key[key]
+        if key.startswith("tavily:"):
+            return self._tavily
+        if key == "hacker news":
+            return self._hn
+        return None
+
+
+def _record_to_item(record: dict, resolve: _SourceResolver) -> tuple[RawItem | None, str | None]:
+    """(item, unresolved_source_name) for one JSONL record."""
+    url = record.get("url")
+    title = record.get("title")
+    if not isinstance(url, str) or not isinstance(title, str):
+        return None, None
+    extra = record.get("extra") if isinstance(record.get("extra"), dict) else None
+
+    if "source_id" in record:  # v2 RawItem
+        points = record.get("points", 0)
+        return RawItem(
+            url=url,
+            title=title,
+            source_id=str(record["source_id"]),
+            published_at=_parse_time(record.get("published_at")),
+            points=points if isinstance(points, int) else 0,
+            extra=extra,
+            collected_at=_parse_time(record.get("collected_at")),
+        ), None
+
+    name = str(record.get("source") or "")
+    source_id = resolve(name)
+    if source_id is None:
+        return None, name
+    points = (extra or {}).get("points", 0)
+    rest = {k: v for k, v in (extra or {}).items() if k != "points"}
+    return RawItem(
+        url=url,
+        title=title,
+        source_id=source_id,
+        published_at=_parse_time(record.get("published")),
+        points=points if isinstance(points, int) and points >= 0 else 0,
+        extra=rest or None,
+        collected_at=_parse_time(record.get("collected_at")),
+    ), None
+
+
+def read_jsonl(
+    paths: Iterable[Path],
+    sources: list[Source],
+    result: ImportResult,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[list[RawItem]]:
+    """Stream RawItem batches from JSONL files, counting unusable lines in *result*."""
+    resolve = _SourceResolver(sources)
+    batch: list[RawItem] = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                result.rows_read += 1
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    result.skipped += 1
+                    continue
+                if not isinstance(record, dict):
+                    result.skipped += 1
+                    continue
+                item, unknown = _record_to_item(record, resolve)
+                if item is None:
+                    result.skipped += 1
+                    if unknown is not None:
+                        result.unknown_sources[unknown] = result.unknown_sources.get(unknown, 0) + 1
+                    continue
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+    if batch:
+        yield batch
+
+
+def _deferred_objects(db: Database) -> list[tuple[str, str, str]]:
+    """(type, name, sql) of secondary indexes, FTS and counter triggers to drop."""
+    placeholders = ",".join("?" * len(_DEFERRED_TABLES))
+    rows = db.execute(
+        f"""
+        SELECT type, name, sql FROM sqlite_master
+        WHERE tbl_name IN ({placeholders})
+          AND sql IS NOT NULL
+          AND (type = 'index' OR (type = 'trigger' AND (
+                name LIKE '%\\_fts\\_%' ESCAPE '\\' OR name LIKE 'counters\\_%' ESCAPE '\\'
+          )))
+        ORDER BY type, name
+        """,
+        _DEFERRED_TABLES,
+    ).fetchall()
+    return [(row[0], row[1], row[2]) for row in rows]
+
+
+def import_batches(
+    db: Database,
+    batches: Iterable[list[RawItem]],
+    sources: dict[str, Source],
+    topic_rules: dict[str, list[str]] | None = None,
+    result: ImportResult | None = None,
+) -> ImportResult:
+    """Write *batches* with deferred indexes, then rebuild indexes and FTS.
+
+    Everything happens in one transaction: a failure part-way rolls back the
+    rows and restores the dropped indexes and triggers.
+    """
+    result = result or ImportResult()
+    counts = IngestResult()
+    matcher = TopicMatcher(topic_rules) if topic_rules else None
+    started = time.perf_counter()
+
+    with db.use_profile(PROFILES["bulk-load"]), db.transaction():
+        deferred = _deferred_objects(db)
+        for kind, name, _ in deferred:
+            db.execute(f'DROP {kind.upper()} "{name}"')
+
+        for batch in batches:
+            prepared = [p for p in (_prepare_item(item, sources) for item in batch) if p is not None]
+            result.skipped += len(batch) - len(prepared)
+            if prepared:
+                _write_batch(db, prepared, matcher, counts, revive=True)
+
+        for _, _, sql in deferred:
+            db.execute(sql)
+        db.execute("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+        recompute_counters(db)
+        # Updated points reorder the articles listed in briefs
+        invalidate_brief_cache(db)
+
+    result.articles_new += counts.articles_new
+    result.articles_updated += counts.articles_updated
+    result.seconds += time.perf_counter() - started
+    return result
+
+
+def import_jsonl(
+    db: Database,
+    paths: list[Path],
+    sources: list[Source],
+    topic_rules: dict[str, list[str]] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> ImportResult:
+    """Import JSONL files (v2 RawItem or legacy raw format) into *db*."""
+    result = ImportResult()
+    started = time.perf_counter()
+    batches = read_jsonl(paths, sources, result, batch_size)
+    import_batches(db, batches, {s.id: s for s in sources}, topic_rules, result)
+    # Reading is interleaved with writing; report end-to-end wall time
+    result.seconds = time.perf_counter() - started
+    if result.unknown_sources:
+        top = sorted(result.unknown_sources.items(), key=lambda kv: -kv[1])[:5]
+        names = ", ".join(f"{name or '<empty>'} ({n})" for name, n in top)
+        print(f"[import] skipped records from unconfigured sources: {names}", file=sys.stderr)
+    return result
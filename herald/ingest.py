@@ -4,13 +4,13 @@ from __future__ import annotations
 import json
 import re
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from urllib.parse import urlparse as _urlparse
 
-from herald.db import Database
+from herald.db import Database, chunked
 from herald.models import RawItem, Source
 from herald.scoring import article_score_base
-from herald.topics import extract_topics
+from herald.topics import TopicMatcher
 from herald.ulid import generate_ulid
 from herald.url import canonicalize_url
 
@@ -114,140 +114,285 @@ def _detect_type(title: str) -> str:
 class IngestResult:
     articles_new: int = 0
     articles_updated: int = 0
+    # Items skipped because retention already removed their URL
+    articles_retired: int = 0
+    # source_id -> articles first stored from that source
+    new_by_source: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class _Prepared:
+    """A RawItem that passed validation, with everything derived from it."""
+    item: RawItem
+    source: Source
+    url_canonical: str
+    title: str
+    story_type: str
+    is_release: bool
+    extra_json: str | None
+
+
+def _prepare_item(item: RawItem, sources: dict[str, Source]) -> _Prepared | None:
+    """Validate and normalize one item. Returns None when it must be dropped."""
+    source = sources.get(item.source_id)
+    if source is None:
+        return None
+
+    # Reject URLs containing null bytes
+    if "\x00" in item.url:
+        return None
+
+    # Validate URL — only hierarchical http/https with a non-empty hostname
+    # and no whitespace, quotes, or control characters.
+    try:
+        _parsed = _urlparse(item.url)
+        _scheme = _parsed.scheme.lower()
+    except Exception:
+        return None
+    if _scheme not in _ALLOWED_URL_SCHEMES:
+        return None
+    if not _parsed.hostname:
+        return None
+    # Reject URLs containing whitespace, quotes, or control characters
+    if any(c in item.url for c in (' ', '\t', '\n', '\r', '"', "'")):
+        return None
+    if any(ord(c) < 0x20 for c in item.url):
+        return None
+
+    try:
+        url_canonical = canonicalize_url(item.url)
+    except Exception:
+        return None
+
+    # Sanitize and truncate title
+    title = _sanitize_title(item.title)
+    if not title:
+        return None
+    if len(title) > _TITLE_MAX_LEN:
+        title = title[:_TITLE_MAX_LEN]
+
+    return _Prepared(
+        item=item,
+        source=source,
+        url_canonical=url_canonical,
+        title=title,
+        story_type=_detect_type(title),
+        is_release=_detect_release(title),
+        extra_json=json.dumps(item.extra) if item.extra else None,
+    )
+
+
+def _lookup_existing(db: Database, urls: list[str]) -> dict[str, list]:
+    """Map url_canonical -> [article_id, points] for URLs already stored."""
+    existing: dict[str, list] = {}
+    for chunk in chunked(urls):
+        placeholders = ",".join("?" * len(chunk))
+        rows = db.execute(
+            f"SELECT url_canonical, id, points FROM articles WHERE url_canonical IN ({placeholders})",
+            tuple(chunk),
+        ).fetchall()
+        for row in rows:
+            existing[row[0]] = [row[1], row[2]]
+    return existing
+
+
+def _lookup_retired(db: Database, urls: list[str]) -> set[str]:
+    """The URLs among *urls* that retention deleted or archived."""
+    retired: set[str] = set()
+    for chunk in chunked(urls):
+        placeholders = ",".join("?" * len(chunk))
+        retired.update(
+            row[0]
+            for row in db.execute(
+                f"SELECT url_canonical FROM retired_urls WHERE url_canonical IN ({placeholders})",
+                tuple(chunk),
+            )
+        )
+    return retired
+
+
+def _revive_retired(db: Database, urls: list[str]) -> None:
+    for chunk in chunked(urls):
+        placeholders = ",".join("?" * len(chunk))
+        db.execute(f"DELETE FROM retired_urls WHERE url_canonical IN ({placeholders})", tuple(chunk))
+
+
+def _next_article_id(db: Database) -> int:
+    """First articles.id not yet handed out.
+
+    AUTOINCREMENT keeps sqlite_sequence at or above MAX(id), and the caller
+    holds the write lock, so ids can be assigned before the batched INSERT.
+    """
+    row = db.execute("SELECT seq FROM sqlite_sequence WHERE name = 'articles'").fetchone()
+    return (row[0] if row else 0) + 1
 
 
 def ingest_items(
     db: Database,
     items: list[RawItem],
     sources: dict[str, Source],
-    topic_rules: dict[str, list[str]] | None = None,
+    topic_rules: dict[str, list[str]] | TopicMatcher | None = None,
 ) -> IngestResult:
+    """UPSERT items as articles, record mentions and assign topics.
+
+    Works set-at-a-time: items are validated in Python, existing URLs are
+    resolved with chunked IN queries, and all writes go out via executemany.
+    Items repeating a URL within the batch behave exactly as if they had
+    been ingested one after another. *topic_rules* may be a prebuilt
+    TopicMatcher.
+    """
     result = IngestResult()
-    now = int(time.time())
+    prepared = [p for p in (_prepare_item(item, sources) for item in items) if p is not None]
+    if not prepared:
+        return result
 
     with db.transaction():
-        for item in items:
-            source = sources.get(item.source_id)
-            if source is None:
-                continue
-
-            # Reject URLs containing null bytes
-            if "\x00" in item.url:
-                continue
-
-            # Validate URL — only hierarchical http/https with a non-empty hostname
-            # and no whitespace, quotes, or control characters.
-            try:
-                _parsed = _urlparse(item.url)
-                _scheme = _parsed.scheme.lower()
-            except Exception:
-                continue
-            if _scheme not in _ALLOWED_URL_SCHEMES:
-                continue
-            if not _parsed.hostname:
-                continue
-            # Reject URLs containing whitespace, quotes, or control characters
-            if any(c in item.url for c in (' ', '\t', '\n', '\r', '"', "'")):
-                continue
-            if any(ord(c) < 0x20 for c in item.url):
-                continue
-
-            try:
-                url_canonical = canonicalize_url(item.url)
-            except Exception:
-                continue
-
-            # Sanitize and truncate title
-            title = _sanitize_title(item.title)
-            if not title:
-                continue
-            if len(title) > _TITLE_MAX_LEN:
-                title = title[:_TITLE_MAX_LEN]
-
-            # Pre-check: does this canonical URL already exist?
-            existing = db.execute(
-                "SELECT id, points FROM articles WHERE url_canonical = ?",
-                (url_canonical,),
-            ).fetchone()
-
-            is_release = _detect_release(title)
-            story_type = _detect_type(title)
-            extra_json = json.dumps(item.extra) if item.extra else None
-
-            if existing is None:
-                # New article
-                article_id = generate_ulid()
-                score = article_score_base(
-                    source_weight=source.weight,
-                    points=item.points,
-                    keyword_density=0.0,
-                    is_release=is_release,
-                )
-                db.execute(
-                    """
-                    INSERT INTO articles
-                        (id, url_original, url_canonical, title, origin_source_id,
-                         published_at, collected_at, points, story_type, score_base,
-                         scored_at, extra)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        article_id,
-                        item.url,
-                        url_canonical,
-                        title,
-                        item.source_id,
-                        item.published_at,
-                        now,
-                        item.points,
-                        story_type,
-                        score,
-                        now,
-                        extra_json,
-                    ),
-                )
-                result.articles_new += 1
-            else:
-                # Existing article — update only if new points are higher
-                article_id = existing[0]
-                existing_points = existing[1]
-                effective_points = max(existing_points, item.points)
-                score = article_score_base(
-                    source_weight=source.weight,
-                    points=effective_points,
-                    keyword_density=0.0,
-                    is_release=is_release,
-                )
-                if item.points > existing_points:
-                    db.execute(
-                        """
-                        UPDATE articles
-                        SET points = ?,
-                            score_base = ?,
-                            scored_at = ?
-                        WHERE id = ?
-                        """,
-                        (effective_points, score, now, article_id),
-                    )
-                result.articles_updated += 1
-
-            # Insert mention (ignore duplicates — same article+source)
-            db.execute(
-                """
-                INSERT OR IGNORE INTO mentions
-                    (article_id, source_id, url, points, discovered_at)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (article_id, item.source_id, item.url, item.points, now),
-            )
+        _write_batch(db, prepared, topic_rules, result)
+    return result
 
-            # Assign topics
-            if topic_rules:
-                topics = extract_topics(title, topic_rules)
-                for topic in topics:
-                    db.execute(
-                        "INSERT OR IGNORE INTO article_topics (article_id, topic) VALUES (?, ?)",
-                        (article_id, topic),
-                    )
 
-    return result
+def sync_sources(db: Database, sources: list[Source]) -> None:
+    """Upsert configured sources so articles can reference them."""
+    for src in sources:
+        db.execute(
+            """INSERT INTO sources (id, name, url, weight, category)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(id) DO UPDATE SET
+                 name = excluded.name,
+                 url = excluded.url,
+                 weight = excluded.weight,
+                 category = excluded.category""",
+            (src.id, src.name, src.url, src.weight, src.category),
+        )
+
+
+def _write_batch(
+    db: Database,
+    prepared: list[_Prepared],
+    topic_rules: dict[str, list[str]] | TopicMatcher | None,
+    result: IngestResult,
+    *,
+    revive: bool = False,
+) -> None:
+    """Write one batch of prepared items. Caller owns the transaction.
+
+    Items whose URL retention has retired are skipped, unless *revive*
+    (``herald import`` restoring an archive), which un-retires them.
+    """
+    now = int(time.time())
+    if topic_rules and not isinstance(topic_rules, TopicMatcher):
+        topic_rules = TopicMatcher(topic_rules)
+    urls = list({p.url_canonical for p in prepared})
+    existing = _lookup_existing(db, urls)
+    if revive:
+        _revive_retired(db, urls)
+        retired: set[str] = set()
+    else:
+        retired = _lookup_retired(db, [u for u in urls if u not in existing])
+    next_id = _next_article_id(db)
+
+    # article_id -> INSERT row for articles first seen in this batch
+    inserts: dict[int, list] = {}
+    # article_id -> UPDATE params for stored articles whose points rose
+    updates: dict[int, tuple] = {}
+    mentions: list[tuple] = []
+    article_topics: list[tuple] = []
+
+    for p in prepared:
+        item = p.item
+        known = existing.get(p.url_canonical)
+        if known is None and p.url_canonical in retired:
+            result.articles_retired += 1
+            continue
+        if known is None:
+            # New article
+            article_id = next_id
+            next_id += 1
+            score = article_score_base(
+                source_weight=p.source.weight,
+                points=item.points,
+                keyword_density=0.0,
+                is_release=p.is_release,
+            )
+            inserts[article_id] = [
+                article_id,
+                generate_ulid(),
+                item.url,
+                p.url_canonical,
+                p.title,
+                item.source_id,
+                item.published_at,
+                item.collected_at or now,
+                item.points,
+                p.story_type,
+                score,
+                now,
+                p.extra_json,
+            ]
+            existing[p.url_canonical] = [article_id, item.points]
+            result.articles_new += 1
+            result.new_by_source[item.source_id] = result.new_by_source.get(item.source_id, 0) + 1
+        else:
+            # Existing article — update only if new points are higher
+            article_id, existing_points = known
+            effective_points = max(existing_points, item.points)
+            score = article_score_base(
+                source_weight=p.source.weight,
+                points=effective_points,
+                keyword_density=0.0,
+                is_release=p.is_release,
+            )
+            if item.points > existing_points:
+                pending = inserts.get(article_id)
+                if pending is not None:
+                    # Not written yet: fold the bump into the INSERT row
+                    pending[8] = effective_points
+                    pending[10] = score
+                else:
+                    updates[article_id] = (effective_points, score, now, article_id)
+                known[1] = effective_points
+            result.articles_updated += 1
+
+        # Mention (duplicates — same article+source — are ignored on insert)
+        mentions.append((article_id, item.source_id, item.url, item.points, item.collected_at or now))
+
+        # Assign topics
+        if topic_rules:
+            for topic in topic_rules.match(p.title):
+                article_topics.append((article_id, topic))
+
+    if inserts:
+        db.executemany(
+            """
+            INSERT INTO articles
+                (id, ulid, url_original, url_canonical, title, origin_source_id,
+                 published_at, collected_at, points, story_type, score_base,
+                 scored_at, extra)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            list(inserts.values()),
+        )
+    if updates:
+        db.executemany(
+            """
+            UPDATE articles
+            SET points = ?,
+                score_base = ?,
+                scored_at = ?
+            WHERE id = ?
+            """,
+            list(updates.values()),
+        )
+    db.executemany(
+        """
+        INSERT OR IGNORE INTO mentions
+            (article_id, source_id, url, points, discovered_at)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        mentions,
+    )
+    if article_topics:
+        db.executemany(
+            "INSERT OR IGNORE INTO article_topics (article_id, topic) VALUES (?, ?)",
+            article_topics,
+        )
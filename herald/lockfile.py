@@ -0,0 +1,44 @@
+"""Exclusive lock between long writers on one data dir.
+
+``herald daemon`` holds {data_dir}/herald.lock for as long as it runs, and
+``herald import`` for the length of its single bulk transaction. Each
+refuses to start while the other holds it: the import keeps the write lock
+from its first batch to its commit, so a daemon run would otherwise wait
+out busy_timeout and fail. The lock is an advisory flock, released by the
+kernel if the process dies.
+"""
+from __future__ import annotations
+
+import fcntl
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+LOCK_NAME = "herald.lock"
+
+
+class LockHeld(RuntimeError):
+    pass
+
+
+@contextmanager
+def exclusive(data_dir: Path, command: str) -> Iterator[None]:
+    """Hold the data-dir lock, or raise LockHeld naming the current holder."""
+    path = Path(data_dir) / LOCK_NAME
+    with path.open("a+", encoding="utf-8") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            f.seek(0)
+            holder = f.read().strip() or "another herald process"
+            raise LockHeld(f"{holder} is running on {data_dir}; stop it or wait for it to finish") from None
+        try:
+            f.seek(0)
+            f.truncate()
+            f.write(f"herald {command}")
+            f.flush()
+            yield
+        finally:
+            f.seek(0)
+            f.truncate()
+            fcntl.flock(f, fcntl.LOCK_UN)
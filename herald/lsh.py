@@ -0,0 +1,143 @@
+"""MinHash LSH candidate index over normalized story titles.
+
+Each title is shingled into character trigrams and summarized by a MinHash
+signature of ``bands * rows`` values. Titles whose signatures agree on every
+row of at least one band share a bucket and become merge candidates; the
+exact guards in ``herald.cluster`` still decide whether they merge.
+
+Bucket keys are persisted in ``story_lsh`` so signatures are computed once
+per story title rather than once per run. All hashing is deterministic across
+processes (no reliance on ``hash()`` of strings).
+"""
+from __future__ import annotations
+
+import hashlib
+import random
+import zlib
+from typing import Iterable
+
+from herald.db import Database
+
+_SHINGLE = 3
+_PRIME = (1 << 61) - 1
+_SEED = 0x5EED
+
+
+def _shingles(norm: str) -> set[int]:
+    """Character trigrams of a normalized title, hashed to 32 bits."""
+    text = f" {norm} "
+    if len(text) <= _SHINGLE:
+        return {zlib.crc32(text.encode())}
+    return {
+        zlib.crc32(text[i:i + _SHINGLE].encode())
+        for i in range(len(text) - _SHINGLE + 1)
+    }
+
+
+def _permutations(count: int) -> list[tuple[int, int]]:
+    rng = random.Random(_SEED)
+    return [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(count)]
+
+
+class LshIndex:
+    """Banded MinHash buckets for active stories, mirrored in ``story_lsh``."""
+
+    def __init__(self, bands: int, rows: int) -> None:
+        if bands < 1 or rows < 1:
+            raise ValueError("lsh_bands and lsh_rows must be positive")
+        self.bands = bands
+        self.rows = rows
+        self.scheme = f"b{bands}r{rows}"
+        self._perms = _permutations(bands * rows)
+        self._buckets: dict[int, set[int]] = {}
+        self._keys: dict[int, list[int]] = {}
+
+    @classmethod
+    def load(
+        cls,
+        db: Database,
+        bands: int,
+        rows: int,
+        stories: Iterable[tuple[int, str]] = (),
+    ) -> LshIndex:
+        """Load persisted buckets for active stories and backfill missing ones.
+
+        *stories* is ``(story_id, normalized_title)`` for every active story;
+        any without rows under the current banding scheme are hashed and
+        written now. Rows from other schemes are dropped.
+        """
+        index = cls(bands, rows)
+        persisted = db.execute(
+            """
+            SELECT l.bucket, l.story_id
+            FROM story_lsh l
+            JOIN stories s ON s.id = l.story_id AND s.status = 'active'
+            WHERE l.scheme = ?
+            """,
+            (index.scheme,),
+        ).fetchall()
+        for bucket, story_id in persisted:
+            index._buckets.setdefault(bucket, set()).add(story_id)
+            index._keys.setdefault(story_id, []).append(bucket)
+
+        missing = [(sid, norm) for sid, norm in stories if sid not in index._keys]
+        with db.transaction():
+            db.execute("DELETE FROM story_lsh WHERE scheme != ?", (index.scheme,))
+            for story_id, norm in missing:
+                index.put(db, story_id, norm)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def signature(self, norm: str) -> list[int]:
+        hashes = _shingles(norm)
+        return [min((a * h + b) % _PRIME for h in hashes) for a, b in self._perms]
+
+    def keys(self, norm: str) -> list[int]:
+        """One signed 64-bit bucket key per band."""
+        sig = self.signature(norm)
+        keys = []
+        for band in range(self.bands):
+            chunk = sig[band * self.rows:(band + 1) * self.rows]
+            digest = hashlib.blake2b(
+                repr((self.scheme, band, chunk)).encode(), digest_size=8
+            ).digest()
+            keys.append(int.from_bytes(digest, "big", signed=True))
+        return keys
+
+    def candidates(self, keys: list[int]) -> set[int]:
+        found: set[int] = set()
+        for key in keys:
+            bucket = self._buckets.get(key)
+            if bucket:
+                found |= bucket
+        return found
+
+    def put(self, db: Database, story_id: int, norm: str, keys: list[int] | None = None) -> None:
+        """Index (or re-index) *story_id* under *norm*. Caller owns the transaction.
+
+        *keys* may be passed when already computed for the same title.
+        """
+        self._discard(story_id)
+        db.execute("DELETE FROM story_lsh WHERE story_id = ?", (story_id,))
+        keys = list(dict.fromkeys(self.keys(norm) if keys is None else keys))
+        self._keys[story_id] = keys
+        for key in keys:
+            self._buckets.setdefault(key, set()).add(story_id)
+        db.executemany(
+            "INSERT INTO story_lsh (scheme, bucket, story_id) VALUES (?, ?, ?)",
+            [(self.scheme, key, story_id) for key in keys],
+        )
+
+    def discard(self, story_id: int) -> None:
+        """Forget *story_id* in memory; its story_lsh rows are the caller's concern."""
+        self._discard(story_id)
+
+    def _discard(self, story_id: int) -> None:
+        for key in self._keys.pop(story_id, ()):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(story_id)
+                if not bucket:
+                    del self._buckets[key]
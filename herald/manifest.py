@@ -0,0 +1,77 @@
+"""status.json: a summary of the last pipeline run for cheap readers.
+
+run_pipeline rewrites the manifest at the end of every run, so ``herald
+status`` and the SessionStart hook can answer without opening SQLite (or,
+for the hook, without starting Python). Readers fall back to the database
+when the manifest is missing or unreadable. Commands that change the
+counts outside a pipeline run (``herald import``) remove it.
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from herald.metrics import StageMetrics
+
+MANIFEST_NAME = "status.json"
+
+# Bumped when keys are renamed or removed; readers ignore other versions
+_VERSION = 1
+
+
+def build_manifest(
+    summary: dict,
+    *,
+    started_at: int,
+    error: str | None,
+    counts: dict[str, int],
+    brief_path: Path | None,
+    stages: list[StageMetrics],
+) -> dict:
+    """Manifest for a finished run.
+
+    *summary* is query.status_summary() taken after the run was recorded,
+    so it carries the article/story totals and the run's finish time.
+    *counts* holds the run's own articles_new/... figures.
+    """
+    return {
+        "version": _VERSION,
+        **summary,
+        "started_at": started_at,
+        "error": error,
+        **counts,
+        "brief_path": str(brief_path) if brief_path is not None else None,
+        "stages": [asdict(m) for m in stages],
+    }
+
+
+def write_manifest(data_dir: Path, manifest: dict) -> Path:
+    """Atomically replace {data_dir}/status.json with *manifest*."""
+    path = Path(data_dir) / MANIFEST_NAME
+    tmp = path.with_name(f".{MANIFEST_NAME}.{os.getpid()}.tmp")
+    try:
+        # One key per line keeps "last_run_at" greppable for the shell hook
+        tmp.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return path
+
+
+def read_manifest(data_dir: Path) -> dict | None:
+    """The current manifest, or None when missing, unreadable or outdated."""
+    try:
+        manifest = json.loads((Path(data_dir) / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("version") != _VERSION:
+        return None
+    return manifest
+
+
+def remove_manifest(data_dir: Path) -> None:
+    (Path(data_dir) / MANIFEST_NAME).unlink(missing_ok=True)
@@ -0,0 +1,122 @@
+"""Per-stage timing and resource metrics for pipeline runs.
+
+Each stage of ``run_pipeline`` is wrapped in ``StageRecorder.stage``, which
+measures wall time, process CPU time, the SQL statements the stage issued
+through ``Database.execute``/``executemany`` (an ``executemany`` batch counts
+once) and the memory high-water mark, and the caller fills in item counts. Rows
+are stored in ``pipeline_stage_metrics`` keyed by run id.
+
+Memory is reported two ways. ``peak_rss_bytes`` is the process peak RSS
+after the stage (``resource.ru_maxrss``): it never decreases, so the stage
+that raised it is the one that grew the process. ``py_peak_bytes`` is the
+true per-stage peak of Python allocations, recorded only while
+``tracemalloc`` is tracing (e.g. ``PYTHONTRACEMALLOC=1``) since tracing
+slows allocation-heavy stages noticeably.
+"""
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from herald.db import Database
+
+
+def peak_rss_bytes() -> int | None:
+    """Peak resident set size of this process, or None where unsupported."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class StageMetrics:
+    stage: str
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+    sql_statements: int = 0
+    items_in: int | None = None
+    items_out: int | None = None
+    peak_rss_bytes: int | None = None
+    py_peak_bytes: int | None = None
+
+
+class StageRecorder:
+    """Collect StageMetrics for one pipeline run."""
+
+    def __init__(self, db: Database) -> None:
+        self._db = db
+        self.stages: list[StageMetrics] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        """Measure the enclosed block; yields its StageMetrics for item counts.
+
+        The metrics are kept even when the block raises, so a failed run
+        still shows how far it got and what the failing stage cost.
+        """
+        metrics = StageMetrics(stage=name)
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        statements = self._db.statements
+        wall0 = time.perf_counter()
+        cpu0 = time.process_time()
+        try:
+            yield metrics
+        finally:
+            metrics.cpu_ms = (time.process_time() - cpu0) * 1000
+            metrics.wall_ms = (time.perf_counter() - wall0) * 1000
+            metrics.sql_statements = self._db.statements - statements
+            metrics.peak_rss_bytes = peak_rss_bytes()
+            if tracing:
+                metrics.py_peak_bytes = tracemalloc.get_traced_memory()[1]
+            self.stages.append(metrics)
+
+    def save(self, run_id: int) -> None:
+        """Write the recorded stages for *run_id*."""
+        if not self.stages:
+            return
+        with self._db.transaction():
+            self._db.executemany(
+                """
+                INSERT OR REPLACE INTO pipeline_stage_metrics
+                    (run_id, seq, stage, wall_ms, cpu_ms, sql_statements,
+                     items_in, items_out, peak_rss_bytes, py_peak_bytes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        run_id, seq, m.stage, m.wall_ms, m.cpu_ms, m.sql_statements,
+                        m.items_in, m.items_out, m.peak_rss_bytes, m.py_peak_bytes,
+                    )
+                    for seq, m in enumerate(self.stages)
+                ],
+            )
+
+
+def load_stage_metrics(db: Database, runs: int = 10) -> list[tuple[int, list[StageMetrics]]]:
+    """Stage metrics of the last *runs* pipeline runs, newest first."""
+    rows = db.execute(
+        """
+        SELECT m.run_id, m.stage, m.wall_ms, m.cpu_ms, m.sql_statements,
+               m.items_in, m.items_out, m.peak_rss_bytes, m.py_peak_bytes
+        FROM pipeline_stage_metrics m
+        WHERE m.run_id IN (
+            SELECT DISTINCT run_id FROM pipeline_stage_metrics
+            ORDER BY run_id DESC LIMIT ?
+        )
+        ORDER BY m.run_id DESC, m.seq
+        """,
+        (runs,),
+    ).fetchall()
+    by_run: dict[int, list[StageMetrics]] = {}
+    for row in rows:
+        by_run.setdefault(row[0], []).append(StageMetrics(*row[1:]))
+    return list(by_run.items())
@@ -1,3 +1,6 @@
+-- Baseline schema. Every statement is IF NOT EXISTS so databases created
+-- before versioned migrations (user_version 0) upgrade in place.
+
 CREATE TABLE IF NOT EXISTS sources (
     id TEXT PRIMARY KEY,
     name TEXT NOT NULL,
@@ -6,6 +9,21 @@ CREATE TABLE IF NOT EXISTS sources (
     category TEXT CHECK(category IN ('community','official','aggregator'))
 );
 
+CREATE TABLE IF NOT EXISTS source_fetch_state (
+    source_id TEXT PRIMARY KEY REFERENCES sources(id) ON DELETE CASCADE,
+    etag TEXT,
+    last_modified TEXT,
+    body_hash TEXT,
+    fetched_at INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS source_schedule (
+    source_id TEXT PRIMARY KEY REFERENCES sources(id) ON DELETE CASCADE,
+    interval_secs INTEGER NOT NULL,
+    next_due_at INTEGER NOT NULL,
+    polled_at INTEGER NOT NULL
+);
+
 CREATE TABLE IF NOT EXISTS articles (
     id TEXT PRIMARY KEY,
     url_original TEXT NOT NULL,
@@ -65,6 +83,15 @@ CREATE TABLE IF NOT EXISTS story_topics (
 );
 CREATE INDEX IF NOT EXISTS idx_story_topics_topic ON story_topics(topic, story_id);
 
+-- MinHash LSH band buckets over active story titles (clustering.candidate_index: lsh)
+CREATE TABLE IF NOT EXISTS story_lsh (
+    scheme TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    story_id TEXT NOT NULL REFERENCES stories(id) ON DELETE CASCADE,
+    PRIMARY KEY (scheme, bucket, story_id)
+);
+CREATE INDEX IF NOT EXISTS idx_story_lsh_story ON story_lsh(story_id);
+
 CREATE TABLE IF NOT EXISTS pipeline_runs (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     started_at INTEGER NOT NULL,
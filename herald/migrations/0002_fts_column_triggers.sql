@@ -0,0 +1,18 @@
+-- Re-index FTS rows only when indexed columns change. Score, points and
+-- timestamp updates on the hot ingest/cluster paths no longer rewrite them.
+
+DROP TRIGGER IF EXISTS articles_fts_update;
+CREATE TRIGGER articles_fts_update AFTER UPDATE OF title ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title) VALUES ('delete', old.rowid, old.title);
+    INSERT INTO articles_fts(rowid, title) VALUES (new.rowid, new.title);
+END;
+
+DROP TRIGGER IF EXISTS stories_fts_update;
+CREATE TRIGGER stories_fts_update AFTER UPDATE OF title, summary ON stories BEGIN
+    INSERT INTO stories_fts(stories_fts, rowid, title, summary) VALUES ('delete', old.rowid, old.title, old.summary);
+    INSERT INTO stories_fts(rowid, title, summary) VALUES (new.rowid, new.title, new.summary);
+END;
+
+-- Merge segments incrementally as they accumulate (persisted FTS5 setting)
+INSERT INTO articles_fts(articles_fts, rank) VALUES ('automerge', 8);
+INSERT INTO stories_fts(stories_fts, rank) VALUES ('automerge', 8);
@@ -0,0 +1,14 @@
+-- Per-stage timing and resource metrics for each pipeline run.
+CREATE TABLE IF NOT EXISTS pipeline_stage_metrics (
+    run_id INTEGER NOT NULL REFERENCES pipeline_runs(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    wall_ms REAL NOT NULL,
+    cpu_ms REAL NOT NULL,
+    sql_statements INTEGER NOT NULL,
+    items_in INTEGER,
+    items_out INTEGER,
+    peak_rss_bytes INTEGER,
+    py_peak_bytes INTEGER,
+    PRIMARY KEY (run_id, seq)
+) WITHOUT ROWID;
@@ -0,0 +1,19 @@
+-- Per-source fetch telemetry for each pipeline run: latency, bytes, HTTP
+-- status, retries and item yield. Keyed by source first so one feed's
+-- history is a range scan.
+CREATE TABLE IF NOT EXISTS source_fetch_log (
+    source_id TEXT NOT NULL REFERENCES sources(id) ON DELETE CASCADE,
+    run_id INTEGER NOT NULL REFERENCES pipeline_runs(id) ON DELETE CASCADE,
+    status INTEGER,
+    retries INTEGER NOT NULL DEFAULT 0,
+    bytes INTEGER NOT NULL DEFAULT 0,
+    connect_ms REAL NOT NULL DEFAULT 0,
+    tls_ms REAL NOT NULL DEFAULT 0,
+    total_ms REAL NOT NULL DEFAULT 0,
+    items_parsed INTEGER NOT NULL DEFAULT 0,
+    items_new INTEGER,
+    error TEXT,
+    PRIMARY KEY (source_id, run_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_source_fetch_log_run ON source_fetch_log(run_id);
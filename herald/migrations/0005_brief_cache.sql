@@ -0,0 +1,12 @@
+-- Rendered briefs, one per (hours, max_stories, topic) combination.
+-- A row is valid while run_id is still the latest pipeline run and
+-- expires_at (when its oldest story leaves the window) has not passed.
+CREATE TABLE IF NOT EXISTS brief_cache (
+    hours INTEGER NOT NULL,
+    max_stories INTEGER NOT NULL,
+    topic TEXT NOT NULL,  -- '' when unfiltered
+    run_id INTEGER NOT NULL,
+    expires_at INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (hours, max_stories, topic)
+) WITHOUT ROWID;
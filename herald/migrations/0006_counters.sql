@@ -0,0 +1,90 @@
+-- Row counts kept current by triggers, so status and topic listings read
+-- one row instead of scanning. Scopes:
+--   table          rows per table (key = table name)
+--   source         articles per origin source
+--   story_status   stories per status (active / inactive)
+--   article_topic  articles per topic
+--   story_topic    stories per topic
+-- Rows may sit at 0 after deletions. herald.counters.recompute_counters
+-- rebuilds the table (used after bulk imports, which defer these triggers).
+CREATE TABLE IF NOT EXISTS counters (
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (scope, key)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS counters_articles_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('table', 'articles', 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO counters (scope, key, value) VALUES ('source', new.origin_source_id, 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS counters_articles_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('table', 'articles', -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO counters (scope, key, value) VALUES ('source', old.origin_source_id, -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS counters_articles_source AFTER UPDATE OF origin_source_id ON articles
+WHEN old.origin_source_id IS NOT new.origin_source_id BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('source', old.origin_source_id, -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO counters (scope, key, value) VALUES ('source', new.origin_source_id, 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS counters_mentions_insert AFTER INSERT ON mentions BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('table', 'mentions', 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS counters_mentions_delete AFTER DELETE ON mentions BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('table', 'mentions', -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS counters_story_articles_insert AFTER INSERT ON story_articles BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('table', 'story_articles', 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS counters_story_articles_delete AFTER DELETE ON story_articles BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('table', 'story_articles', -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS counters_stories_insert AFTER INSERT ON stories BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('table', 'stories', 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO counters (scope, key, value) VALUES ('story_status', new.status, 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS counters_stories_delete AFTER DELETE ON stories BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('table', 'stories', -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO counters (scope, key, value) VALUES ('story_status', old.status, -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS counters_stories_status AFTER UPDATE OF status ON stories
+WHEN old.status IS NOT new.status BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('story_status', old.status, -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO counters (scope, key, value) VALUES ('story_status', new.status, 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS counters_article_topics_insert AFTER INSERT ON article_topics BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('article_topic', new.topic, 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS counters_article_topics_delete AFTER DELETE ON article_topics BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('article_topic', old.topic, -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS counters_story_topics_insert AFTER INSERT ON story_topics BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('story_topic', new.topic, 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS counters_story_topics_delete AFTER DELETE ON story_topics BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('story_topic', old.topic, -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+-- Backfill from existing rows
+INSERT INTO counters (scope, key, value)
+    SELECT 'table', 'articles', COUNT(*) FROM articles
+    UNION ALL SELECT 'table', 'mentions', COUNT(*) FROM mentions
+    UNION ALL SELECT 'table', 'stories', COUNT(*) FROM stories
+    UNION ALL SELECT 'table', 'story_articles', COUNT(*) FROM story_articles
+    UNION ALL SELECT 'source', origin_source_id, COUNT(*) FROM articles GROUP BY origin_source_id
+    UNION ALL SELECT 'story_status', status, COUNT(*) FROM stories GROUP BY status
+    UNION ALL SELECT 'article_topic', topic, COUNT(*) FROM article_topics GROUP BY topic
+    UNION ALL SELECT 'story_topic', topic, COUNT(*) FROM story_topics GROUP BY topic;
@@ -0,0 +1,4 @@
+-- Retention deletes articles in batches. Each deleted article makes SQLite
+-- look for stories pointing at it (ON DELETE SET NULL); without this index
+-- that lookup is a full scan of stories per article.
+CREATE INDEX IF NOT EXISTS idx_stories_canonical_article ON stories(canonical_article_id);
@@ -0,0 +1,7 @@
+-- Stories moved out of herald.db into archive/YYYY-MM.db by
+-- retention.move_to_archive_days, keyed by story id. A lookup of an
+-- archived story ATTACHes only the one file named here.
+CREATE TABLE IF NOT EXISTS archived_stories (
+    id TEXT PRIMARY KEY,
+    month TEXT NOT NULL
+) WITHOUT ROWID;
@@ -0,0 +1,10 @@
+-- Hot-path indexes so cluster() reads only recent rows.
+-- Articles start out pending and cluster() clears the flag once it has
+-- clustered or skipped them (short titles), so its scan for new articles
+-- reads the partial index instead of every article ever stored.
+ALTER TABLE articles ADD COLUMN cluster_pending INTEGER NOT NULL DEFAULT 1;
+UPDATE articles SET cluster_pending = 0 WHERE id IN (SELECT article_id FROM story_articles);
+CREATE INDEX IF NOT EXISTS idx_articles_cluster_pending ON articles(collected_at) WHERE cluster_pending = 1;
+
+-- Active stories (loaded by StoryIndex, aged out by deactivate_stale)
+CREATE INDEX IF NOT EXISTS idx_stories_active ON stories(last_updated) WHERE status = 'active';
@@ -0,0 +1,224 @@
+-- Integer surrogate keys for articles and stories.
+-- articles.id and stories.id become INTEGER PRIMARY KEY (the rowid) and the
+-- 26-character ULID moves to a uniquely indexed ``ulid`` column, which is what
+-- the CLI, the HTTP API and the archive records expose. Every table and index
+-- that repeated the ULID now stores an 8-byte-or-less integer, and joins
+-- compare integers. AUTOINCREMENT keeps ids from being reused after deletes.
+--
+-- New ids are the old rowids, so articles_fts and stories_fts (external
+-- content keyed by rowid) stay valid without a rebuild. The link tables are
+-- WITHOUT ROWID: their primary key is the whole row, so the separate PK index
+-- (and idx_story_articles_article, which UNIQUE(article_id) now covers) goes.
+--
+-- Tables are rebuilt children first: with foreign keys on, DROP TABLE runs
+-- an implicit DELETE, and dropping articles while mentions still pointed at
+-- it would cascade. Triggers go with their tables and are recreated below.
+
+CREATE TABLE articles_v10 (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ulid TEXT NOT NULL UNIQUE,
+    url_original TEXT NOT NULL,
+    url_canonical TEXT UNIQUE NOT NULL,
+    title TEXT NOT NULL,
+    origin_source_id TEXT NOT NULL REFERENCES sources(id),
+    published_at INTEGER,
+    collected_at INTEGER NOT NULL,
+    points INTEGER NOT NULL DEFAULT 0 CHECK(points >= 0),
+    story_type TEXT NOT NULL DEFAULT 'news'
+        CHECK(story_type IN ('news','release','research','opinion','tutorial')),
+    score_base REAL NOT NULL,
+    scored_at INTEGER NOT NULL,
+    extra TEXT CHECK(extra IS NULL OR json_valid(extra)),
+    cluster_pending INTEGER NOT NULL DEFAULT 1
+);
+
+CREATE TABLE stories_v10 (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ulid TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    summary TEXT,
+    story_type TEXT NOT NULL DEFAULT 'news',
+    score REAL NOT NULL,
+    canonical_article_id INTEGER REFERENCES articles_v10(id) ON DELETE SET NULL,
+    first_seen INTEGER NOT NULL,
+    last_updated INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'active' CHECK(status IN ('active','inactive'))
+);
+
+CREATE TABLE mentions_v10 (
+    article_id INTEGER NOT NULL REFERENCES articles_v10(id) ON DELETE CASCADE,
+    source_id TEXT NOT NULL REFERENCES sources(id),
+    url TEXT NOT NULL,
+    points INTEGER NOT NULL DEFAULT 0,
+    discovered_at INTEGER NOT NULL,
+    extra TEXT,
+    PRIMARY KEY (article_id, source_id)
+) WITHOUT ROWID;
+
+CREATE TABLE article_topics_v10 (
+    article_id INTEGER NOT NULL REFERENCES articles_v10(id) ON DELETE CASCADE,
+    topic TEXT NOT NULL,
+    PRIMARY KEY (article_id, topic)
+) WITHOUT ROWID;
+
+CREATE TABLE story_articles_v10 (
+    story_id INTEGER NOT NULL REFERENCES stories_v10(id) ON DELETE CASCADE,
+    article_id INTEGER NOT NULL REFERENCES articles_v10(id) ON DELETE CASCADE,
+    PRIMARY KEY (story_id, article_id),
+    UNIQUE(article_id)
+) WITHOUT ROWID;
+
+CREATE TABLE story_topics_v10 (
+    story_id INTEGER NOT NULL REFERENCES stories_v10(id) ON DELETE CASCADE,
+    topic TEXT NOT NULL,
+    PRIMARY KEY (story_id, topic)
+) WITHOUT ROWID;
+
+CREATE TABLE story_lsh_v10 (
+    scheme TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    story_id INTEGER NOT NULL REFERENCES stories_v10(id) ON DELETE CASCADE,
+    PRIMARY KEY (scheme, bucket, story_id)
+) WITHOUT ROWID;
+
+INSERT INTO articles_v10
+    (id, ulid, url_original, url_canonical, title, origin_source_id, published_at,
+     collected_at, points, story_type, score_base, scored_at, extra, cluster_pending)
+SELECT rowid, id, url_original, url_canonical, title, origin_source_id, published_at,
+       collected_at, points, story_type, score_base, scored_at, extra, cluster_pending
+FROM articles;
+
+INSERT INTO stories_v10
+    (id, ulid, title, summary, story_type, score, canonical_article_id,
+     first_seen, last_updated, status)
+SELECT s.rowid, s.id, s.title, s.summary, s.story_type, s.score, a.rowid,
+       s.first_seen, s.last_updated, s.status
+FROM stories s
+LEFT JOIN articles a ON a.id = s.canonical_article_id;
+
+INSERT INTO mentions_v10
+SELECT a.rowid, m.source_id, m.url, m.points, m.discovered_at, m.extra
+FROM mentions m JOIN articles a ON a.id = m.article_id;
+
+INSERT INTO article_topics_v10
+SELECT a.rowid, t.topic
+FROM article_topics t JOIN articles a ON a.id = t.article_id;
+
+INSERT INTO story_articles_v10
+SELECT s.rowid, a.rowid
+FROM story_articles sa
+JOIN stories s ON s.id = sa.story_id
+JOIN articles a ON a.id = sa.article_id;
+
+INSERT INTO story_topics_v10
+SELECT s.rowid, t.topic
+FROM story_topics t JOIN stories s ON s.id = t.story_id;
+
+INSERT INTO story_lsh_v10
+SELECT l.scheme, l.bucket, s.rowid
+FROM story_lsh l JOIN stories s ON s.id = l.story_id;
+
+DROP TABLE story_lsh;
+DROP TABLE story_topics;
+DROP TABLE story_articles;
+DROP TABLE article_topics;
+DROP TABLE mentions;
+DROP TABLE stories;
+DROP TABLE articles;
+
+ALTER TABLE articles_v10 RENAME TO articles;
+ALTER TABLE stories_v10 RENAME TO stories;
+ALTER TABLE mentions_v10 RENAME TO mentions;
+ALTER TABLE article_topics_v10 RENAME TO article_topics;
+ALTER TABLE story_articles_v10 RENAME TO story_articles;
+ALTER TABLE story_topics_v10 RENAME TO story_topics;
+ALTER TABLE story_lsh_v10 RENAME TO story_lsh;
+
+CREATE INDEX idx_articles_collected_at ON articles(collected_at DESC);
+CREATE INDEX idx_articles_source ON articles(origin_source_id, collected_at DESC);
+CREATE INDEX idx_articles_cluster_pending ON articles(collected_at) WHERE cluster_pending = 1;
+CREATE INDEX idx_stories_score ON stories(score DESC);
+CREATE INDEX idx_stories_last_updated ON stories(last_updated DESC);
+CREATE INDEX idx_stories_canonical_article ON stories(canonical_article_id);
+CREATE INDEX idx_stories_active ON stories(last_updated) WHERE status = 'active';
+CREATE INDEX idx_article_topics_topic ON article_topics(topic, article_id);
+CREATE INDEX idx_story_topics_topic ON story_topics(topic, story_id);
+CREATE INDEX idx_story_lsh_story ON story_lsh(story_id);
+
+CREATE TRIGGER articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title) VALUES (new.id, new.title);
+END;
+CREATE TRIGGER articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title) VALUES ('delete', old.id, old.title);
+END;
+CREATE TRIGGER articles_fts_update AFTER UPDATE OF title ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title) VALUES ('delete', old.id, old.title);
+    INSERT INTO articles_fts(rowid, title) VALUES (new.id, new.title);
+END;
+
+CREATE TRIGGER stories_fts_insert AFTER INSERT ON stories BEGIN
+    INSERT INTO stories_fts(rowid, title, summary) VALUES (new.id, new.title, new.summary);
+END;
+CREATE TRIGGER stories_fts_delete AFTER DELETE ON stories BEGIN
+    INSERT INTO stories_fts(stories_fts, rowid, title, summary) VALUES ('delete', old.id, old.title, old.summary);
+END;
+CREATE TRIGGER stories_fts_update AFTER UPDATE OF title, summary ON stories BEGIN
+    INSERT INTO stories_fts(stories_fts, rowid, title, summary) VALUES ('delete', old.id, old.title, old.summary);
+    INSERT INTO stories_fts(rowid, title, summary) VALUES (new.id, new.title, new.summary);
+END;
+
+CREATE TRIGGER counters_articles_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('table', 'articles', 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO counters (scope, key, value) VALUES ('source', new.origin_source_id, 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+CREATE TRIGGER counters_articles_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('table', 'articles', -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO counters (scope, key, value) VALUES ('source', old.origin_source_id, -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+CREATE TRIGGER counters_articles_source AFTER UPDATE OF origin_source_id ON articles
+WHEN old.origin_source_id IS NOT new.origin_source_id BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('source', old.origin_source_id, -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO counters (scope, key, value) VALUES ('source', new.origin_source_id, 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER counters_mentions_insert AFTER INSERT ON mentions BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('table', 'mentions', 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+CREATE TRIGGER counters_mentions_delete AFTER DELETE ON mentions BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('table', 'mentions', -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER counters_stories_insert AFTER INSERT ON stories BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('table', 'stories', 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO counters (scope, key, value) VALUES ('story_status', new.status, 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+CREATE TRIGGER counters_stories_delete AFTER DELETE ON stories BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('table', 'stories', -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO counters (scope, key, value) VALUES ('story_status', old.status, -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+CREATE TRIGGER counters_stories_status AFTER UPDATE OF status ON stories
+WHEN old.status IS NOT new.status BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('story_status', old.status, -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO counters (scope, key, value) VALUES ('story_status', new.status, 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER counters_story_articles_insert AFTER INSERT ON story_articles BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('table', 'story_articles', 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+CREATE TRIGGER counters_story_articles_delete AFTER DELETE ON story_articles BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('table', 'story_articles', -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER counters_article_topics_insert AFTER INSERT ON article_topics BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('article_topic', new.topic, 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+CREATE TRIGGER counters_article_topics_delete AFTER DELETE ON article_topics BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('article_topic', old.topic, -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER counters_story_topics_insert AFTER INSERT ON story_topics BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('story_topic', new.topic, 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
+CREATE TRIGGER counters_story_topics_delete AFTER DELETE ON story_topics BEGIN
+    INSERT INTO counters (scope, key, value) VALUES ('story_topic', old.topic, -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value;
+END;
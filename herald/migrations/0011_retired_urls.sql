@@ -0,0 +1,8 @@
+-- Canonical URLs of articles retention deleted or moved into an archive
+-- database. Ingest skips items whose URL is listed here, so a feed that
+-- still carries an old post does not bring it back as a new story;
+-- `herald import` removes the entries for the URLs it restores.
+CREATE TABLE IF NOT EXISTS retired_urls (
+    url_canonical TEXT PRIMARY KEY,
+    retired_at INTEGER NOT NULL
+) WITHOUT ROWID;
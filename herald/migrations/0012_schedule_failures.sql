@@ -0,0 +1,4 @@
+-- Consecutive failed polls per source. A failed fetch is retried after
+-- min_interval_minutes, doubling per further failure up to the learned
+-- interval, instead of waiting out the whole interval; a success resets it.
+ALTER TABLE source_schedule ADD COLUMN failures INTEGER NOT NULL DEFAULT 0;
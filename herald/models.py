@@ -22,6 +22,38 @@ class RawItem:
     published_at: int | None = None
     points: int = 0
     extra: dict | None = None
+    collected_at: int | None = None  # set for backfilled history; None means now
+
+
+@dataclass
+class FetchState:
+    """Conditional-GET validators remembered for a source between runs."""
+    source_id: str
+    etag: str | None = None
+    last_modified: str | None = None
+    body_hash: str | None = None
+    fetched_at: int | None = None
+
+
+@dataclass
+class FetchLog:
+    """Fetch telemetry for one source in one pipeline run.
+
+    Timings and bytes are summed over every request and retry attempt the
+    adapter made; backoff sleeps are excluded. connect_ms covers DNS lookup
+    and TCP connect (httpcore reports them as one step) and is 0 when a
+    pooled connection was reused.
+    """
+    source_id: str
+    status: int | None = None  # last HTTP status seen; None when no response
+    retries: int = 0
+    bytes: int = 0
+    connect_ms: float = 0.0
+    tls_ms: float = 0.0
+    total_ms: float = 0.0
+    items_parsed: int = 0
+    items_new: int | None = None  # filled in after ingest
+    error: str | None = None
 
 
 @dataclass
@@ -1,20 +1,33 @@
 """Herald v2 pipeline orchestrator.
 
-Runs the full data pipeline: collect -> ingest -> cluster -> deactivate_stale -> project_brief.
-Records execution metadata to pipeline_runs table and saves the brief to disk.
+Runs the full data pipeline: collect -> ingest -> cluster -> deactivate_stale ->
+retention (when configured) -> project_brief.
+Records execution metadata to pipeline_runs, per-stage timings to
+pipeline_stage_metrics, saves the brief to disk and refreshes brief_cache.
 """
 from __future__ import annotations
 
+import copy
+import sys
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
-from herald.cluster import cluster, deactivate_stale
+from herald.cluster import ClusterCache, cluster, deactivate_stale
 from herald.collect import collect_all
 from herald.config import HeraldConfig
-from herald.db import Database
-from herald.ingest import ingest_items
-from herald.project import project_brief
+from herald.db import Database, resolve_profile
+from herald.fetch_state import load_fetch_state, save_fetch_log, save_fetch_state
+from herald.http import HttpSession
+from herald.ingest import ingest_items, sync_sources
+from herald.manifest import build_manifest, write_manifest
+from herald.metrics import StageRecorder
+from herald.models import FetchLog, FetchState
+from herald.polling import due_sources, schedule_next_poll
+from herald.project import cached_brief, invalidate_brief_cache
+from herald.query import status_summary
+from herald.retention import apply_retention
+from herald.topics import TopicMatcher
 
 
 @dataclass
@@ -28,12 +41,89 @@ class PipelineResult:
     run_id: int = 0
 
 
+@dataclass
+class WarmState:
+    """In-memory state a long-lived process keeps between run_pipeline calls.
+
+    Holds the cluster indexes and the compiled topic matcher; the matcher is
+    rebuilt only when the topic rules change.
+    """
+    clusters: ClusterCache = field(default_factory=ClusterCache)
+    _topic_rules: dict | None = None
+    _topic_matcher: TopicMatcher | None = None
+
+    def topic_matcher(self, rules: dict) -> TopicMatcher | None:
+        if not rules:
+            return None
+        if self._topic_matcher is None or rules != self._topic_rules:
+            self._topic_rules = copy.deepcopy(rules)
+            self._topic_matcher = TopicMatcher(rules)
+        return self._topic_matcher
+
+
+def _save_manifest(
+    db: Database,
+    data_dir: Path,
+    result: PipelineResult,
+    started_at: int,
+    error_text: str | None,
+    brief_path: Path | None,
+    recorder: StageRecorder,
+) -> None:
+    """Write status.json; a failure here must not mask the run's outcome."""
+    try:
+        manifest = build_manifest(
+            status_summary(db),
+            started_at=started_at,
+            error=error_text,
+            counts={
+                "articles_new": result.articles_new,
+                "articles_updated": result.articles_updated,
+                "stories_created": result.stories_created,
+                "stories_updated": result.stories_updated,
+            },
+            brief_path=brief_path,
+            stages=recorder.stages,
+        )
+        write_manifest(data_dir, manifest)
+    except Exception as exc:
+        print(f"[pipeline] WARN could not write status manifest: {exc}", file=sys.stderr)
+
+
+def _save_fetch_outcomes(
+    db: Database,
+    run_id: int,
+    fetch_state: dict[str, FetchState],
+    fetch_log: dict[str, FetchLog],
+    new_by_source: dict[str, int] | None,
+) -> None:
+    """Store this run's fetch telemetry and conditional-GET validators.
+
+    *new_by_source* is None when ingest failed. The log is written either
+    way; validators are then kept only for sources that parsed no items, so
+    a failed ingest does not turn the next fetch of a changed feed into a
+    304 and lose its items.
+    """
+    if new_by_source is None:
+        fetch_state = {
+            sid: st for sid, st in fetch_state.items()
+            if sid not in fetch_log or not fetch_log[sid].items_parsed
+        }
+    save_fetch_state(db, fetch_state)
+    for log in fetch_log.values():
+        log.items_new = (new_by_source or {}).get(log.source_id, 0)
+    save_fetch_log(db, run_id, fetch_log)
+
+
 def run_pipeline(
     config: HeraldConfig,
     db: Database,
     *,
     adapter_map: dict[str, str] | None = None,
     data_dir: Path | None = None,
+    http_session: HttpSession | None = None,
+    force_all: bool = False,
+    warm: WarmState | None = None,
 ) -> PipelineResult:
     """Run the full Herald pipeline and return aggregated counts.
 
@@ -48,7 +138,17 @@ def run_pipeline(
         Defaults to 'rss' for all sources when None.
     data_dir:
         Directory where briefs are saved. If None, brief is not saved to disk.
-        Brief file is written to {data_dir}/briefs/{run_id}.md.
+        Brief file is written to {data_dir}/briefs/{run_id}.md, and the
+        status.json manifest to {data_dir}/status.json.
+    http_session:
+        Optional pooled HTTP session shared by all adapters. When None, the
+        collect stage opens one for this run and closes it afterwards.
+    force_all:
+        Collect every source even when schedule.adaptive is on and some
+        sources are not yet due.
+    warm:
+        Optional WarmState reused across calls (herald daemon) so the cluster
+        indexes and topic matcher are not rebuilt every run.
     """
     started_at = int(time.time())
 
@@ -61,50 +161,89 @@ def run_pipeline(
 
     result = PipelineResult(run_id=run_id)
     error_text: str | None = None
+    brief_path: Path | None = None
+    recorder = StageRecorder(db)
 
     try:
         # Stage 0: sync sources to DB
-        for src in config.sources:
-            db.execute(
-                """INSERT INTO sources (id, name, url, weight, category)
-                   VALUES (?, ?, ?, ?, ?)
-                   ON CONFLICT(id) DO UPDATE SET
-                     name = excluded.name,
-                     url = excluded.url,
-                     weight = excluded.weight,
-                     category = excluded.category""",
-                (src.id, src.name, src.url, src.weight, src.category),
-            )
+        sync_sources(db, config.sources)
 
         # Stage 1: collect
         sources_dict = {s.id: s for s in config.sources}
-        raw_items = collect_all(
-            config.sources,
-            adapter_map=adapter_map,
-            tavily_api_key=config.tavily_api_key,
-        )
+        with recorder.stage("collect") as m:
+            if config.schedule.adaptive and not force_all:
+                polled = due_sources(db, config.sources, started_at)
+            else:
+                polled = list(config.sources)
+            fetch_state = load_fetch_state(db)
+            fetch_log = {s.id: FetchLog(source_id=s.id) for s in polled}
+            raw_items = collect_all(
+                polled,
+                adapter_map=adapter_map,
+                tavily_api_key=config.tavily_api_key,
+                cfg=config.collect,
+                fetch_state=fetch_state,
+                session=http_session,
+                fetch_log=fetch_log,
+            )
+            m.items_in, m.items_out = len(polled), len(raw_items)
 
-        # Stage 2: ingest
-        ingest_result = ingest_items(
-            db,
-            raw_items,
-            sources_dict,
-            topic_rules=config.topics or None,
-        )
-        result.articles_new = ingest_result.articles_new
-        result.articles_updated = ingest_result.articles_updated
+        # Stages 2-3 are write-heavy: run them under the bulk-load profile
+        with db.use_profile(resolve_profile(config.database.bulk_profile)):
+            # Stage 2: ingest
+            try:
+                with recorder.stage("ingest") as m:
+                    ingest_result = ingest_items(
+                        db,
+                        raw_items,
+                        sources_dict,
+                        topic_rules=warm.topic_matcher(config.topics) if warm else config.topics or None,
+                    )
+                    result.articles_new = ingest_result.articles_new
+                    result.articles_updated = ingest_result.articles_updated
+                    m.items_in = len(raw_items)
+                    m.items_out = result.articles_new + result.articles_updated
+            except Exception:
+                # The fetches happened all the same: keep what they told us
+                try:
+                    _save_fetch_outcomes(db, run_id, fetch_state, fetch_log, None)
+                except Exception as save_exc:
+                    print(f"[pipeline] WARN could not save fetch outcomes: {save_exc}", file=sys.stderr)
+                raise
+            _save_fetch_outcomes(db, run_id, fetch_state, fetch_log, ingest_result.new_by_source)
+            if config.schedule.adaptive:
+                failed = [sid for sid, log in fetch_log.items() if log.error is not None]
+                schedule_next_poll(db, [s.id for s in polled], config.schedule, started_at, failed)
 
-        # Stage 3: cluster
-        cluster_result = cluster(db, config.clustering)
-        result.stories_created = cluster_result.stories_created
-        result.stories_updated = cluster_result.stories_updated
-        result.articles_clustered = cluster_result.articles_clustered
+            # Stage 3: cluster
+            with recorder.stage("cluster") as m:
+                cluster_result = cluster(db, config.clustering, warm.clusters if warm else None)
+                result.stories_created = cluster_result.stories_created
+                result.stories_updated = cluster_result.stories_updated
+                result.articles_clustered = cluster_result.articles_clustered
+                m.items_in = result.articles_clustered
+                m.items_out = result.stories_created + result.stories_updated
 
         # Stage 4: deactivate stale stories
-        deactivate_stale(db, config.clustering)
+        with recorder.stage("deactivate") as m:
+            m.items_out = deactivate_stale(db, config.clustering, warm.clusters if warm else None)
 
-        # Stage 5: project brief
-        brief_md = project_brief(db)
+        # Stage 5: retention. Only inactive stories are deleted, and those
+        # are already out of the cluster indexes.
+        retention = config.retention
+        if retention.enabled and retention.archive and data_dir is None:
+            print("[pipeline] WARN retention.archive needs a data dir; skipping retention", file=sys.stderr)
+        elif retention.enabled:
+            with recorder.stage("retention") as m:
+                archive_dir = Path(data_dir) / "archive" if retention.archive else None
+                retained = apply_retention(db, retention, archive_dir=archive_dir)
+                m.items_out = retained.stories_archived + retained.stories_deleted
+
+        # Stage 6: project brief. Cached briefs from before this run are
+        # dropped and the default one is cached again for `herald brief`.
+        with recorder.stage("project"):
+            invalidate_brief_cache(db)
+            brief_md = cached_brief(db)
         result.brief = brief_md
 
         # Save brief to disk if data_dir is provided
@@ -116,6 +255,12 @@ def run_pipeline(
 
     except Exception as exc:
         error_text = str(exc)
+        # Stages that committed before the failure may have changed briefs;
+        # a failure here must not replace the original error
+        try:
+            invalidate_brief_cache(db)
+        except Exception as cache_exc:
+            print(f"[pipeline] WARN could not clear the brief cache: {cache_exc}", file=sys.stderr)
         raise
     finally:
         finished_at = int(time.time())
@@ -140,5 +285,12 @@ def run_pipeline(
                 run_id,
             ),
         )
+        recorder.save(run_id)
+        if data_dir is not None:
+            _save_manifest(db, Path(data_dir), result, started_at, error_text, brief_path, recorder)
+
+    every = config.database.maintenance_every_runs
+    if every > 0 and run_id % every == 0:
+        db.maintain()
 
     return result
@@ -0,0 +1,151 @@
+"""Adaptive per-source polling for Herald v2.
+
+Each source's publish interval is learned from the timestamps of the items it
+has delivered (published_at, falling back to when the mention was discovered).
+After a source is polled its next due time is stored in source_schedule, and
+the pipeline only collects sources that are due. A failed fetch is retried
+with a short exponential backoff instead of the learned interval.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+from herald.config import ScheduleConfig
+from herald.db import Database, chunked
+from herald.models import Source
+
+# How many recent items per source feed the interval estimate
+_HISTORY_ITEMS = 20
+
+# Sources due within this many seconds of the run start are polled now rather
+# than waiting a whole extra cycle because the scheduler fired slightly early.
+_DUE_GRACE_SECS = 300
+
+
+def _median(values: list[int]) -> float:
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    if len(ordered) % 2:
+        return float(ordered[mid])
+    return (ordered[mid - 1] + ordered[mid]) / 2
+
+
+def learn_intervals(
+    db: Database,
+    source_ids: list[str],
+    cfg: ScheduleConfig,
+    now: int,
+) -> dict[str, int]:
+    """Return the polling interval in seconds for each source id.
+
+    The interval is the median gap between a source's most recent item
+    timestamps, clamped to [min_interval_minutes, max_interval_hours].
+    Sources with fewer than two timestamps in the last _HISTORY_ITEMS
+    max-length intervals use interval_hours.
+    """
+    default = cfg.interval_hours * 3600
+    low = cfg.min_interval_minutes * 60
+    high = cfg.max_interval_hours * 3600
+
+    # Only the polled sources, and only history recent enough to matter: a
+    # source whose last _HISTORY_ITEMS items span more than that many
+    # max-length gaps is clamped to max_interval_hours anyway
+    since = now - high * _HISTORY_ITEMS
+    history: dict[str, list[int]] = {}
+    for ids in chunked(source_ids):
+        placeholders = ",".join("?" * len(ids))
+        rows = db.execute(
+            f"""
+            SELECT source_id, ts FROM (
+                SELECT m.source_id AS source_id,
+                       COALESCE(a.published_at, m.discovered_at) AS ts,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY m.source_id
+                           ORDER BY COALESCE(a.published_at, m.discovered_at) DESC
+                       ) AS rn
+                FROM mentions m
+                JOIN articles a ON a.id = m.article_id
+                WHERE m.source_id IN ({placeholders})
+                  AND COALESCE(a.published_at, m.discovered_at) BETWEEN ? AND ?
+            )
+            WHERE rn <= ?
+            """,
+            (*ids, since, now, _HISTORY_ITEMS),
+        ).fetchall()
+        for row in rows:
+            history.setdefault(row[0], []).append(row[1])
+
+    intervals: dict[str, int] = {}
+    for source_id in source_ids:
+        stamps = sorted(set(history.get(source_id, [])))
+        gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+        if not gaps:
+            intervals[source_id] = default
+            continue
+        intervals[source_id] = int(min(max(_median(gaps), low), high))
+    return intervals
+
+
+def due_sources(db: Database, sources: list[Source], now: int) -> list[Source]:
+    """Return the sources whose next poll is due. Never-polled sources are always due."""
+    rows = db.execute("SELECT source_id, next_due_at FROM source_schedule").fetchall()
+    next_due = {row[0]: row[1] for row in rows}
+    return [
+        s for s in sources
+        if next_due.get(s.id) is None or next_due[s.id] - _DUE_GRACE_SECS <= now
+    ]
+
+
+def next_due_at(db: Database, sources: list[Source]) -> int | None:
+    """Earliest next poll time across *sources*; None when one has never been polled."""
+    rows = db.execute("SELECT source_id, next_due_at FROM source_schedule").fetchall()
+    next_due = {row[0]: row[1] for row in rows}
+    due = [next_due.get(s.id) for s in sources]
+    if not due or any(d is None for d in due):
+        return None
+    return min(due) - _DUE_GRACE_SECS
+
+
+def schedule_next_poll(
+    db: Database,
+    source_ids: list[str],
+    cfg: ScheduleConfig,
+    now: int,
+    failed: Iterable[str] = (),
+) -> None:
+    """Store the learned interval and the next due time for each polled source.
+
+    Sources in *failed* are retried sooner: after min_interval_minutes,
+    doubling with each consecutive failure, never later than their learned
+    interval. A transient error thus does not hide a source for hours.
+    """
+    if not source_ids:
+        return
+    intervals = learn_intervals(db, source_ids, cfg, now)
+    failed = set(failed)
+    failures = {
+        row[0]: row[1]
+        for row in db.execute("SELECT source_id, failures FROM source_schedule").fetchall()
+    }
+    rows = []
+    for sid in source_ids:
+        interval = intervals[sid]
+        if sid in failed:
+            count = failures.get(sid, 0) + 1
+            delay = min(cfg.min_interval_minutes * 60 * 2 ** min(count - 1, 30), interval)
+        else:
+            count, delay = 0, interval
+        rows.append((sid, interval, now + delay, now, count))
+    with db.transaction():
+        db.executemany(
+            """
+            INSERT INTO source_schedule (source_id, interval_secs, next_due_at, polled_at, failures)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(source_id) DO UPDATE SET
+                interval_secs = excluded.interval_secs,
+                next_due_at = excluded.next_due_at,
+                polled_at = excluded.polled_at,
+                failures = excluded.failures
+            """,
+            rows,
+        )
@@ -5,10 +5,12 @@ grouped by story type, with YAML frontmatter metadata.
 """
 from __future__ import annotations
 
+import re
+import sqlite3
 import time
 from datetime import datetime, timezone
 
-from herald.db import Database
+from herald.db import Database, chunked
 from herald.scoring import effective_source_count
 
 
@@ -30,7 +32,7 @@ def _fetch_stories(
     since: int,
     max_stories: int,
     topic_filter: str | None,
-) -> list[dict]:
+) -> list[tuple[int, dict]]:
     """Fetch active stories updated since a given Unix timestamp.
 
     Parameters
@@ -46,13 +48,14 @@ def _fetch_stories(
 
     Returns
     -------
-    list[dict]
-        Each dict has keys: id, title, score, story_type.
+    list[tuple[int, dict]]
+        (stories.id, story) pairs; each story dict has keys id (the ULID),
+        title, score, story_type, last_updated.
     """
     if topic_filter is not None:
         rows = db.execute(
             """
-            SELECT s.id, s.title, s.score, s.story_type
+            SELECT s.id, s.ulid, s.title, s.score, s.story_type, s.last_updated
             FROM stories s
             JOIN story_topics st ON st.story_id = s.id
             WHERE s.last_updated >= ?
@@ -66,7 +69,7 @@ def _fetch_stories(
     else:
         rows = db.execute(
             """
-            SELECT s.id, s.title, s.score, s.story_type
+            SELECT s.id, s.ulid, s.title, s.score, s.story_type, s.last_updated
             FROM stories s
             WHERE s.last_updated >= ?
               AND s.status = 'active'
@@ -77,71 +80,126 @@ def _fetch_stories(
         ).fetchall()
 
     return [
-        {
-            "id": row[0],
-            "title": row[1],
-            "score": row[2],
-            "story_type": row[3],
-        }
+        (
+            row[0],
+            {
+                "id": row[1],
+                "title": row[2],
+                "score": row[3],
+                "story_type": row[4],
+                "last_updated": row[5],
+            },
+        )
         for row in rows
     ]
 
 
-def _fetch_story_articles(db: Database, story_id: str) -> list[dict]:
-    """Return articles linked to a story.
+def _fetch_articles_by_story(db: Database, story_ids: list[int]) -> dict[int, list[dict]]:
+    """Return articles linked to each of *story_ids*, with source names.
 
     Parameters
     ----------
     db:
         Open database connection.
-    story_id:
-        Story identifier.
+    story_ids:
+        Story identifiers; resolved with one query per IN (...) chunk.
 
     Returns
     -------
-    list[dict]
-        Each dict has keys: url, title, source_name.
+    dict[int, list[dict]]
+        Story id -> article dicts with keys url, title, source_name,
+        source_id, ordered by score_base descending.
     """
-    rows = db.execute(
-        """
-        SELECT a.url_canonical, a.title, s.name, s.id
-        FROM story_articles sa
-        JOIN articles a ON a.id = sa.article_id
-        JOIN sources s ON s.id = a.origin_source_id
-        WHERE sa.story_id = ?
-        ORDER BY a.score_base DESC
-        """,
-        (story_id,),
-    ).fetchall()
-    return [
-        {"url": row[0], "title": row[1], "source_name": row[2], "source_id": row[3]}
-        for row in rows
-    ]
+    by_story: dict[int, list[dict]] = {}
+    for chunk in chunked(story_ids):
+        placeholders = ",".join("?" * len(chunk))
+        rows = db.execute(
+            f"""
+            SELECT sa.story_id, a.url_canonical, a.title, s.name, s.id
+            FROM story_articles sa
+            JOIN articles a ON a.id = sa.article_id
+            JOIN sources s ON s.id = a.origin_source_id
+            WHERE sa.story_id IN ({placeholders})
+            ORDER BY a.score_base DESC
+            """,
+            tuple(chunk),
+        ).fetchall()
+        for row in rows:
+            by_story.setdefault(row[0], []).append(
+                {"url": row[1], "title": row[2], "source_name": row[3], "source_id": row[4]}
+            )
+    return by_story
 
 
-def _fetch_story_topics(db: Database, story_id: str) -> list[str]:
-    """Return topic tags for a story.
+def _fetch_topics_by_story(db: Database, story_ids: list[int]) -> dict[int, list[str]]:
+    """Return topic tags for each of *story_ids*.
 
     Parameters
     ----------
     db:
         Open database connection.
-    story_id:
-        Story identifier.
+    story_ids:
+        Story identifiers; resolved with one query per IN (...) chunk.
+
+    Returns
+    -------
+    dict[int, list[str]]
+        Story id -> topic strings, ordered alphabetically.
+    """
+    by_story: dict[int, list[str]] = {}
+    for chunk in chunked(story_ids):
+        placeholders = ",".join("?" * len(chunk))
+        rows = db.execute(
+            f"""
+            SELECT story_id, topic FROM story_topics
+            WHERE story_id IN ({placeholders})
+            ORDER BY topic
+            """,
+            tuple(chunk),
+        ).fetchall()
+        for row in rows:
+            by_story.setdefault(row[0], []).append(row[1])
+    return by_story
+
+
+def fetch_brief_stories(
+    db: Database,
+    since: int,
+    max_stories: int,
+    topic_filter: str | None = None,
+) -> list[tuple[dict, list[dict], list[str]]]:
+    """Select the stories of a brief with their articles and topics.
+
+    Parameters
+    ----------
+    db:
+        Open database connection.
+    since:
+        Unix timestamp; only stories with last_updated >= since are returned.
+    max_stories:
+        Maximum number of stories to return, ordered by score descending.
+    topic_filter:
+        If provided, restrict to stories that have this topic in story_topics.
 
     Returns
     -------
-    list[str]
-        Topic strings, ordered alphabetically.
+    list[tuple[dict, list[dict], list[str]]]
+        (story, articles, topics) per story, ordered by score descending.
+        Related rows for all stories are fetched in two set-based queries.
     """
-    rows = db.execute(
-        "SELECT topic FROM story_topics WHERE story_id = ? ORDER BY topic",
-        (story_id,),
-    ).fetchall()
-    return [row[0] for row in rows]
+    stories = _fetch_stories(db, since, max_stories, topic_filter)
+    if not stories:
+        return []
+    story_ids = [story_id for story_id, _ in stories]
+    articles_by_story = _fetch_articles_by_story(db, story_ids)
+    topics_by_story = _fetch_topics_by_story(db, story_ids)
+    return [
+        (story, articles_by_story.get(story_id, []), topics_by_story.get(story_id, []))
+        for story_id, story in stories
+    ]
 
 
-def _escape_url(url: str) -> str:
+def escape_url(url: str) -> str:
     """Percent-encode characters in *url* that could break markdown link syntax or
     inject content into LLM context.
 
@@ -163,7 +221,7 @@ def _escape_url(url: str) -> str:
     return "".join(_ENCODE.get(c, c) for c in url)
 
 
-def _escape_md(text: str) -> str:
+def escape_md(text: str) -> str:
     """Escape markdown-significant characters in *text*.
 
     Escapes square brackets, parentheses, and HTML tag delimiters so that
@@ -182,7 +240,7 @@ def _escape_md(text: str) -> str:
     )
 
 
-def _render_story(story: dict, articles: list[dict], topics: list[str]) -> str:
+def render_story(story: dict, articles: list[dict], topics: list[str]) -> str:
     """Render a single story as a markdown block.
 
     Parameters
@@ -207,7 +265,7 @@ def _render_story(story: dict, articles: list[dict], topics: list[str]) -> str:
         [(a["source_id"], a["url"]) for a in articles]
     ) if articles else 0
     source_label = "source" if source_count == 1 else "sources"
-    lines.append(f"### {_escape_md(story['title'])}")
+    lines.append(f"### {escape_md(story['title'])}")
     lines.append(f"")
     lines.append(f"⭐ {score:.2f} &nbsp;·&nbsp; {source_count} {source_label}")
 
@@ -221,13 +279,13 @@ def _render_story(story: dict, articles: list[dict], topics: list[str]) -> str:
     if articles:
         lines.append(f"")
         for article in articles:
-            lines.append(f"- [{_escape_md(article['title'])}]({_escape_url(article['url'])})")
+            lines.append(f"- [{escape_md(article['title'])}]({escape_url(article['url'])})")
 
     return "\n".join(lines)
 
 
-def _render_section(story_type: str, stories_with_data: list[tuple]) -> str:
-    """Render a section heading and its stories.
+def _render_section(story_type: str, stories_with_data: list[tuple], out: list[str]) -> None:
+    """Append a section heading and its stories to *out*.
 
     Parameters
     ----------
@@ -235,18 +293,15 @@ def _render_section(story_type: str, stories_with_data: list[tuple]) -> str:
         One of: release, research, tutorial, opinion, news.
     stories_with_data:
         List of (story, articles, topics) tuples.
-
-    Returns
-    -------
-    str
-        Markdown section string.
+    out:
+        Output lines of the brief being rendered.
     """
     heading = _SECTION_HEADINGS.get(story_type, story_type.title())
-    lines: list[str] = [f"## {heading}", ""]
+    out.append(f"## {heading}")
+    out.append("")
     for story, articles, topics in stories_with_data:
-        lines.append(_render_story(story, articles, topics))
-        lines.append("")
-    return "\n".join(lines)
+        out.append(render_story(story, articles, topics))
+        out.append("")
 
 
 def project_brief(
@@ -279,14 +334,18 @@ def project_brief(
         Markdown string with YAML frontmatter block.
     """
     now = int(time.time())
-    since = now - hours * 3600
+    stories = fetch_brief_stories(db, now - hours * 3600, max_stories, topic_filter)
+    return _render_brief(stories, now, hours)
+
+
+def _timestamp(ts: int) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-    stories = _fetch_stories(db, since, max_stories, topic_filter)
 
+def _render_brief(stories: list[tuple], now: int, hours: int) -> str:
+    """Render the frontmatter and sections for stories from fetch_brief_stories."""
     # Build frontmatter
-    generated_at = datetime.fromtimestamp(now, tz=timezone.utc).strftime(
-        "%Y-%m-%dT%H:%M:%SZ"
-    )
+    generated_at = _timestamp(now)
     frontmatter_lines = [
         "---",
         f"generated_at: {generated_at}",
@@ -300,25 +359,81 @@ def project_brief(
         return frontmatter + "\n"
 
     # Group stories by type, preserving score order within each type
-    grouped: dict[str, list[dict]] = {}
-    for story in stories:
-        st = story["story_type"]
-        grouped.setdefault(st, []).append(story)
+    grouped: dict[str, list[tuple]] = {}
+    for story, articles, topics in stories:
+        grouped.setdefault(story["story_type"], []).append((story, articles, topics))
 
     # Render sections in canonical order, then any unknown types
     known = [t for t in _STORY_TYPE_ORDER if t in grouped]
     unknown = [t for t in grouped if t not in _STORY_TYPE_ORDER]
     ordered_types = known + sorted(unknown)
 
-    sections: list[str] = []
+    out: list[str] = [frontmatter]
     for story_type in ordered_types:
-        type_stories = grouped[story_type]
-        stories_with_data: list[tuple] = []
-        for story in type_stories:
-            articles = _fetch_story_articles(db, story["id"])
-            topics = _fetch_story_topics(db, story["id"])
-            stories_with_data.append((story, articles, topics))
-        sections.append(_render_section(story_type, stories_with_data))
-
-    body = "\n".join(sections)
-    return frontmatter + "\n" + body
+        _render_section(story_type, grouped[story_type], out)
+    return "\n".join(out)
+
+
+# expires_at for a cached brief with no stories: nothing ages out of it
+_NEVER = 2**62
+# The cache write is optional: never wait long behind a running pipeline
+_CACHE_WRITE_TIMEOUT_MS = 50
+
+
+def cached_brief(
+    db: Database,
+    hours: int = 24,
+    max_stories: int = 25,
+    topic_filter: str | None = None,
+) -> str:
+    """Return project_brief(...) from brief_cache when nothing has changed.
+
+    A cached brief is reused while it was rendered under the latest
+    pipeline_runs.id and none of its stories has aged out of the window
+    since. Only those two things can change a brief between runs: stories
+    outside it cannot enter without a write, and run_pipeline (or an
+    import) clears the cache when it writes. A hit is re-stamped with the
+    current ``generated_at``. On a miss the brief is rendered and stored,
+    except on a read-only connection or while another connection holds the
+    write lock.
+    """
+    now = int(time.time())
+    topic = topic_filter or ""
+    run_id = db.execute("SELECT COALESCE(MAX(id), 0) FROM pipeline_runs").fetchone()[0]
+    row = db.execute(
+        """
+        SELECT body FROM brief_cache
+        WHERE hours = ? AND max_stories = ? AND topic = ?
+          AND run_id = ? AND expires_at > ?
+        """,
+        (hours, max_stories, topic, run_id, now),
+    ).fetchone()
+    if row is not None:
+        # Same stories, but stamped with the time it is served
+        return re.sub(r"^generated_at: .*$", f"generated_at: {_timestamp(now)}", row[0], count=1, flags=re.M)
+
+    stories = fetch_brief_stories(db, now - hours * 3600, max_stories, topic_filter)
+    brief = _render_brief(stories, now, hours)
+    if not db.read_only:
+        # Valid until the oldest story falls out of the look-back window
+        oldest = min((story["last_updated"] for story, _, _ in stories), default=None)
+        expires_at = _NEVER if oldest is None else oldest + hours * 3600 + 1
+        try:
+            with db.busy_timeout(_CACHE_WRITE_TIMEOUT_MS):
+                db.execute(
+                    """
+                    INSERT OR REPLACE INTO brief_cache
+                        (hours, max_stories, topic, run_id, expires_at, body)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (hours, max_stories, topic, run_id, expires_at, brief),
+                )
+        except sqlite3.OperationalError:
+            # Locked by a pipeline run: serve the brief uncached
+            pass
+    return brief
+
+
+def invalidate_brief_cache(db: Database) -> None:
+    """Drop every cached brief; call after writing stories or articles."""
+    db.execute("DELETE FROM brief_cache")
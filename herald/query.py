@@ -0,0 +1,252 @@
+"""Read-side queries for status, story lists, story detail and search.
+
+Shared by ``herald status`` and the local query server (herald/server.py).
+Each query returns plain dicts ready for JSON; the ``render_*`` helpers
+produce the markdown variants with the same escaping as the brief.
+
+Story lookups and ranged searches also read the monthly archive databases
+(herald/archive.py), attaching only the months they need.
+"""
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+
+from herald.archive import archived_months, attached
+from herald.counters import counter
+from herald.db import Database
+from herald.project import escape_md, escape_url, render_story
+
+
+def _iso(ts: int | None) -> str | None:
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def status_summary(db: Database) -> dict:
+    """Article count, active story count and the last finished run."""
+    article_count = counter(db, "table", "articles")
+    story_count = counter(db, "story_status", "active")
+    last_run_row = db.execute(
+        "SELECT id, finished_at FROM pipeline_runs ORDER BY id DESC LIMIT 1"
+    ).fetchone()
+    finished_at = last_run_row[1] if last_run_row is not None else None
+    return {
+        "articles": article_count,
+        "stories": story_count,
+        "last_run_id": last_run_row[0] if last_run_row is not None else None,
+        "last_run_at": finished_at,
+        "last_run": _iso(finished_at) or "never",
+    }
+
+
+def render_status(status: dict) -> str:
+    """The plain-text status block printed by ``herald status``."""
+    return (
+        f"Articles: {status['articles']}\n"
+        f"Stories:  {status['stories']}\n"
+        f"Last run: {status['last_run']}\n"
+    )
+
+
+def list_stories(
+    db: Database,
+    hours: int = 24,
+    limit: int = 50,
+    topic_filter: str | None = None,
+) -> list[dict]:
+    """Active stories updated in the last *hours*, highest score first."""
+    since = int(time.time()) - hours * 3600
+    topic_join = "JOIN story_topics st ON st.story_id = s.id AND st.topic = ?" if topic_filter else ""
+    params: tuple = (topic_filter,) if topic_filter else ()
+    rows = db.execute(
+        f"""
+        SELECT s.ulid, s.title, s.score, s.story_type, s.first_seen, s.last_updated,
+               (SELECT COUNT(*) FROM story_articles sa WHERE sa.story_id = s.id)
+        FROM stories s
+        {topic_join}
+        WHERE s.last_updated >= ?
+          AND s.status = 'active'
+        ORDER BY s.score DESC
+        LIMIT ?
+        """,
+        params + (since, limit),
+    ).fetchall()
+    return [
+        {
+            "id": row[0],
+            "title": row[1],
+            "score": row[2],
+            "story_type": row[3],
+            "first_seen": row[4],
+            "last_updated": row[5],
+            "article_count": row[6],
+        }
+        for row in rows
+    ]
+
+
+def render_story_list(stories: list[dict]) -> str:
+    if not stories:
+        return "No stories.\n"
+    return "".join(
+        f"- {escape_md(s['title'])} (`{s['id']}`, ⭐ {s['score']:.2f}, {s['article_count']} articles)\n"
+        for s in stories
+    )
+
+
+def story_detail(db: Database, story_id: str) -> dict | None:
+    """One story, by ULID, with all its articles and topics, or None if unknown.
+
+    Stories moved to an archive are read from that one month's file.
+    """
+    story = _story_detail(db, story_id, "main")
+    if story is not None:
+        return story
+    row = db.execute("SELECT month FROM archived_stories WHERE id = ?", (story_id,)).fetchone()
+    if row is None:
+        return None
+    with attached(db, row[0]) as schema:
+        return _story_detail(db, story_id, schema) if schema else None
+
+
+def _story_detail(db: Database, story_id: str, schema: str) -> dict | None:
+    row = db.execute(
+        f"""
+        SELECT id, ulid, title, summary, story_type, score, status, first_seen, last_updated
+        FROM {schema}.stories WHERE ulid = ?
+        """,
+        (story_id,),
+    ).fetchone()
+    if row is None:
+        return None
+    articles = db.execute(
+        f"""
+        SELECT a.ulid, a.url_canonical, a.title, s.id, s.name, a.points, a.collected_at
+        FROM {schema}.story_articles sa
+        JOIN {schema}.articles a ON a.id = sa.article_id
+        JOIN {schema}.sources s ON s.id = a.origin_source_id
+        WHERE sa.story_id = ?
+        ORDER BY a.score_base DESC
+        """,
+        (row[0],),
+    ).fetchall()
+    topics = db.execute(
+        f"SELECT topic FROM {schema}.story_topics WHERE story_id = ? ORDER BY topic", (row[0],)
+    ).fetchall()
+    return {
+        "id": row[1],
+        "title": row[2],
+        "summary": row[3],
+        "story_type": row[4],
+        "score": row[5],
+        "status": row[6],
+        "first_seen": row[7],
+        "last_updated": row[8],
+        "topics": [t[0] for t in topics],
+        "articles": [
+            {
+                "id": a[0],
+                "url": a[1],
+                "title": a[2],
+                "source_id": a[3],
+                "source_name": a[4],
+                "points": a[5],
+                "collected_at": a[6],
+            }
+            for a in articles
+        ],
+    }
+
+
+def render_story_detail(story: dict) -> str:
+    return render_story(story, story["articles"], story["topics"]) + "\n"
+
+
+def _fts_query(text: str) -> str:
+    """Quote each term so user input is never parsed as FTS5 syntax."""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in text.split())
+
+
+def search(
+    db: Database,
+    text: str,
+    limit: int = 20,
+    since: int | None = None,
+    until: int | None = None,
+) -> dict:
+    """Full-text search over story and article titles, best match first.
+
+    Without *since* only herald.db is searched. With it, results are limited
+    to stories last updated (articles collected) in [since, until] and the
+    archives of those months are searched too, one at a time. BM25 ranks
+    from different files are merged as they are: close enough to order
+    results, not exactly comparable.
+    """
+    match = _fts_query(text)
+    if not match:
+        return {"query": text, "stories": [], "articles": []}
+    lo = since if since is not None else 0
+    hi = until if until is not None else 2**62
+    stories, articles = _search_schema(db, "main", match, limit, lo, hi)
+    if since is not None:
+        for month in archived_months(db, since, until):
+            with attached(db, month) as schema:
+                if schema is None:
+                    continue
+                more_stories, more_articles = _search_schema(db, schema, match, limit, lo, hi)
+            stories += more_stories
+            articles += more_articles
+    stories = sorted(stories, key=lambda r: r[0])[:limit]
+    articles = sorted(articles, key=lambda r: r[0])[:limit]
+    return {
+        "query": text,
+        "stories": [
+            {"id": r[1], "title": r[2], "score": r[3], "status": r[4], "last_updated": r[5]}
+            for r in stories
+        ],
+        "articles": [
+            {"id": r[1], "title": r[2], "url": r[3], "source_id": r[4], "collected_at": r[5]}
+            for r in articles
+        ],
+    }
+
+
+def _search_schema(
+    db: Database, schema: str, match: str, limit: int, lo: int, hi: int
+) -> tuple[list[tuple], list[tuple]]:
+    """(rank, ...) rows of stories and articles matching in one database."""
+    stories = db.execute(
+        f"""
+        SELECT f.rank, s.ulid, s.title, s.score, s.status, s.last_updated
+        FROM {schema}.stories_fts f
+        JOIN {schema}.stories s ON s.id = f.rowid
+        WHERE f.stories_fts MATCH ? AND s.last_updated BETWEEN ? AND ?
+        ORDER BY f.rank
+        LIMIT ?
+        """,
+        (match, lo, hi, limit),
+    ).fetchall()
+    articles = db.execute(
+        f"""
+        SELECT f.rank, a.ulid, a.title, a.url_canonical, a.origin_source_id, a.collected_at
+        FROM {schema}.articles_fts f
+        JOIN {schema}.articles a ON a.id = f.rowid
+        WHERE f.articles_fts MATCH ? AND a.collected_at BETWEEN ? AND ?
+        ORDER BY f.rank
+        LIMIT ?
+        """,
+        (match, lo, hi, limit),
+    ).fetchall()
+    return [tuple(r) for r in stories], [tuple(r) for r in articles]
+
+
+def render_search(results: dict) -> str:
+    lines = ["## Stories", ""]
+    lines += [f"- {escape_md(s['title'])} (`{s['id']}`)" for s in results["stories"]] or ["None."]
+    lines += ["", "## Articles", ""]
+    lines += [
+        f"- [{escape_md(a['title'])}]({escape_url(a['url'])})" for a in results["articles"]
+    ] or ["None."]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,421 @@
+"""Retention: move or delete old inactive stories, and delete old run history.
+
+Inactive stories idle longer than ``move_to_archive_days`` move, with their
+articles, mentions and topics, into the monthly archive databases of
+herald/archive.py; those idle longer than ``inactive_story_days`` are
+deleted. Both work in chunks: each batch of stories is handled in its own
+short IMMEDIATE transaction, so a concurrent writer (or `herald serve`
+readers waiting on a checkpoint) never waits behind one long delete.
+Foreign-key cascades take the mentions, topics, story links, LSH buckets
+and FTS rows with them, and the counter triggers keep ``counters`` exact.
+The canonical URL of every article deleted or moved stays behind in
+``retired_urls``, which ingest checks so a feed that still lists an old post
+does not bring it back as a new story.
+
+Articles no story links to (cluster() skipped their titles) are moved or
+deleted by the same cutoffs, measured from when they were collected.
+
+With ``retention.archive`` on, every deleted article is first appended to
+{data_dir}/archive/YYYY-MM.jsonl (month of the story's last update, or of
+collection for storyless articles) as a v2 RawItem record, so
+``herald import`` can bring it back.
+"""
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from herald.archive import attached, month_bounds, month_of
+from herald.db import Database, chunked
+
+if TYPE_CHECKING:
+    from herald.config import RetentionConfig
+
+
+@dataclass
+class RetentionResult:
+    stories_archived: int = 0
+    articles_archived: int = 0
+    stories_deleted: int = 0
+    articles_deleted: int = 0
+    runs_deleted: int = 0
+    batches: int = 0
+    archive_files: list[Path] = field(default_factory=list)
+
+
+def _archive_records(db: Database, story_ids: list[int]) -> dict[str, list[dict]]:
+    """RawItem-shaped records for the articles of *story_ids*, grouped by month."""
+    by_month: dict[str, list[dict]] = {}
+    for ids in chunked(story_ids):
+        placeholders = ",".join("?" * len(ids))
+        rows = db.execute(
+            f"""
+            SELECT a.ulid, a.url_original, a.title, a.origin_source_id, a.published_at,
+                   a.points, a.collected_at, a.extra,
+                   s.ulid, s.title, s.first_seen, s.last_updated,
+                   (SELECT json_group_array(topic) FROM article_topics t WHERE t.article_id = a.id)
+            FROM stories s
+            JOIN story_articles sa ON sa.story_id = s.id
+            JOIN articles a ON a.id = sa.article_id
+            WHERE s.id IN ({placeholders})
+            ORDER BY s.last_updated, a.collected_at
+            """,
+            tuple(ids),
+        ).fetchall()
+        for row in rows:
+            by_month.setdefault(month_of(row[11]), []).append({
+                "id": row[0],
+                "url": row[1],
+                "title": row[2],
+                "source_id": row[3],
+                "published_at": row[4],
+                "points": row[5],
+                "collected_at": row[6],
+                "extra": json.loads(row[7]) if row[7] else None,
+                "topics": json.loads(row[12]),
+                "story": {
+                    "id": row[8],
+                    "title": row[9],
+                    "first_seen": row[10],
+                    "last_updated": row[11],
+                },
+            })
+    return by_month
+
+
+def _unlinked_records(db: Database, article_ids: list[int]) -> dict[str, list[dict]]:
+    """RawItem-shaped records for storyless articles, grouped by month collected."""
+    by_month: dict[str, list[dict]] = {}
+    for ids in chunked(article_ids):
+        placeholders = ",".join("?" * len(ids))
+        rows = db.execute(
+            f"""
+            SELECT a.ulid, a.url_original, a.title, a.origin_source_id, a.published_at,
+                   a.points, a.collected_at, a.extra,
+                   (SELECT json_group_array(topic) FROM article_topics t WHERE t.article_id = a.id)
+            FROM articles a
+            WHERE a.id IN ({placeholders})
+            ORDER BY a.collected_at
+            """,
+            tuple(ids),
+        ).fetchall()
+        for row in rows:
+            by_month.setdefault(month_of(row[6]), []).append({
+                "id": row[0],
+                "url": row[1],
+                "title": row[2],
+                "source_id": row[3],
+                "published_at": row[4],
+                "points": row[5],
+                "collected_at": row[6],
+                "extra": json.loads(row[7]) if row[7] else None,
+                "topics": json.loads(row[8]),
+            })
+    return by_month
+
+
+def _write_archive(archive_dir: Path, by_month: dict[str, list[dict]]) -> list[Path]:
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for month, records in sorted(by_month.items()):
+        path = archive_dir / f"{month}.jsonl"
+        with path.open("a", encoding="utf-8") as f:
+            f.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        paths.append(path)
+    return paths
+
+
+def _article_ids(db: Database, story_ids: list[int]) -> list[int]:
+    article_ids: list[int] = []
+    for ids in chunked(story_ids):
+        placeholders = ",".join("?" * len(ids))
+        article_ids += [
+            row[0]
+            for row in db.execute(
+                f"SELECT article_id FROM story_articles WHERE story_id IN ({placeholders})",
+                tuple(ids),
+            )
+        ]
+    return article_ids
+
+
+def _unlinked_article_ids(db: Database, start: int, end: int, limit: int) -> list[int]:
+    """Articles collected in [start, end) that no story links to.
+
+    cluster() clears cluster_pending without linking articles it skips
+    (titles too short to match), so nothing else ever removes them.
+    """
+    return [
+        row[0]
+        for row in db.execute(
+            """
+            SELECT a.id FROM articles a
+            WHERE a.collected_at >= ? AND a.collected_at < ? AND a.cluster_pending = 0
+              AND NOT EXISTS (SELECT 1 FROM story_articles sa WHERE sa.article_id = a.id)
+            ORDER BY a.collected_at
+            LIMIT ?
+            """,
+            (start, end, limit),
+        )
+    ]
+
+
+def _delete_stories(db: Database, story_ids: list[int], article_ids: list[int], now: int) -> None:
+    """Delete *story_ids* and *article_ids*, retiring the articles' URLs first.
+
+    A retired URL is skipped by ingest, so a feed still listing the post
+    does not bring it back as a new story.
+    """
+    for ids in chunked(story_ids):
+        placeholders = ",".join("?" * len(ids))
+        db.execute(f"DELETE FROM stories WHERE id IN ({placeholders})", tuple(ids))
+    for ids in chunked(article_ids):
+        placeholders = ",".join("?" * len(ids))
+        db.execute(
+            f"""
+            INSERT OR IGNORE INTO retired_urls (url_canonical, retired_at)
+            SELECT url_canonical, ? FROM articles WHERE id IN ({placeholders})
+            """,
+            (now, *ids),
+        )
+        db.execute(f"DELETE FROM articles WHERE id IN ({placeholders})", tuple(ids))
+
+
+def _copy_stories(db: Database, schema: str, story_ids: list[int], article_ids: list[int]) -> None:
+    """Copy *story_ids* and the rows hanging off them into attached *schema*.
+
+    Archives share herald.db's schema version, so the columns line up, but
+    each file hands out its own integer ids: rows are copied without them
+    and links are remapped through the ULIDs. INSERT OR IGNORE makes a
+    repeated copy (after a crash between copy and delete) a no-op. An
+    article whose URL the archive already holds is not copied again, and
+    links to it are dropped.
+    """
+    article_cols = (
+        "ulid, url_original, url_canonical, title, origin_source_id, published_at, collected_at, "
+        "points, story_type, score_base, scored_at, extra, cluster_pending"
+    )
+    db.execute(f"INSERT OR IGNORE INTO {schema}.sources SELECT * FROM main.sources")
+    for ids in chunked(article_ids):
+        placeholders = ",".join("?" * len(ids))
+        db.execute(
+            f"""
+            INSERT OR IGNORE INTO {schema}.articles ({article_cols})
+            SELECT {article_cols} FROM main.articles WHERE id IN ({placeholders})
+            """,
+            tuple(ids),
+        )
+        db.execute(
+            f"""
+            INSERT OR IGNORE INTO {schema}.mentions
+                (article_id, source_id, url, points, discovered_at, extra)
+            SELECT x.id, m.source_id, m.url, m.points, m.discovered_at, m.extra
+            FROM main.mentions m
+            JOIN main.articles a ON a.id = m.article_id
+            JOIN {schema}.articles x ON x.ulid = a.ulid
+            WHERE m.article_id IN ({placeholders})
+            """,
+            tuple(ids),
+        )
+        db.execute(
+            f"""
+            INSERT OR IGNORE INTO {schema}.article_topics (article_id, topic)
+            SELECT x.id, t.topic
+            FROM main.article_topics t
+            JOIN main.articles a ON a.id = t.article_id
+            JOIN {schema}.articles x ON x.ulid = a.ulid
+            WHERE t.article_id IN ({placeholders})
+            """,
+            tuple(ids),
+        )
+    for ids in chunked(story_ids):
+        placeholders = ",".join("?" * len(ids))
+        db.execute(
+            f"""
+            INSERT OR IGNORE INTO {schema}.stories
+                (ulid, title, summary, story_type, score, canonical_article_id,
+                 first_seen, last_updated, status)
+            SELECT s.ulid, s.title, s.summary, s.story_type, s.score, x.id,
+                   s.first_seen, s.last_updated, s.status
+            FROM main.stories s
+            LEFT JOIN main.articles a ON a.id = s.canonical_article_id
+            LEFT JOIN {schema}.articles x ON x.ulid = a.ulid
+            WHERE s.id IN ({placeholders})
+            """,
+            tuple(ids),
+        )
+        db.execute(
+            f"""
+            INSERT OR IGNORE INTO {schema}.story_articles (story_id, article_id)
+            SELECT xs.id, xa.id
+            FROM main.story_articles sa
+            JOIN main.stories s ON s.id = sa.story_id
+            JOIN main.articles a ON a.id = sa.article_id
+            JOIN {schema}.stories xs ON xs.ulid = s.ulid
+            JOIN {schema}.articles xa ON xa.ulid = a.ulid
+            WHERE sa.story_id IN ({placeholders})
+            """,
+            tuple(ids),
+        )
+        db.execute(
+            f"""
+            INSERT OR IGNORE INTO {schema}.story_topics (story_id, topic)
+            SELECT xs.id, t.topic
+            FROM main.story_topics t
+            JOIN main.stories s ON s.id = t.story_id
+            JOIN {schema}.stories xs ON xs.ulid = s.ulid
+            WHERE t.story_id IN ({placeholders})
+            """,
+            tuple(ids),
+        )
+
+
+def _move_to_archive(db: Database, cutoff: int, batch_size: int, result: RetentionResult, now: int) -> None:
+    """Move inactive stories last updated before *cutoff* into their month's archive.
+
+    Articles no story links to move too, into the month they were collected.
+    """
+    months = [
+        row[0]
+        for row in db.execute(
+            """
+            SELECT strftime('%Y-%m', last_updated, 'unixepoch') FROM stories
+            WHERE status = 'inactive' AND last_updated < ?
+            UNION
+            SELECT strftime('%Y-%m', a.collected_at, 'unixepoch') FROM articles a
+            WHERE a.collected_at < ? AND a.cluster_pending = 0
+              AND NOT EXISTS (SELECT 1 FROM story_articles sa WHERE sa.article_id = a.id)
+            """,
+            (cutoff, cutoff),
+        )
+    ]
+    for month in sorted(months):
+        start, end = month_bounds(month)
+        with attached(db, month, write=True) as schema:
+            if schema is None:
+                continue
+            while True:
+                with db.transaction():
+                    rows = db.execute(
+                        """
+                        SELECT id, ulid FROM stories
+                        WHERE status = 'inactive' AND last_updated >= ? AND last_updated < ?
+                        ORDER BY last_updated
+                        LIMIT ?
+                        """,
+                        (start, min(end, cutoff), batch_size),
+                    ).fetchall()
+                    if rows:
+                        story_ids = [row[0] for row in rows]
+                        article_ids = _article_ids(db, story_ids)
+                    else:
+                        story_ids = []
+                        article_ids = _unlinked_article_ids(db, start, min(end, cutoff), batch_size)
+                        if not article_ids:
+                            break
+                    _copy_stories(db, schema, story_ids, article_ids)
+                # WAL commits are atomic per database file, not across them:
+                # commit the copy before deleting so a crash can only leave
+                # duplicates, which the next move ignores
+                with db.transaction():
+                    _delete_stories(db, story_ids, article_ids, now)
+                    db.executemany(
+                        "INSERT OR REPLACE INTO archived_stories (id, month) VALUES (?, ?)",
+                        [(row[1], month) for row in rows],
+                    )
+                result.stories_archived += len(story_ids)
+                result.articles_archived += len(article_ids)
+                result.batches += 1
+
+
+def apply_retention(
+    db: Database,
+    cfg: RetentionConfig,
+    *,
+    archive_dir: Path | None = None,
+    now: int | None = None,
+) -> RetentionResult:
+    """Apply *cfg*, one batch_size-story transaction at a time.
+
+    Moves to the archive databases happen before deletions, so a story idle
+    past both cutoffs is archived rather than dropped.
+
+    Articles are archived to *archive_dir* only when ``cfg.archive`` is set;
+    archiving without a directory is refused rather than silently skipped.
+    A batch archived but then rolled back is archived again by the next run;
+    ``herald import`` dedupes by URL, so the duplicate lines are harmless.
+    """
+    if cfg.archive and archive_dir is None:
+        raise ValueError("retention.archive is on but no archive directory was given")
+    if cfg.batch_size < 1:
+        raise ValueError(f"retention.batch_size must be positive, got {cfg.batch_size}")
+    now = int(time.time()) if now is None else now
+    result = RetentionResult()
+
+    if cfg.move_to_archive_days > 0:
+        _move_to_archive(db, now - cfg.move_to_archive_days * 86400, cfg.batch_size, result, now)
+
+    if cfg.inactive_story_days > 0:
+        cutoff = now - cfg.inactive_story_days * 86400
+        archived: set[Path] = set()
+        while True:
+            with db.transaction():
+                story_ids = [
+                    row[0]
+                    for row in db.execute(
+                        """
+                        SELECT id FROM stories
+                        WHERE status = 'inactive' AND last_updated < ?
+                        ORDER BY last_updated
+                        LIMIT ?
+                        """,
+                        (cutoff, cfg.batch_size),
+                    )
+                ]
+                if not story_ids:
+                    break
+                if cfg.archive:
+                    archived.update(_write_archive(archive_dir, _archive_records(db, story_ids)))
+                article_ids = _article_ids(db, story_ids)
+                _delete_stories(db, story_ids, article_ids, now)
+                result.articles_deleted += len(article_ids)
+            result.stories_deleted += len(story_ids)
+            result.batches += 1
+        # Articles never linked to a story, past the same cutoff
+        while True:
+            with db.transaction():
+                article_ids = _unlinked_article_ids(db, 0, cutoff, cfg.batch_size)
+                if not article_ids:
+                    break
+                if cfg.archive:
+                    archived.update(_write_archive(archive_dir, _unlinked_records(db, article_ids)))
+                _delete_stories(db, [], article_ids, now)
+            result.articles_deleted += len(article_ids)
+            result.batches += 1
+        result.archive_files = sorted(archived)
+
+    if cfg.run_history_days > 0:
+        cutoff = now - cfg.run_history_days * 86400
+        while True:
+            # Never the latest run: brief_cache and status read it
+            with db.transaction():
+                deleted = db.execute(
+                    """
+                    DELETE FROM pipeline_runs WHERE id IN (
+                        SELECT id FROM pipeline_runs
+                        WHERE started_at < ? AND id < (SELECT MAX(id) FROM pipeline_runs)
+                        ORDER BY id
+                        LIMIT ?
+                    )
+                    """,
+                    (cutoff, cfg.batch_size),
+                ).rowcount
+            if not deleted:
+                break
+            result.runs_deleted += deleted
+            result.batches += 1
+
+    return result
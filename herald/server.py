@@ -0,0 +1,309 @@
+"""Local read-only query server (``herald serve``).
+
+Slash commands and skills otherwise spawn ``herald brief``/``herald status``
+and pay interpreter start-up, imports and a schema check per call. The
+server keeps one read-only SQLite connection open and answers over loopback
+HTTP or a Unix domain socket:
+
+    GET /brief          ?hours=24&max_stories=25&topic=...   (markdown by default)
+    GET /stories        ?hours=24&limit=50&topic=...
+    GET /stories/<id>
+    GET /search         ?q=...&limit=20&since=YYYY-MM-DD&until=YYYY-MM-DD
+    GET /status
+
+Every route answers JSON or markdown (``?format=json|md`` or an Accept
+header of application/json / text/markdown). /search covers herald.db
+only unless ``since`` is given; then the archives of the months in range
+are searched too. Rendered responses are cached
+until another connection commits (PRAGMA data_version moves) or
+_CACHE_TTL_SECS pass, so time windows keep sliding; each carries an ETag and
+a matching If-None-Match gets an empty 304. Every response names the data
+dir it serves in X-Herald-Data-Dir, which hooks/query.sh checks before
+trusting the body.
+
+Requests are handled one at a time on the single connection.
+"""
+from __future__ import annotations
+
+import hashlib
+import ipaddress
+import json
+import socketserver
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from herald.db import PROFILES, Database
+from herald.project import cached_brief, fetch_brief_stories
+from herald.query import (
+    list_stories,
+    render_search,
+    render_status,
+    render_story_detail,
+    render_story_list,
+    search,
+    status_summary,
+    story_detail,
+)
+
+DEFAULT_PORT = 8765
+# Names the data dir being served, so clients can tell Herald (and the right
+# herald.db) from whatever else might answer on the port
+DATA_DIR_HEADER = "X-Herald-Data-Dir"
+
+# Rendered responses are reused this long while the data is unchanged
+_CACHE_TTL_SECS = 60.0
+_CACHE_MAX_ENTRIES = 256
+
+_JSON = "application/json"
+_MARKDOWN = "text/markdown; charset=utf-8"
+
+
+class _BadRequest(ValueError):
+    pass
+
+
+@dataclass
+class Response:
+    status: int
+    body: bytes = b""
+    content_type: str = _JSON
+    etag: str | None = None
+
+
+@dataclass
+class _Cached:
+    created: float
+    response: Response
+
+
+def is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _int_param(params: dict, name: str, default: int, maximum: int) -> int:
+    raw = params.get(name, [None])[0]
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise _BadRequest(f"{name} must be an integer") from None
+    if value < 1 or value > maximum:
+        raise _BadRequest(f"{name} must be between 1 and {maximum}")
+    return value
+
+
+def _date_param(params: dict, name: str, *, end_of_day: bool = False) -> int | None:
+    """A YYYY-MM-DD date (UTC; its last second with *end_of_day*) or Unix seconds."""
+    raw = params.get(name, [None])[0]
+    if raw is None:
+        return None
+    if raw.isdigit():
+        return int(raw)
+    try:
+        day = datetime.strptime(raw, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    except ValueError:
+        raise _BadRequest(f"{name} must be YYYY-MM-DD or Unix seconds") from None
+    return int(day.timestamp()) + (86399 if end_of_day else 0)
+
+
+def _json_body(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class QueryApp:
+    """Routes requests to read-only queries on one open connection."""
+
+    def __init__(self, db: Database, *, clock=time.monotonic) -> None:
+        self.db = db
+        self._clock = clock
+        self._cache: dict[tuple, _Cached] = {}
+        self._data_version: int | None = None
+
+    def handle(self, target: str, headers=None) -> Response:
+        """Answer ``GET target``. *headers* supplies Accept and If-None-Match."""
+        headers = headers or {}
+        url = urlsplit(target)
+        params = parse_qs(url.query)
+        try:
+            fmt = self._format(params, headers.get("Accept", ""))
+            key = (url.path, tuple(sorted((k, tuple(v)) for k, v in params.items())), fmt)
+            response = self._cached(key, lambda: self._route(url.path, params, fmt))
+        except _BadRequest as exc:
+            return Response(400, _json_body({"error": str(exc)}))
+        if response.status == 200 and response.etag is not None:
+            if response.etag in headers.get("If-None-Match", ""):
+                return Response(304, etag=response.etag, content_type=response.content_type)
+        return response
+
+    def _format(self, params: dict, accept: str) -> str | None:
+        fmt = params.get("format", [None])[0]
+        if fmt is not None:
+            if fmt not in ("json", "md"):
+                raise _BadRequest("format must be json or md")
+            return fmt
+        if "text/markdown" in accept:
+            return "md"
+        if _JSON in accept:
+            return "json"
+        return None  # route default
+
+    def _cached(self, key: tuple, render) -> Response:
+        version = self.db.data_version()
+        if version != self._data_version:
+            self._cache.clear()
+            self._data_version = version
+        now = self._clock()
+        hit = self._cache.get(key)
+        if hit is not None and now - hit.created < _CACHE_TTL_SECS:
+            return hit.response
+        response = render()
+        if response.status == 200:
+            response.etag = '"' + hashlib.sha1(response.body).hexdigest()[:20] + '"'
+            if len(self._cache) >= _CACHE_MAX_ENTRIES:
+                self._cache.clear()
+            self._cache[key] = _Cached(now, response)
+        return response
+
+    def _route(self, path: str, params: dict, fmt: str | None) -> Response:
+        path = path.rstrip("/") or "/"
+        if path == "/brief":
+            return self._brief(params, fmt or "md")
+        if path == "/stories":
+            hours = _int_param(params, "hours", 24, 24 * 365)
+            limit = _int_param(params, "limit", 50, 1000)
+            topic = params.get("topic", [None])[0]
+            stories = list_stories(self.db, hours=hours, limit=limit, topic_filter=topic)
+            return self._respond(fmt, stories, render_story_list)
+        if path.startswith("/stories/"):
+            story = story_detail(self.db, unquote(path[len("/stories/"):]))
+            if story is None:
+                return Response(404, _json_body({"error": "story not found"}))
+            return self._respond(fmt, story, render_story_detail)
+        if path == "/search":
+            text = params.get("q", [""])[0]
+            if not text.strip():
+                raise _BadRequest("q is required")
+            limit = _int_param(params, "limit", 20, 200)
+            since = _date_param(params, "since")
+            until = _date_param(params, "until", end_of_day=True)
+            results = search(self.db, text, limit=limit, since=since, until=until)
+            return self._respond(fmt, results, render_search)
+        if path == "/status":
+            return self._respond(fmt, status_summary(self.db), render_status)
+        return Response(404, _json_body({"error": f"unknown path: {path}"}))
+
+    def _brief(self, params: dict, fmt: str) -> Response:
+        hours = _int_param(params, "hours", 24, 24 * 365)
+        max_stories = _int_param(params, "max_stories", 25, 1000)
+        topic = params.get("topic", [None])[0]
+        if fmt == "md":
+            brief = cached_brief(self.db, hours=hours, max_stories=max_stories, topic_filter=topic)
+            return Response(200, brief.encode("utf-8"), _MARKDOWN)
+        since = int(time.time()) - hours * 3600
+        stories = [
+            dict(story, articles=articles, topics=topics)
+            for story, articles, topics in fetch_brief_stories(self.db, since, max_stories, topic)
+        ]
+        return Response(200, _json_body({"period_hours": hours, "stories": stories}))
+
+    @staticmethod
+    def _respond(fmt: str | None, data, render_md) -> Response:
+        if fmt == "md":
+            return Response(200, render_md(data).encode("utf-8"), _MARKDOWN)
+        return Response(200, _json_body(data))
+
+
+def _data_dir_header(db: Database) -> str:
+    # Header values go out as latin-1: send the UTF-8 bytes of the path as-is
+    return str(Path(db.path).parent.resolve()).encode("utf-8").decode("latin-1")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "herald"
+
+    def do_GET(self) -> None:
+        try:
+            response = self.server.app.handle(self.path, self.headers)
+        except Exception as exc:
+            print(f"[serve] ERROR {self.path}: {exc}", file=sys.stderr)
+            response = Response(500, _json_body({"error": "internal error"}))
+        self.send_response(response.status)
+        self.send_header("Content-Type", response.content_type)
+        self.send_header("Content-Length", str(len(response.body)))
+        if response.etag is not None:
+            self.send_header("ETag", response.etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header(DATA_DIR_HEADER, self.server.data_dir)
+        self.end_headers()
+        self.wfile.write(response.body)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+class _TCPServer(HTTPServer):
+    def __init__(self, address, app: QueryApp) -> None:
+        self.app = app
+        self.data_dir = _data_dir_header(app.db)
+        super().__init__(address, _Handler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.app.db.close()
+
+
+class _UnixServer(socketserver.UnixStreamServer):
+    def __init__(self, path: str, app: QueryApp) -> None:
+        self.app = app
+        self.data_dir = _data_dir_header(app.db)
+        super().__init__(path, _Handler)
+
+    def get_request(self):
+        # BaseHTTPRequestHandler expects a (host, port)-style client address
+        request, _ = super().get_request()
+        return request, ("local", 0)
+
+    def server_close(self) -> None:
+        super().server_close()
+        Path(self.server_address).unlink(missing_ok=True)
+        self.app.db.close()
+
+
+def open_server(
+    db_path: Path,
+    *,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    socket_path: Path | None = None,
+) -> socketserver.BaseServer:
+    """Bind the query server; the caller runs serve_forever() and server_close().
+
+    With *socket_path* the server listens on a Unix domain socket (replacing
+    a stale socket file); otherwise on *host*:*port*, which must be loopback.
+    """
+    db = Database(db_path, profile=PROFILES["read-mostly"], read_only=True)
+    app = QueryApp(db)
+    try:
+        if socket_path is not None:
+            if socket_path.is_socket():
+                socket_path.unlink()
+            server = _UnixServer(str(socket_path), app)
+        else:
+            if not is_loopback(host):
+                raise ValueError(f"refusing to listen on non-loopback address {host!r}")
+            server = _TCPServer((host, port), app)
+    except Exception:
+        db.close()
+        raise
+    return server
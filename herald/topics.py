@@ -17,11 +17,25 @@ def _keywords_for(value: any) -> list[str]:
     return []
 
 
-def extract_topics(title: str, topic_rules: dict[str, any]) -> list[str]:
-    t = title.lower()
-    matched = []
-    for topic, value in topic_rules.items():
-        keywords = _keywords_for(value)
-        if any(kw.lower() in t for kw in keywords):
-            matched.append(topic)
-    return matched
+class TopicMatcher:
+    """Topic rules with keywords flattened and lower-cased once.
+
+    Build one per batch (or keep one across runs) instead of re-normalizing
+    the rules for every title.
+    """
+
+    def __init__(self, topic_rules: dict[str, any]) -> None:
+        self._rules = [
+            (topic, tuple(kw.lower() for kw in _keywords_for(value)))
+            for topic, value in topic_rules.items()
+        ]
+
+    def match(self, title: str) -> list[str]:
+        t = title.lower()
+        return [topic for topic, keywords in self._rules if any(kw in t for kw in keywords)]
+
+
+def extract_topics(title: str, topic_rules: dict[str, any] | TopicMatcher) -> list[str]:
+    if not isinstance(topic_rules, TopicMatcher):
+        topic_rules = TopicMatcher(topic_rules)
+    return topic_rules.match(title)
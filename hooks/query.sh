@@ -0,0 +1,48 @@
+#!/usr/bin/env bash
+# Print `herald brief` or `herald status` for the slash commands and skill.
+#
+# Usage: query.sh brief|status
+#
+# Asking a running `herald serve` is opt-in: set HERALD_SERVER to its
+# loopback URL (http://127.0.0.1:8765) or to unix:/path/to/socket. Its
+# answer is used only if the X-Herald-Data-Dir header names this data dir,
+# so another process on the port, or a server for another data dir, is
+# never trusted. Anything else falls back to the CLI.
+
+case "${1:-}" in
+  brief) route="/brief" ;;
+  status) route="/status?format=md" ;;
+  *) echo "usage: query.sh brief|status" >&2; exit 2 ;;
+esac
+
+if [ -n "${HERALD_DATA_DIR:-}" ]; then
+  DIR="$HERALD_DATA_DIR"
+elif [ -d "$HOME/.herald" ]; then
+  DIR="$HOME/.herald"
+else
+  DIR="${XDG_DATA_HOME:-$HOME/.local/share}/herald"
+fi
+
+serve_via() {
+  case "$HERALD_SERVER" in
+    unix:/*) set -- --unix-socket "${HERALD_SERVER#unix:}" "http://localhost$route" ;;
+    http://127.0.0.1:*|http://localhost:*|http://\[::1\]:*) set -- "${HERALD_SERVER%/}$route" ;;
+    *) echo "[herald] HERALD_SERVER must be a loopback http:// URL or unix:/path; using the CLI" >&2; return 1 ;;
+  esac
+  command -v curl >/dev/null 2>&1 || return 1
+  want=$(cd "$DIR" 2>/dev/null && pwd -P) || return 1
+  tmp=$(mktemp -d) || return 1
+  if curl -sf --max-time 1 -D "$tmp/headers" -o "$tmp/body" "$@" 2>/dev/null \
+    && [ "$(tr -d '\r' < "$tmp/headers" | sed -n 's/^[Xx]-[Hh]erald-[Dd]ata-[Dd]ir: //p')" = "$want" ]; then
+    cat "$tmp/body"
+    rm -rf "$tmp"
+    return 0
+  fi
+  rm -rf "$tmp"
+  return 1
+}
+
+if [ -n "${HERALD_SERVER:-}" ] && serve_via; then
+  exit 0
+fi
+cd "${CLAUDE_PLUGIN_ROOT:-$(dirname "$0")/..}" && PYTHONPATH=. exec python3 -m herald.cli "$1"
@@ -0,0 +1,36 @@
+#!/usr/bin/env bash
+# SessionStart hook: say whether the latest digest is fresh.
+#
+# Reads last_run_at from the status.json manifest that every pipeline run
+# writes, so the common case starts neither Python nor SQLite. Falls back
+# to pipeline_runs in herald.db when the manifest is missing. Prints
+# nothing when Herald has not been set up.
+
+if [ -n "${HERALD_DATA_DIR:-}" ]; then
+  DIR="$HERALD_DATA_DIR"
+elif [ -d "$HOME/.herald" ]; then
+  DIR="$HOME/.herald"
+else
+  DIR="${XDG_DATA_HOME:-$HOME/.local/share}/herald"
+fi
+
+[ -f "$DIR/herald.db" ] || exit 0
+
+finished=""
+if [ -f "$DIR/status.json" ]; then
+  finished=$(sed -n 's/^  "last_run_at": \([0-9][0-9]*\),*$/\1/p' "$DIR/status.json")
+else
+  finished=$(python3 - "$DIR/herald.db" 2>/dev/null <<'PY'
+import sqlite3, sys
+db = sqlite3.connect(f"file:{sys.argv[1]}?mode=ro", uri=True)
+row = db.execute("SELECT finished_at FROM pipeline_runs ORDER BY id DESC LIMIT 1").fetchone()
+print(row[0] if row and row[0] else "")
+PY
+)
+fi
+
+if [ -n "$finished" ] && [ $(( $(date +%s) - finished )) -lt 86400 ]; then
+  echo "Herald digest ready — /news-digest to read."
+else
+  echo "Herald digest stale (>24h). Run /news-run to update."
+fi
@@ -0,0 +1,158 @@
+"""Tests for herald/archive.py — monthly archive databases attached on demand."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from herald.archive import archived_months, month_bounds, month_of
+from herald.cluster import cluster
+from herald.config import RetentionConfig
+from herald.counters import counter
+from herald.db import Database
+from herald.ingest import ingest_items
+from herald.models import RawItem, Source
+from herald.query import search, story_detail
+from herald.retention import apply_retention
+from herald.server import QueryApp
+
+SOURCES = {"hn": Source(id="hn", name="Hacker News", weight=0.5)}
+DAY = 86400
+NOW = int(datetime(2026, 10, 15, tzinfo=timezone.utc).timestamp())
+
+
+def _ts(month: str, day: int = 10) -> int:
+    return month_bounds(month)[0] + (day - 1) * DAY
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "herald.db"
+    db = Database(path)
+    db.execute("INSERT INTO sources (id, name, weight) VALUES ('hn', 'Hacker News', 0.5)")
+    titles = {
+        "Quantum networking testbed links three cities": ("2026-05", "inactive"),
+        "Kernel scheduler rewrite lands in mainline tree": ("2026-05", "inactive"),
+        "Quantum error correction milestone reported by lab": ("2026-07", "inactive"),
+        "Open hardware laptop ships to first backers": ("2026-10", "inactive"),
+        "Browser engine adds quantum-safe key exchange": ("2026-10", "active"),
+    }
+    items = [RawItem(url=f"https://ex.com/{i}", title=t, source_id="hn") for i, t in enumerate(titles)]
+    ingest_items(db, items, SOURCES, topic_rules={"quantum": ["quantum"]})
+    cluster(db)
+    for title, (month, status) in titles.items():
+        db.execute(
+            "UPDATE stories SET status = ?, last_updated = ? WHERE title = ?",
+            (status, _ts(month), title),
+        )
+    db.close()
+    return path
+
+
+def _move(db_path, days=60):
+    with Database(db_path) as db:
+        return apply_retention(db, RetentionConfig(move_to_archive_days=days, batch_size=1), now=NOW)
+
+
+def _archive_names(db_path):
+    return sorted(p.name for p in (db_path.parent / "archive").glob("*.db"))
+
+
+def test_months():
+    assert month_of(_ts("2026-02", 28)) == "2026-02"
+    assert month_bounds("2026-12") == (_ts("2026-12", 1), _ts("2027-01", 1))
+
+
+def test_moves_inactive_stories_into_monthly_files(db_path):
+    result = _move(db_path)
+    assert (result.stories_archived, result.articles_archived, result.batches) == (3, 3, 3)
+    assert _archive_names(db_path) == ["2026-05.db", "2026-07.db"]
+
+    with Database(db_path) as db:
+        titles = {r[0] for r in db.execute("SELECT title FROM stories")}
+        assert titles == {
+            "Open hardware laptop ships to first backers",
+            "Browser engine adds quantum-safe key exchange",
+        }
+        assert counter(db, "table", "articles") == 2
+        assert db.execute("SELECT COUNT(*) FROM articles_fts WHERE articles_fts MATCH 'kernel'").fetchone()[0] == 0
+        assert dict(db.execute("SELECT month, COUNT(*) FROM archived_stories GROUP BY month").fetchall()) == {
+            "2026-05": 2, "2026-07": 1,
+        }
+        assert archived_months(db, _ts("2026-06")) == ["2026-07"]
+
+    # Each archive is a full Herald database with its own FTS and counters
+    with Database(db_path.parent / "archive" / "2026-05.db") as archive:
+        assert counter(archive, "table", "stories") == 2
+        assert counter(archive, "article_topic", "quantum") == 1
+        assert archive.execute(
+            "SELECT COUNT(*) FROM stories_fts WHERE stories_fts MATCH 'kernel'"
+        ).fetchone()[0] == 1
+        # The archive numbers its own rows; links are remapped through the ULIDs
+        assert archive.execute(
+            """
+            SELECT COUNT(*) FROM stories s
+            JOIN story_articles sa ON sa.story_id = s.id
+            JOIN articles a ON a.id = sa.article_id AND a.id = s.canonical_article_id
+            WHERE a.title = s.title
+            """
+        ).fetchone()[0] == 2
+
+    # Nothing left to move; a second pass is a no-op
+    assert _move(db_path).stories_archived == 0
+
+
+def test_lookups_attach_only_the_months_they_need(db_path):
+    with Database(db_path) as db:
+        kernel_id = db.execute("SELECT ulid FROM stories WHERE title LIKE 'Kernel%'").fetchone()[0]
+    _move(db_path)
+
+    with Database(db_path, read_only=True) as db:
+        statements: list[str] = []
+        db._conn.set_trace_callback(statements.append)
+
+        story = story_detail(db, kernel_id)
+        assert story["title"] == "Kernel scheduler rewrite lands in mainline tree"
+        assert story["articles"][0]["source_name"] == "Hacker News"
+        attaches = [s for s in statements if s.startswith("ATTACH")]
+        assert len(attaches) == 1 and "2026-05.db" in attaches[0]
+        assert story_detail(db, "nope") is None
+
+        # Without a range only herald.db is searched
+        statements.clear()
+        hot = search(db, "quantum")
+        assert [s["title"] for s in hot["stories"]] == ["Browser engine adds quantum-safe key exchange"]
+        assert not any(s.startswith("ATTACH") for s in statements)
+
+        ranged = search(db, "quantum", since=_ts("2026-07", 1))
+        assert {s["title"] for s in ranged["stories"]} == {
+            "Quantum error correction milestone reported by lab",
+            "Browser engine adds quantum-safe key exchange",
+        }
+        attaches = [s for s in statements if s.startswith("ATTACH")]
+        assert len(attaches) == 1 and "2026-07.db" in attaches[0]
+
+        everything = search(db, "quantum", since=0)
+        assert len(everything["stories"]) == 3
+        assert len(everything["articles"]) == 3
+        db._conn.set_trace_callback(None)
+
+
+def test_server_search_range(db_path):
+    _move(db_path)
+    with Database(db_path, read_only=True) as db:
+        app = QueryApp(db)
+        response = app.handle("/search?q=quantum&since=2026-05-01&until=2026-05-31&format=json")
+        assert response.status == 200
+        assert b"Quantum networking testbed" in response.body
+        assert b"Browser engine" not in response.body
+        assert app.handle("/search?q=quantum&since=May").status == 400
+
+
+def test_archive_with_other_schema_version_is_skipped(db_path, capsys):
+    _move(db_path)
+    with Database(db_path.parent / "archive" / "2026-07.db") as archive:
+        archive.execute("PRAGMA user_version = 1")
+    with Database(db_path, read_only=True) as db:
+        assert search(db, "quantum", since=_ts("2026-07", 1))["stories"][0]["title"].startswith("Browser")
+    assert "skipping" in capsys.readouterr().err
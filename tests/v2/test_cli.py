@@ -9,6 +9,9 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from herald.cli import build_parser, main, DEFAULT_CONFIG_TEMPLATE
+from herald.config import DatabaseConfig
+from herald.db import PROFILES, Database
+from herald.lockfile import exclusive
 
 
 # ---------------------------------------------------------------------------
@@ -30,7 +33,7 @@ def test_argument_parsing():
     assert args.data_dir == "/tmp/test"
 
     # All subcommands parse correctly
-    for cmd in ("init", "run", "brief", "status"):
+    for cmd in ("init", "run", "brief", "status", "import", "daemon", "serve", "compact"):
         args = parser.parse_args([cmd])
         assert args.command == cmd
 
@@ -106,23 +109,24 @@ def test_run_executes_pipeline(tmp_path, capsys):
 
     mock_config = MagicMock()
     mock_config.sources = []
+    mock_config.database = DatabaseConfig()
     mock_db = MagicMock()
     mock_result = MagicMock()
     mock_result.run_id = 42
 
     with (
-        patch("herald.cli.load_config", return_value=mock_config) as mock_load,
+        patch("herald.config.load_config", return_value=mock_config) as mock_load,
         patch("herald.cli.Database", return_value=mock_db) as MockDB,
-        patch("herald.cli.run_pipeline", return_value=mock_result) as mock_pipeline,
+        patch("herald.pipeline.run_pipeline", return_value=mock_result) as mock_pipeline,
     ):
         exit_code = main(["--data-dir", str(data_dir), "run"])
 
     assert exit_code == 0
 
     mock_load.assert_called_once_with(config_path)
-    MockDB.assert_called_once_with(data_dir / "herald.db")
+    MockDB.assert_called_once_with(data_dir / "herald.db", profile=PROFILES["default"])
     mock_pipeline.assert_called_once_with(
-        mock_config, mock_db, adapter_map={}, data_dir=data_dir
+        mock_config, mock_db, adapter_map={}, data_dir=data_dir, force_all=False
     )
     mock_db.close.assert_called_once()
 
@@ -131,8 +135,27 @@ def test_run_executes_pipeline(tmp_path, capsys):
     assert "brief" in captured.out.lower() or "briefs" in captured.out.lower()
 
 
+def test_run_force_all_flag(tmp_path):
+    data_dir = tmp_path / "herald"
+    data_dir.mkdir()
+    (data_dir / "config.yaml").write_text("sources: []\n", encoding="utf-8")
+
+    mock_result = MagicMock()
+    mock_result.run_id = 1
+
+    with (
+        patch("herald.config.load_config", return_value=MagicMock(sources=[], database=DatabaseConfig())),
+        patch("herald.cli.Database", return_value=MagicMock()),
+        patch("herald.pipeline.run_pipeline", return_value=mock_result) as mock_pipeline,
+    ):
+        exit_code = main(["--data-dir", str(data_dir), "run", "--force-all"])
+
+    assert exit_code == 0
+    assert mock_pipeline.call_args.kwargs["force_all"] is True
+
+
 # ---------------------------------------------------------------------------
-# AC4: brief opens Database, calls project_brief, prints to stdout
+# AC4: brief opens Database, calls cached_brief, prints to stdout
 # ---------------------------------------------------------------------------
 
 
@@ -151,13 +174,13 @@ def test_brief_generates_output(tmp_path, capsys):
 
     with (
         patch("herald.cli.Database", return_value=mock_db) as MockDB,
-        patch("herald.cli.project_brief", return_value=mock_brief) as mock_proj,
+        patch("herald.project.cached_brief", return_value=mock_brief) as mock_proj,
     ):
         exit_code = main(["--data-dir", str(data_dir), "brief"])
 
     assert exit_code == 0
-    MockDB.assert_called_once_with(db_path)
-    mock_proj.assert_called_once_with(mock_db)
+    MockDB.assert_called_once_with(db_path, profile=PROFILES["read-mostly"])
+    mock_proj.assert_called_once_with(mock_db, hours=24, max_stories=25, topic_filter=None)
     mock_db.close.assert_called_once()
 
     captured = capsys.readouterr()
@@ -184,7 +207,7 @@ def test_status_shows_db_stats(tmp_path, capsys):
     db.execute(
         """
         INSERT INTO articles
-            (id, url_original, url_canonical, title, origin_source_id,
+            (ulid, url_original, url_canonical, title, origin_source_id,
              collected_at, score_base, scored_at)
         VALUES
             ('a1', 'http://x.com/1', 'http://x.com/1', 'Title One', 's1',
@@ -207,6 +230,76 @@ def test_status_shows_db_stats(tmp_path, capsys):
     assert "never" not in captured.out
 
 
+def test_import_reports_throughput(tmp_path, capsys):
+    data_dir = tmp_path / "herald"
+    assert main(["--data-dir", str(data_dir), "init"]) == 0
+    (data_dir / "config.yaml").write_text(
+        "sources:\n  - id: hn\n    name: Hacker News\n    type: hn\n", encoding="utf-8"
+    )
+    history = tmp_path / "2026-01-01.jsonl"
+    history.write_text(
+        '{"url": "https://a.com/1", "title": "One", "source": "Hacker News"}\n'
+        '{"url": "https://a.com/2", "title": "Two", "source": "Elsewhere"}\n',
+        encoding="utf-8",
+    )
+
+    (data_dir / "status.json").write_text('{"version": 1}', encoding="utf-8")
+    exit_code = main(["--data-dir", str(data_dir), "import", str(history)])
+
+    assert exit_code == 0
+    assert not (data_dir / "status.json").exists()
+    captured = capsys.readouterr()
+    assert "Imported 2 rows" in captured.out
+    assert "1 new" in captured.out and "1 skipped" in captured.out
+    assert "rows/s" in captured.out
+    assert "Elsewhere" in captured.err
+
+
+def test_import_and_daemon_exclude_each_other(tmp_path, capsys):
+    data_dir = tmp_path / "herald"
+    assert main(["--data-dir", str(data_dir), "init"]) == 0
+    history = tmp_path / "history.jsonl"
+    history.write_text('{"url": "https://a.com/1", "title": "One", "source_id": "hn"}\n', encoding="utf-8")
+    capsys.readouterr()
+
+    with exclusive(data_dir, "daemon"):
+        assert main(["--data-dir", str(data_dir), "import", str(history)]) == 1
+    assert "herald daemon is running" in capsys.readouterr().err
+
+    with exclusive(data_dir, "import"):
+        assert main(["--data-dir", str(data_dir), "daemon"]) == 1
+    assert "herald import is running" in capsys.readouterr().err
+
+    # Released again: the import goes ahead
+    assert main(["--data-dir", str(data_dir), "import", str(history)]) == 0
+
+
+def test_status_metrics_shows_recent_runs(tmp_path, capsys):
+    data_dir = tmp_path / "herald"
+    data_dir.mkdir()
+    from herald.db import Database as RealDatabase
+
+    db = RealDatabase(data_dir / "herald.db")
+    for run_id in (1, 2):
+        db.execute("INSERT INTO pipeline_runs (id, started_at, finished_at) VALUES (?, 0, 1)", (run_id,))
+        db.executemany(
+            """INSERT INTO pipeline_stage_metrics
+                   (run_id, seq, stage, wall_ms, cpu_ms, sql_statements, items_in, items_out)
+               VALUES (?, ?, ?, ?, 1.0, 5, 10, 4)""",
+            [(run_id, 0, "collect", 100.0 * run_id), (run_id, 1, "ingest", 20.0)],
+        )
+    db.close()
+
+    exit_code = main(["--data-dir", str(data_dir), "status", "--metrics", "--runs", "5"])
+
+    assert exit_code == 0
+    out = capsys.readouterr().out
+    assert "last 2 runs" in out
+    assert "collect" in out and "ingest" in out
+    assert "150.0" in out  # average collect wall time
+    assert "Run 2" in out
+
+
 # ---------------------------------------------------------------------------
 # AC7: error handling — missing config, missing data_dir
 # ---------------------------------------------------------------------------
@@ -257,3 +350,50 @@ def test_status_error_missing_db(tmp_path, capsys):
     assert exit_code != 0
     captured = capsys.readouterr()
     assert "error" in captured.err.lower()
+
+
+def test_serve_refuses_public_address(tmp_path, capsys):
+    data_dir = tmp_path / "herald"
+    data_dir.mkdir()
+    assert main(["--data-dir", str(data_dir), "serve"]) != 0
+    assert "database not found" in capsys.readouterr().err
+
+    Database(data_dir / "herald.db").close()
+    exit_code = main(["--data-dir", str(data_dir), "serve", "--host", "0.0.0.0"])
+
+    assert exit_code != 0
+    assert "non-loopback" in capsys.readouterr().err
+
+
+def test_status_reads_manifest_without_opening_db(tmp_path, capsys):
+    data_dir = tmp_path / "herald"
+    data_dir.mkdir()
+    Database(data_dir / "herald.db").close()
+    (data_dir / "status.json").write_text(
+        '{"version": 1, "articles": 42, "stories": 7, "last_run": "2026-01-01T00:00:00Z"}',
+        encoding="utf-8",
+    )
+
+    with patch("herald.cli.Database") as MockDB:
+        exit_code = main(["--data-dir", str(data_dir), "status"])
+
+    assert exit_code == 0
+    MockDB.assert_not_called()
+    assert capsys.readouterr().out == "Articles: 42\nStories:  7\nLast run: 2026-01-01T00:00:00Z\n"
+
+    # A manifest from another format version is ignored
+    (data_dir / "status.json").write_text('{"version": 99}', encoding="utf-8")
+    assert main(["--data-dir", str(data_dir), "status"]) == 0
+    assert "Articles: 0" in capsys.readouterr().out
+
+
+def test_compact_reports_sizes(tmp_path, capsys):
+    data_dir = tmp_path / "herald"
+    data_dir.mkdir()
+    assert main(["--data-dir", str(data_dir), "compact"]) != 0
+    assert "database not found" in capsys.readouterr().err
+
+    Database(data_dir / "herald.db").close()
+    assert main(["--data-dir", str(data_dir), "compact"]) == 0
+    out = capsys.readouterr().out
+    assert out.startswith(f"Compacted {data_dir / 'herald.db'}: ") and out.rstrip().endswith(" MB")
@@ -0,0 +1,73 @@
+"""Cold-start budget for `herald status` (the SessionStart hook has 2 seconds)."""
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from herald.db import Database
+
+_ROOT = Path(__file__).resolve().parents[2]
+
+# Modules `herald status` must never load: they belong to run/import/serve
+_HEAVY = ("yaml", "httpx", "asyncio", "http.server", "herald.config", "herald.pipeline", "herald.collect")
+
+# Summed cumulative import time of herald modules, in microseconds. Lazy
+# imports keep this near 20 ms; eager imports of the pipeline cost ~150 ms.
+_IMPORT_BUDGET_US = 75_000
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True, text=True, cwd=_ROOT, timeout=60,
+    )
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    Database(tmp_path / "herald.db").close()
+    return tmp_path
+
+
+def _status_code(data_dir: Path, tail: str = "") -> str:
+    return (
+        "import sys\n"
+        "from herald.cli import main\n"
+        f"assert main(['--data-dir', {str(data_dir)!r}, 'status']) == 0\n"
+        + tail
+    )
+
+
+def test_status_does_not_import_pipeline_dependencies(data_dir):
+    tail = (
+        f"heavy = [m for m in {_HEAVY!r} if m in sys.modules]\n"
+        "print('HEAVY', heavy)\n"
+    )
+    proc = _run(_status_code(data_dir, tail))
+    assert proc.returncode == 0, proc.stderr
+    assert "HEAVY []" in proc.stdout
+
+
+def test_status_import_time_within_budget(data_dir):
+    # Best of three runs smooths over a cold disk cache
+    totals = []
+    for _ in range(3):
+        proc = _run(_status_code(data_dir), "-X", "importtime")
+        assert proc.returncode == 0, proc.stderr
+        total = 0
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            _, cumulative, field = line[len("import time:"):].split("|")
+            # Each nesting level indents the name by two spaces after "| "
+            name = field[1:]
+            depth = (len(name) - len(name.lstrip(" "))) // 2
+            # Top-level herald entries only: their cumulative time already
+            # includes every module, herald or not, they pulled in
+            if depth == 0 and name.strip().startswith("herald"):
+                total += int(cumulative)
+        totals.append(total)
+    assert min(totals) < _IMPORT_BUDGET_US, f"herald imports took {min(totals) / 1000:.1f} ms"
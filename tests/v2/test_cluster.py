@@ -8,7 +8,8 @@ from pathlib import Path
 
 import pytest
 
-from herald.cluster import ClusterResult, cluster, deactivate_stale, normalize_title
+import herald.cluster as cluster_mod
+from herald.cluster import ClusterCache, ClusterResult, StoryIndex, _tokens, cluster, deactivate_stale, normalize_title
 from herald.config import ClusterConfig
 from herald.db import Database
 
@@ -25,26 +26,26 @@ def _make_db(tmp_path: Path) -> Database:
 
 def _insert_article(
     db: Database,
-    article_id: str,
+    ulid: str,
     title: str,
     score_base: float = 1.0,
     collected_at: int | None = None,
     source_id: str = "hn",
     url: str | None = None,
-) -> None:
+) -> int:
     if collected_at is None:
         collected_at = int(time.time())
     if url is None:
-        url = f"http://example.com/{article_id}"
-    db.execute(
+        url = f"http://example.com/{ulid}"
+    return db.execute(
         """
         INSERT INTO articles
-            (id, url_original, url_canonical, title, origin_source_id,
+            (ulid, url_original, url_canonical, title, origin_source_id,
              collected_at, score_base, scored_at, story_type)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'news')
         """,
         (
-            article_id,
+            ulid,
             url,
             url,
             title,
@@ -53,17 +54,23 @@ def _insert_article(
             score_base,
             collected_at,
         ),
-    )
+    ).lastrowid
 
 
-def _insert_article_topics(db: Database, article_id: str, topics: list[str]) -> None:
+def _insert_article_topics(db: Database, ulid: str, topics: list[str]) -> None:
     for topic in topics:
         db.execute(
-            "INSERT INTO article_topics (article_id, topic) VALUES (?, ?)",
-            (article_id, topic),
+            "INSERT INTO article_topics (article_id, topic) SELECT id, ? FROM articles WHERE ulid = ?",
+            (topic, ulid),
         )
 
 
+def _canonical_ulid(db: Database) -> str:
+    return db.execute(
+        "SELECT a.ulid FROM stories s JOIN articles a ON a.id = s.canonical_article_id"
+    ).fetchone()[0]
+
+
 # ---------------------------------------------------------------------------
 # AC1: ClusterResult dataclass
 # ---------------------------------------------------------------------------
@@ -164,9 +171,9 @@ def test_new_story_inserts_into_stories_table(tmp_path):
 
 def test_new_story_inserts_into_story_articles(tmp_path):
     db = _make_db(tmp_path)
-    _insert_article(db, "a1", "Python 3.14 Released with New Features")
+    a1 = _insert_article(db, "a1", "Python 3.14 Released with New Features")
     cluster(db)
-    row = db.execute("SELECT article_id FROM story_articles WHERE article_id='a1'").fetchone()
+    row = db.execute("SELECT article_id FROM story_articles WHERE article_id = ?", (a1,)).fetchone()
     assert row is not None
     db.close()
 
@@ -175,8 +182,7 @@ def test_new_story_canonical_is_article(tmp_path):
     db = _make_db(tmp_path)
     _insert_article(db, "a1", "Python 3.14 Released with New Features", score_base=1.5)
     cluster(db)
-    row = db.execute("SELECT canonical_article_id FROM stories").fetchone()
-    assert row[0] == "a1"
+    assert _canonical_ulid(db) == "a1"
     db.close()
 
 
@@ -200,8 +206,8 @@ def test_merge_similar_titles(tmp_path):
 def test_merge_both_in_same_story(tmp_path):
     db = _make_db(tmp_path)
     now = int(time.time())
-    _insert_article(db, "a1", "Python 3.14 Released with Many New Features", collected_at=now - 3600)
-    _insert_article(db, "a2", "Python 3.14 Released with Many New Features Today", collected_at=now)
+    a1 = _insert_article(db, "a1", "Python 3.14 Released with Many New Features", collected_at=now - 3600)
+    a2 = _insert_article(db, "a2", "Python 3.14 Released with Many New Features Today", collected_at=now)
     cluster(db)
     stories = db.execute("SELECT id FROM stories").fetchall()
     assert len(stories) == 1
@@ -210,8 +216,8 @@ def test_merge_both_in_same_story(tmp_path):
         "SELECT article_id FROM story_articles WHERE story_id=?", (story_id,)
     ).fetchall()
     article_ids = {r[0] for r in articles}
-    assert "a1" in article_ids
-    assert "a2" in article_ids
+    assert a1 in article_ids
+    assert a2 in article_ids
     db.close()
 
 
@@ -233,9 +239,9 @@ def test_short_title_skipped(tmp_path):
 def test_short_title_not_in_story_articles(tmp_path):
     db = _make_db(tmp_path)
     cfg = ClusterConfig(min_title_words=4)
-    _insert_article(db, "a1", "Too short")
+    a1 = _insert_article(db, "a1", "Too short")
     cluster(db, cfg)
-    row = db.execute("SELECT article_id FROM story_articles WHERE article_id='a1'").fetchone()
+    row = db.execute("SELECT article_id FROM story_articles WHERE article_id = ?", (a1,)).fetchone()
     assert row is None
     db.close()
 
@@ -414,14 +420,14 @@ def test_stale_story_deactivated(tmp_path):
     # Insert a story directly with an old last_updated
     db.execute(
         """
-        INSERT INTO stories (id, title, score, canonical_article_id, first_seen, last_updated, status)
+        INSERT INTO stories (ulid, title, score, canonical_article_id, first_seen, last_updated, status)
         VALUES ('s1', 'Old Story Title', 1.0, NULL, ?, ?, 'active')
         """,
         (old_ts, old_ts),
     )
     count = deactivate_stale(db, cfg)
     assert count == 1
-    row = db.execute("SELECT status FROM stories WHERE id='s1'").fetchone()
+    row = db.execute("SELECT status FROM stories WHERE ulid='s1'").fetchone()
     assert row[0] == "inactive"
     db.close()
 
@@ -433,14 +439,14 @@ def test_active_story_not_deactivated(tmp_path):
     now = int(time.time())
     db.execute(
         """
-        INSERT INTO stories (id, title, score, canonical_article_id, first_seen, last_updated, status)
+        INSERT INTO stories (ulid, title, score, canonical_article_id, first_seen, last_updated, status)
         VALUES ('s1', 'Recent Story Title', 1.0, NULL, ?, ?, 'active')
         """,
         (now, now),
     )
     count = deactivate_stale(db, cfg)
     assert count == 0
-    row = db.execute("SELECT status FROM stories WHERE id='s1'").fetchone()
+    row = db.execute("SELECT status FROM stories WHERE ulid='s1'").fetchone()
     assert row[0] == "active"
     db.close()
 
@@ -452,19 +458,19 @@ def test_stale_deactivates_only_old(tmp_path):
     now = int(time.time())
     old_ts = now - 8 * 86400
     db.execute(
-        "INSERT INTO stories (id, title, score, canonical_article_id, first_seen, last_updated, status)"
+        "INSERT INTO stories (ulid, title, score, canonical_article_id, first_seen, last_updated, status)"
         " VALUES ('s1', 'Old Story', 1.0, NULL, ?, ?, 'active')",
         (old_ts, old_ts),
     )
     db.execute(
-        "INSERT INTO stories (id, title, score, canonical_article_id, first_seen, last_updated, status)"
+        "INSERT INTO stories (ulid, title, score, canonical_article_id, first_seen, last_updated, status)"
         " VALUES ('s2', 'New Story', 1.0, NULL, ?, ?, 'active')",
         (now, now),
     )
     count = deactivate_stale(db, cfg)
     assert count == 1
-    s1 = db.execute("SELECT status FROM stories WHERE id='s1'").fetchone()[0]
-    s2 = db.execute("SELECT status FROM stories WHERE id='s2'").fetchone()[0]
+    s1 = db.execute("SELECT status FROM stories WHERE ulid='s1'").fetchone()[0]
+    s2 = db.execute("SELECT status FROM stories WHERE ulid='s2'").fetchone()[0]
     assert s1 == "inactive"
     assert s2 == "active"
     db.close()
@@ -484,8 +490,7 @@ def test_canonical_reelection_when_higher_score(tmp_path):
     # Second article has score 0.21 higher (> 0.1 delta)
     _insert_article(db, "a2", "Python released with great new features now", score_base=1.21, collected_at=now)
     cluster(db, cfg)
-    row = db.execute("SELECT canonical_article_id FROM stories").fetchone()
-    assert row[0] == "a2"
+    assert _canonical_ulid(db) == "a2"
     db.close()
 
 
@@ -498,8 +503,7 @@ def test_canonical_not_replaced_when_equal_plus_delta(tmp_path):
     # Exactly at threshold: 1.0 + 0.1 = 1.1 — must NOT replace
     _insert_article(db, "a2", "Python released with great new features now", score_base=1.1, collected_at=now)
     cluster(db, cfg)
-    row = db.execute("SELECT canonical_article_id FROM stories").fetchone()
-    assert row[0] == "a1"
+    assert _canonical_ulid(db) == "a1"
     db.close()
 
 
@@ -511,8 +515,7 @@ def test_canonical_not_replaced_when_lower_score(tmp_path):
     _insert_article(db, "a1", "Python released with great new features", score_base=2.0, collected_at=now - 3600)
     _insert_article(db, "a2", "Python released with great new features now", score_base=0.5, collected_at=now)
     cluster(db, cfg)
-    row = db.execute("SELECT canonical_article_id FROM stories").fetchone()
-    assert row[0] == "a1"
+    assert _canonical_ulid(db) == "a1"
     db.close()
 
 
@@ -541,8 +544,7 @@ def test_canonical_boundary_strictly_greater(tmp_path):
     epsilon = 0.001
     _insert_article(db, "a2", "Python released with great new features now", score_base=1.0 + 0.1 + epsilon, collected_at=now)
     cluster(db, cfg)
-    row = db.execute("SELECT canonical_article_id FROM stories").fetchone()
-    assert row[0] == "a2"
+    assert _canonical_ulid(db) == "a2"
     db.close()
 
 
@@ -650,3 +652,216 @@ def test_paper_id_no_conflict_with_non_arxiv(tmp_path):
     assert result.stories_created == 1, "Arxiv + non-arxiv should merge on title"
     assert result.stories_updated == 1
     db.close()
+
+
+# ---------------------------------------------------------------------------
+# StoryIndex: active stories loaded once per cluster() run
+# ---------------------------------------------------------------------------
+
+def test_story_index_aggregates_member_topics_and_papers(tmp_path):
+    db = _make_db(tmp_path)
+    now = int(time.time())
+    _insert_article(
+        db, "a1", "Exact Same Paper Title with Large Language Models",
+        collected_at=now - 100, url="https://arxiv.org/abs/2603.12345",
+    )
+    _insert_article_topics(db, "a1", ["ai"])
+    cluster(db)
+    _insert_article(
+        db, "a2", "Exact Same Paper Title with Large Language Models",
+        collected_at=now, url="https://tldr.takara.ai/p/2603.12345",
+    )
+    _insert_article_topics(db, "a2", ["ai", "research"])
+    cluster(db)
+
+    index = StoryIndex.load(db)
+    assert len(index) == 1
+    entry = index.ordered()[0]
+    assert entry.topics == {"ai", "research"}
+    assert entry.paper_ids == {"2603.12345"}
+    assert entry.norm == normalize_title(entry.title)
+    db.close()
+
+
+def test_story_index_orders_by_last_updated(tmp_path):
+    db = _make_db(tmp_path)
+    now = int(time.time())
+    a1 = _insert_article(db, "a1", "Rust compiler gets faster incremental builds", collected_at=now - 500)
+    a2 = _insert_article(db, "a2", "New study on coffee and sleep quality", collected_at=now)
+    cluster(db)
+
+    index = StoryIndex.load(db)
+    assert [e.canonical_article_id for e in index.ordered()] == [a2, a1]
+    db.close()
+
+
+def test_cluster_reads_active_stories_once(tmp_path):
+    db = _make_db(tmp_path)
+    now = int(time.time())
+    for i in range(5):
+        _insert_article(db, f"s{i}", f"Seed story number {i} about distinct topic {i * 7}", collected_at=now)
+    cluster(db)
+    for i in range(20):
+        _insert_article(db, f"n{i}", f"Fresh headline {i} with several unrelated words {i}", collected_at=now)
+
+    statements: list[str] = []
+    db._conn.set_trace_callback(statements.append)
+    cluster(db)
+    db._conn.set_trace_callback(None)
+
+    active_reads = [s for s in statements if "FROM stories" in s and "status = 'active'" in s]
+    assert len(active_reads) == 1
+    db.close()
+
+
+
+def test_cluster_reads_only_pending_articles(tmp_path):
+    db = _make_db(tmp_path)
+    now = int(time.time())
+    _insert_article(db, "short", "Too short", collected_at=now)
+    _insert_article(db, "long", "A headline long enough to become a story", collected_at=now)
+    result = cluster(db)
+    assert result.stories_created == 1
+    # The skipped short title is not pending any more either
+    assert db.execute("SELECT COUNT(*) FROM articles WHERE cluster_pending = 1").fetchone()[0] == 0
+
+    plan = " ".join(
+        row[3] for row in db.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM articles a WHERE a.cluster_pending = 1 ORDER BY a.collected_at"
+        )
+    )
+    assert "idx_articles_cluster_pending" in plan
+    assert cluster(db).articles_clustered == 0
+    db.close()
+
+# ---------------------------------------------------------------------------
+# Shared-token pre-filter
+# ---------------------------------------------------------------------------
+
+def test_tokens_drop_stopwords_and_keep_versions():
+    assert _tokens(normalize_title("The new Python 3.14 is out for you")) == {"python", "3.14"}
+
+
+def test_token_prefilter_blocks_lookalike_titles(tmp_path):
+    """Character-similar titles with no shared words never reach SequenceMatcher."""
+    db = _make_db(tmp_path)
+    now = int(time.time())
+    _insert_article(db, "a1", "abcdefgh ijklmnop qrstuvw xyzabcd", collected_at=now - 10)
+    _insert_article(db, "a2", "abcdefgx ijklmnox qrstuvx xyzabcx", collected_at=now)
+    assert cluster(db, ClusterConfig(min_token_overlap=2)).stories_created == 2
+    db.close()
+
+    db = Database(tmp_path / "off.db")
+    db.execute("INSERT INTO sources (id, name, weight) VALUES ('hn', 'Hacker News', 0.5)")
+    _insert_article(db, "a1", "abcdefgh ijklmnop qrstuvw xyzabcd", collected_at=now - 10)
+    _insert_article(db, "a2", "abcdefgx ijklmnox qrstuvx xyzabcx", collected_at=now)
+    assert cluster(db, ClusterConfig(min_token_overlap=0)).stories_created == 1
+    db.close()
+
+
+def test_token_prefilter_skips_similarity_for_unrelated_stories(tmp_path, monkeypatch):
+    db = _make_db(tmp_path)
+    now = int(time.time())
+    for i, title in enumerate([
+        "Rust compiler gets faster incremental builds",
+        "New study on coffee and sleep quality",
+        "Kubernetes operators explained for beginners",
+    ]):
+        _insert_article(db, f"s{i}", title, collected_at=now - 100)
+    cluster(db)
+
+    calls = []
+    real = cluster_mod._title_similarity
+    monkeypatch.setattr(
+        cluster_mod, "_title_similarity", lambda a, b: calls.append(b) or real(a, b)
+    )
+    _insert_article(db, "n1", "Rust compiler gets much faster incremental builds", collected_at=now)
+    result = cluster(db)
+
+    assert result.stories_updated == 1
+    assert calls == [normalize_title("Rust compiler gets faster incremental builds")]
+    db.close()
+
+
+def test_token_candidates_follow_retitle(tmp_path):
+    db = _make_db(tmp_path)
+    _insert_article(db, "a1", "Rust compiler gets faster incremental builds")
+    cluster(db)
+    index = StoryIndex.load(db)
+    entry = index.ordered()[0]
+    assert index.token_candidates(_tokens("rust compiler"), 2) == {entry.id}
+
+    index.retitle(entry, "Kubernetes operators explained for beginners")
+    assert index.token_candidates(_tokens("rust compiler"), 2) == set()
+    assert index.token_candidates(_tokens("kubernetes operators"), 2) == {entry.id}
+    db.close()
+
+
+@pytest.mark.parametrize("candidate_index", ["scan", "lsh"])
+def test_cluster_cache_matches_cold_runs(tmp_path, candidate_index):
+    cfg = ClusterConfig(candidate_index=candidate_index)
+    now = int(time.time())
+    titles = [
+        "Rust compiler gets faster incremental builds",
+        "Kubernetes operators explained for beginners",
+        "Rust compiler gets much faster incremental builds",
+        "Python 3.13 release adds free-threaded mode",
+        "Kubernetes operators explained for total beginners",
+    ]
+    (tmp_path / "warm").mkdir()
+    (tmp_path / "cold").mkdir()
+    warm_db = _make_db(tmp_path / "warm")
+    cold_db = _make_db(tmp_path / "cold")
+    cache = ClusterCache()
+    for i, title in enumerate(titles):
+        for db in (warm_db, cold_db):
+            _insert_article(db, f"a{i}", title, collected_at=now - 100 + i)
+        warm = cluster(warm_db, cfg, cache=cache)
+        cold = cluster(cold_db, cfg)
+        assert warm == cold
+
+    query = "SELECT story_id, article_id FROM story_articles ORDER BY article_id"
+    assert len(warm_db.execute(query).fetchall()) == len(titles)
+    assert [r[1] for r in warm_db.execute(query)] == [r[1] for r in cold_db.execute(query)]
+    assert len(cache.index) == 3
+    warm_db.close()
+    cold_db.close()
+
+
+def test_cluster_cache_reloads_after_external_write(tmp_path):
+    db = _make_db(tmp_path)
+    cache = ClusterCache()
+    _insert_article(db, "a1", "Rust compiler gets faster incremental builds")
+    cluster(db, cache=cache)
+    first = cache.index
+
+    cluster(db, cache=cache)
+    assert cache.index is first
+
+    other = Database(tmp_path / "test.db")
+    other.execute("UPDATE stories SET title = 'Kubernetes operators explained for beginners'")
+    other.close()
+
+    _insert_article(db, "a2", "Kubernetes operators explained for beginners")
+    result = cluster(db, cache=cache)
+    assert cache.index is not first
+    assert result.stories_updated == 1
+    db.close()
+
+
+def test_deactivate_stale_prunes_cache(tmp_path):
+    db = _make_db(tmp_path)
+    cfg = ClusterConfig(candidate_index="lsh")
+    cache = ClusterCache()
+    old = int(time.time()) - 30 * 86400
+    _insert_article(db, "a1", "Rust compiler gets faster incremental builds", collected_at=old)
+    cluster(db, cfg, cache=cache)
+    assert len(cache.index) == 1
+
+    assert deactivate_stale(db, cfg, cache=cache) == 1
+    assert len(cache.index) == 0
+
+    _insert_article(db, "a2", "Rust compiler gets faster incremental builds")
+    result = cluster(db, cfg, cache=cache)
+    assert result.stories_created == 1
+    db.close()
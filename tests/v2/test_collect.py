@@ -1,7 +1,9 @@
 """Tests for herald/collect.py (v2 Collect stage)."""
 from __future__ import annotations
 
+import asyncio
 import sys
+import time
 import types
 from unittest.mock import MagicMock, patch
 
@@ -15,13 +17,18 @@ if "fastfeedparser" not in sys.modules:
     sys.modules["fastfeedparser"] = _ffp
 
 from herald.collect import (  # noqa: E402
+    _collect_sequential,
     _fetch_with_retry,
+    acollect_all,
+    afetch_hn,
+    afetch_rss,
     collect_all,
     fetch_hn,
     fetch_rss,
     fetch_tavily,
 )
-from herald.models import RawItem, Source
+from herald.config import CollectConfig
+from herald.models import FetchLog, FetchState, RawItem, Source
 
 
 # ---------------------------------------------------------------------------
@@ -79,22 +86,23 @@ TAVILY_JSON = {
 # fetch_rss tests
 # ---------------------------------------------------------------------------
 
+def _feed_client(body: bytes = b"<rss/>", headers: dict | None = None) -> httpx.Client:
+    """Synchronous client whose transport answers every GET with *body*."""
+    def handler(request):
+        return httpx.Response(200, content=body, headers=headers)
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
 def test_rss_returns_raw_items_with_source_id():
     source = Source(id="test-rss", name="Test RSS", url="https://example.com/feed.xml")
-    mock_resp = _make_response(text="<rss/>")
     entries = [
         _make_feed_entry(link="https://example.com/article-1", title="Article One", published="Mon, 01 Jan 2024 12:00:00 +0000"),
         _make_feed_entry(link="https://example.com/article-2", title="Article Two"),
     ]
     mock_feed_result = _make_feed_result(entries)
 
-    with patch("httpx.Client") as mock_client_cls, \
-         patch("fastfeedparser.parse", return_value=mock_feed_result):
-        mock_client = MagicMock()
-        mock_client_cls.return_value.__enter__.return_value = mock_client
-        mock_client.get.return_value = mock_resp
-
-        items = fetch_rss(source)
+    with patch("fastfeedparser.parse", return_value=mock_feed_result) as mock_parse:
+        items = fetch_rss(source, client=_feed_client())
 
     assert len(items) == 2
     for item in items:
@@ -102,24 +110,20 @@ def test_rss_returns_raw_items_with_source_id():
         assert item.source_id == "test-rss"
     assert items[0].url == "https://example.com/article-1"
     assert items[0].title == "Article One"
+    # The parser receives the raw bytes, not a decoded str copy
+    mock_parse.assert_called_once_with(b"<rss/>")
 
 
 def test_rss_source_id_matches_source():
     """source_id must equal source.id, not a hardcoded string."""
     source = Source(id="my-custom-id", name="My Feed", url="https://example.com/feed.xml")
-    mock_resp = _make_response(text="<rss/>")
     entries = [
         _make_feed_entry(link="https://example.com/article-1", title="A"),
     ]
     mock_feed_result = _make_feed_result(entries)
 
-    with patch("httpx.Client") as mock_client_cls, \
-         patch("fastfeedparser.parse", return_value=mock_feed_result):
-        mock_client = MagicMock()
-        mock_client_cls.return_value.__enter__.return_value = mock_client
-        mock_client.get.return_value = mock_resp
-
-        items = fetch_rss(source)
+    with patch("fastfeedparser.parse", return_value=mock_feed_result):
+        items = fetch_rss(source, client=_feed_client())
 
     assert all(item.source_id == "my-custom-id" for item in items)
 
@@ -138,31 +142,26 @@ def test_rss_http_failure_returns_empty():
     with patch("httpx.Client") as mock_client_cls:
         mock_client = MagicMock()
         mock_client_cls.return_value.__enter__.return_value = mock_client
-        mock_client.get.side_effect = httpx.ConnectError("connection refused")
+        mock_client.stream.side_effect = httpx.ConnectError("connection refused")
 
         with patch("time.sleep"):
             items = fetch_rss(source)
 
     assert items == []
+    assert mock_client.stream.call_count == 3
 
 
 def test_rss_entry_no_url_skipped():
     """RSS entries without link or id are silently skipped."""
     source = Source(id="rss-partial", name="Partial Feed", url="https://example.com/feed.xml")
-    mock_resp = _make_response(text="<rss/>")
     entries = [
         _make_feed_entry(link="https://example.com/ok", title="Has Link"),
         _make_feed_entry(link=None, entry_id=None, title="No Link No Id"),
     ]
     mock_feed_result = _make_feed_result(entries)
 
-    with patch("httpx.Client") as mock_client_cls, \
-         patch("fastfeedparser.parse", return_value=mock_feed_result):
-        mock_client = MagicMock()
-        mock_client_cls.return_value.__enter__.return_value = mock_client
-        mock_client.get.return_value = mock_resp
-
-        items = fetch_rss(source)
+    with patch("fastfeedparser.parse", return_value=mock_feed_result):
+        items = fetch_rss(source, client=_feed_client())
 
     assert len(items) == 1
     assert items[0].url == "https://example.com/ok"
@@ -172,16 +171,59 @@ def test_rss_oversized_response_returns_empty():
     """Responses over 10MB are rejected without raising."""
     source = Source(id="big-rss", name="Big Feed", url="https://example.com/huge.xml")
     big_content = b"x" * (10 * 1024 * 1024 + 1)
-    mock_resp = _make_response(content=big_content)
 
-    with patch("httpx.Client") as mock_client_cls:
-        mock_client = MagicMock()
-        mock_client_cls.return_value.__enter__.return_value = mock_client
-        mock_client.get.return_value = mock_resp
+    with patch("fastfeedparser.parse") as mock_parse:
+        items = fetch_rss(source, client=_feed_client(big_content))
 
-        items = fetch_rss(source)
+    assert items == []
+    mock_parse.assert_not_called()
+
+
+def test_rss_oversized_content_length_rejected_before_body():
+    """A declared Content-Length over the cap aborts before any body is read."""
+    source = Source(id="big-rss", name="Big Feed", url="https://example.com/huge.xml")
+    chunks_read = 0
+
+    def _body():
+        nonlocal chunks_read
+        for _ in range(4):
+            chunks_read += 1
+            yield b"x" * 1024
+
+    def handler(request):
+        return httpx.Response(
+            200,
+            headers={"Content-Length": str(20 * 1024 * 1024)},
+            content=_body(),
+        )
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        items = fetch_rss(source, client=client)
 
     assert items == []
+    assert chunks_read == 0
+
+
+def test_rss_stream_aborts_once_cap_exceeded():
+    """Without Content-Length the download stops at the first chunk past the cap."""
+    from herald.collect import _FeedTooLarge, _stream_with_retry
+
+    chunks_read = 0
+
+    def _body():
+        nonlocal chunks_read
+        for _ in range(100):
+            chunks_read += 1
+            yield b"x" * 1024
+
+    def handler(request):
+        return httpx.Response(200, content=_body())
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        with pytest.raises(_FeedTooLarge):
+            _stream_with_retry(client, "https://example.com/huge.xml", max_bytes=4096)
+
+    assert chunks_read == 5
 
 
 # ---------------------------------------------------------------------------
@@ -485,3 +527,313 @@ def test_retry_succeeds_on_second_attempt():
 
     assert result is mock_resp
     assert mock_sleep.call_count == 1
+
+
+# ---------------------------------------------------------------------------
+# Async engine tests
+# ---------------------------------------------------------------------------
+
+def _mock_async_client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_afetch_rss_parses_feed():
+    source = Source(id="a-rss", name="Async Feed", url="https://example.com/feed.xml")
+    entries = [_make_feed_entry(link="https://example.com/a", title="  Async One  ")]
+
+    def handler(request):
+        return httpx.Response(200, text="<rss/>")
+
+    async def _run():
+        async with _mock_async_client(handler) as client:
+            return await afetch_rss(client, source)
+
+    with patch("fastfeedparser.parse", return_value=_make_feed_result(entries)):
+        items = asyncio.run(_run())
+
+    assert len(items) == 1
+    assert items[0].title == "Async One"
+    assert items[0].source_id == "a-rss"
+
+
+def test_afetch_hn_filters_min_points():
+    source = Source(id="hn", name="Hacker News")
+
+    def handler(request):
+        assert request.url.host == "hn.algolia.com"
+        return httpx.Response(200, json=HN_JSON)
+
+    async def _run():
+        async with _mock_async_client(handler) as client:
+            return await afetch_hn(client, source)
+
+    items = asyncio.run(_run())
+    assert {item.points for item in items} == {200, 300}
+
+
+def test_afetch_retry_backoff_does_not_block_event_loop():
+    """Failed attempts back off with asyncio.sleep, not time.sleep."""
+    source = Source(id="down", name="Down", url="https://down.example.com/feed.xml")
+
+    def handler(request):
+        raise httpx.ConnectError("refused")
+
+    async def _run():
+        async with _mock_async_client(handler) as client:
+            return await afetch_rss(client, source, retries=3)
+
+    delays: list[float] = []
+
+    async def _record_sleep(delay):
+        delays.append(delay)
+
+    with patch("herald.collect.asyncio.sleep", side_effect=_record_sleep), \
+         patch("time.sleep") as mock_time_sleep:
+        items = asyncio.run(_run())
+
+    assert items == []
+    assert delays == [1.0, 2.0]
+    mock_time_sleep.assert_not_called()
+
+
+def test_acollect_all_runs_sources_concurrently():
+    """Wall time is bounded by the slowest source, not the sum."""
+    sources = [
+        Source(id=f"s{i}", name=f"S{i}", url=f"https://host{i}.example.com/feed.xml")
+        for i in range(5)
+    ]
+
+    async def _slow_fetch(client, source, **kwargs):
+        await asyncio.sleep(0.2)
+        return [RawItem(url=f"{source.url}#x", title="T", source_id=source.id)]
+
+    with patch("herald.collect.afetch_rss", side_effect=_slow_fetch):
+        start = time.monotonic()
+        items = asyncio.run(acollect_all(sources, client=MagicMock()))
+        elapsed = time.monotonic() - start
+
+    assert [item.source_id for item in items] == ["s0", "s1", "s2", "s3", "s4"]
+    assert elapsed < 0.6
+
+
+def test_acollect_all_respects_per_host_limit():
+    """No more than per_host_limit requests hit the same host at once."""
+    sources = [
+        Source(id=f"s{i}", name=f"S{i}", url=f"https://same.example.com/feed{i}.xml")
+        for i in range(6)
+    ]
+    in_flight = 0
+    peak = 0
+
+    def handler(request):
+        return httpx.Response(200, text="<rss/>")
+
+    async def _run():
+        transport = httpx.MockTransport(handler)
+
+        class _Tracking(httpx.AsyncBaseTransport):
+            async def handle_async_request(self, request):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.05)
+                in_flight -= 1
+                return await transport.handle_async_request(request)
+
+        async with httpx.AsyncClient(transport=_Tracking()) as client:
+            return await acollect_all(
+                sources,
+                cfg=CollectConfig(max_concurrency=10, per_host_limit=2),
+                client=client,
+            )
+
+    with patch("fastfeedparser.parse", return_value=_make_feed_result([])):
+        asyncio.run(_run())
+
+    assert peak == 2
+
+
+def test_acollect_all_fault_isolation():
+    source_ok = Source(id="ok", name="OK", url="https://ok.example.com/feed.xml")
+    source_bad = Source(id="bad", name="Bad", url="https://bad.example.com/feed.xml")
+    good_item = RawItem(url="https://ok.example.com/a", title="Good", source_id="ok")
+
+    async def _fetch(client, source, **kwargs):
+        if source.id == "bad":
+            raise RuntimeError("boom")
+        return [good_item]
+
+    with patch("herald.collect.afetch_rss", side_effect=_fetch):
+        items = asyncio.run(acollect_all([source_bad, source_ok], client=MagicMock()))
+
+    assert items == [good_item]
+
+
+def test_collect_all_async_mode_uses_engine():
+    """collect_all with cfg.mode='async' delegates to acollect_all."""
+    source = Source(id="s1", name="S1", url="https://s1.example.com/feed.xml")
+    item = RawItem(url="https://s1.example.com/a", title="A", source_id="s1")
+
+    async def _fake(*args, **kwargs):
+        return [item]
+
+    with patch("herald.collect.acollect_all", side_effect=_fake) as mock_async, \
+         patch("herald.collect.fetch_rss") as mock_sync:
+        items = collect_all([source], cfg=CollectConfig(mode="async"))
+
+    assert items == [item]
+    mock_async.assert_called_once()
+    mock_sync.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# Conditional GET tests
+# ---------------------------------------------------------------------------
+
+def test_afetch_rss_sends_validators_and_skips_on_304():
+    source = Source(id="cond", name="Cond", url="https://example.com/feed.xml")
+    state = FetchState(source_id="cond", etag='"abc"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    seen_headers = {}
+
+    def handler(request):
+        seen_headers.update(request.headers)
+        return httpx.Response(304, headers={"ETag": '"abc"'})
+
+    async def _run():
+        async with _mock_async_client(handler) as client:
+            return await afetch_rss(client, source, state=state)
+
+    with patch("fastfeedparser.parse") as mock_parse:
+        items = asyncio.run(_run())
+
+    assert items == []
+    mock_parse.assert_not_called()
+    assert seen_headers["if-none-match"] == '"abc"'
+    assert seen_headers["if-modified-since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert state.fetched_at is not None
+
+
+def test_afetch_rss_records_validators_and_skips_unchanged_body():
+    source = Source(id="cond", name="Cond", url="https://example.com/feed.xml")
+    state = FetchState(source_id="cond")
+
+    def handler(request):
+        return httpx.Response(200, text="<rss/>", headers={"ETag": '"v1"', "Last-Modified": "LM"})
+
+    async def _run():
+        async with _mock_async_client(handler) as client:
+            return await afetch_rss(client, source, state=state)
+
+    entries = [_make_feed_entry(link="https://example.com/a", title="A")]
+    with patch("fastfeedparser.parse", return_value=_make_feed_result(entries)) as mock_parse:
+        first = asyncio.run(_run())
+        second = asyncio.run(_run())
+
+    assert len(first) == 1
+    assert second == []
+    assert mock_parse.call_count == 1
+    assert state.etag == '"v1"'
+    assert state.last_modified == "LM"
+    assert state.body_hash is not None
+
+
+def test_collect_all_creates_state_for_rss_sources():
+    source = Source(id="blog", name="Blog", url="https://blog.example.com/feed.xml")
+    fetch_state: dict[str, FetchState] = {}
+
+    with patch("herald.collect.fetch_rss", return_value=[]) as mock_rss:
+        collect_all([source], fetch_state=fetch_state)
+
+    assert fetch_state["blog"].source_id == "blog"
+    mock_rss.assert_called_once_with(source, state=fetch_state["blog"])
+
+
+# ---------------------------------------------------------------------------
+# Streaming download tests
+# ---------------------------------------------------------------------------
+
+def test_afetch_rss_rejects_oversized_content_length():
+    source = Source(id="big", name="Big", url="https://example.com/huge.xml")
+
+    def handler(request):
+        return httpx.Response(200, headers={"Content-Length": str(11 * 1024 * 1024)}, content=b"")
+
+    async def _run():
+        async with _mock_async_client(handler) as client:
+            return await afetch_rss(client, source)
+
+    with patch("fastfeedparser.parse") as mock_parse:
+        items = asyncio.run(_run())
+
+    assert items == []
+    mock_parse.assert_not_called()
+
+
+def test_collect_all_reports_peak_rss(capsys):
+    with patch("herald.collect.fetch_rss", return_value=[]):
+        collect_all([Source(id="s", name="S", url="https://s.example.com/feed.xml")])
+
+    assert "peak RSS" in capsys.readouterr().err
+
+
+def test_fetch_log_records_retries_status_and_yield():
+    source = Source(id="blog", name="Blog", url="https://example.com/feed.xml")
+    entries = [_make_feed_entry(link=f"https://example.com/{i}", title=f"Post {i}") for i in range(3)]
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, content=b"<rss>feed</rss>")
+
+    log = FetchLog(source_id="blog")
+    with (
+        httpx.Client(transport=httpx.MockTransport(handler)) as client,
+        patch("time.sleep"),
+        patch("fastfeedparser.parse", return_value=_make_feed_result(entries)),
+    ):
+        items = _collect_sequential([source], None, None, None, {"client": client}, {"blog": log})
+
+    assert len(items) == 3
+    assert log.status == 200
+    assert log.retries == 1
+    assert log.bytes == len(b"<rss>feed</rss>")
+    assert log.items_parsed == 3
+    assert log.error is None
+
+
+def test_fetch_log_records_final_error():
+    source = Source(id="hn", name="Hacker News")
+
+    def handler(request):
+        return httpx.Response(500)
+
+    log = FetchLog(source_id="hn")
+
+    async def _run():
+        async with _mock_async_client(handler) as client:
+            return await afetch_hn(client, source, retries=2, log=log)
+
+    with patch("asyncio.sleep", new=_no_sleep):
+        items = asyncio.run(_run())
+
+    assert items == []
+    assert log.status == 500
+    assert log.retries == 1
+    assert "500" in log.error
+
+
+async def _no_sleep(_delay):
+    return None
+
+
+def test_collect_all_logs_only_known_sources():
+    sources = [Source(id="a", name="A", url="https://a.example/feed"), Source(id="b", name="B", url="https://b.example/feed")]
+    logs = {"a": FetchLog(source_id="a")}
+    with patch("herald.collect.fetch_rss", return_value=[]) as mock_rss:
+        collect_all(sources, fetch_log=logs)
+
+    assert mock_rss.call_args_list[0].kwargs == {"log": logs["a"]}
+    assert mock_rss.call_args_list[1].kwargs == {}
+    assert list(logs) == ["a"]
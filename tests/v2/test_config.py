@@ -54,6 +54,37 @@ clustering:
     assert cfg.clustering.canonical_delta == 0.1  # default
 
 
+def test_clustering_candidate_index():
+    yaml_str = """
+clustering:
+  candidate_index: lsh
+  lsh_bands: 16
+  lsh_rows: 4
+"""
+    cfg = load_config_from_string(yaml_str)
+    assert cfg.clustering.candidate_index == "lsh"
+    assert cfg.clustering.min_token_overlap == 2  # default
+    assert cfg.clustering.lsh_bands == 16
+    assert cfg.clustering.lsh_rows == 4
+    assert load_config_from_string("").clustering.candidate_index == "brute"
+
+
+def test_database_section():
+    yaml_str = """
+database:
+  profile: read-mostly
+  cache_size_mb: 32
+  maintenance_every_runs: 0
+"""
+    cfg = load_config_from_string(yaml_str)
+    assert cfg.database.profile == "read-mostly"
+    assert cfg.database.bulk_profile == "bulk-load"  # default
+    assert cfg.database.cache_size_mb == 32
+    assert cfg.database.synchronous is None
+    assert cfg.database.maintenance_every_runs == 0
+    assert load_config_from_string("").database.profile == "default"
+
+
 def test_clustering_defaults():
     cfg = load_config_from_string("")
     assert cfg.clustering == ClusterConfig()
@@ -103,3 +134,37 @@ topics:
     assert cfg.clustering.threshold == 0.7
     assert cfg.schedule.interval_hours == 6
     assert cfg.topics["test"] == ["keyword1"]
+
+
+def test_collect_config_defaults_and_overrides():
+    cfg = load_config_from_string("")
+    assert cfg.collect.mode == "async"
+    assert cfg.collect.max_concurrency == 16
+    assert cfg.collect.per_host_limit == 2
+    assert cfg.collect.http2 is False
+
+    cfg = load_config_from_string("collect:\n  http2: true\n  max_connections: 8\n")
+    assert cfg.collect.http2 is True
+    assert cfg.collect.max_connections == 8
+
+    cfg = load_config_from_string("collect:\n  mode: sync\n  max_concurrency: 4\n")
+    assert cfg.collect.mode == "sync"
+    assert cfg.collect.max_concurrency == 4
+    assert cfg.collect.per_host_limit == 2
+
+
+def test_retention_config_defaults_and_overrides():
+    cfg = load_config_from_string("")
+    assert cfg.retention.inactive_story_days == 0
+    assert cfg.retention.archive is False
+    assert not cfg.retention.enabled
+
+    cfg = load_config_from_string("retention:\n  inactive_story_days: 90\n  archive: true\n")
+    assert cfg.retention.inactive_story_days == 90
+    assert cfg.retention.archive is True
+    assert cfg.retention.batch_size == 200
+    assert cfg.retention.enabled
+
+    cfg = load_config_from_string("retention:\n  move_to_archive_days: 30\n")
+    assert cfg.retention.move_to_archive_days == 30
+    assert cfg.retention.enabled
@@ -0,0 +1,104 @@
+"""Tests for herald/counters.py and the counter triggers of migration 0006."""
+from __future__ import annotations
+
+import herald.db as db_mod
+from herald.cluster import cluster, deactivate_stale
+from herald.config import ClusterConfig
+from herald.counters import counter, counters, recompute_counters
+from herald.db import Database
+from herald.ingest import ingest_items
+from herald.models import RawItem, Source
+from herald.query import status_summary
+
+SOURCES = {
+    "hn": Source(id="hn", name="Hacker News", weight=0.5),
+    "blog": Source(id="blog", name="Blog", weight=0.3),
+}
+
+
+def _make_db(tmp_path) -> Database:
+    db = Database(tmp_path / "test.db")
+    for src in SOURCES.values():
+        db.execute("INSERT INTO sources (id, name, weight) VALUES (?, ?, ?)", (src.id, src.name, src.weight))
+    return db
+
+
+def _snapshot(db: Database) -> dict:
+    return {
+        scope: counters(db, scope)
+        for scope in ("table", "source", "story_status", "article_topic", "story_topic")
+    }
+
+
+def _recomputed(db: Database) -> dict:
+    with db.transaction():
+        recompute_counters(db)
+    return _snapshot(db)
+
+
+def test_triggers_track_ingest_cluster_and_deletes(tmp_path):
+    db = _make_db(tmp_path)
+    items = [
+        RawItem(url="https://a.com/1", title="Rust compiler gets faster builds", source_id="hn"),
+        RawItem(url="https://a.com/2", title="Rust compiler gets faster builds today", source_id="blog"),
+        RawItem(url="https://a.com/3", title="Python packaging survey results", source_id="blog"),
+        RawItem(url="https://a.com/1", title="Rust compiler gets faster builds", source_id="blog"),
+    ]
+    ingest_items(db, items, SOURCES, topic_rules={"rust": ["rust"], "python": ["python"]})
+    cluster(db)
+
+    snap = _snapshot(db)
+    assert snap["table"] == {"articles": 3, "mentions": 4, "story_articles": 3, "stories": 2}
+    assert snap["source"] == {"blog": 2, "hn": 1}
+    assert snap["story_status"] == {"active": 2}
+    assert snap["article_topic"] == {"rust": 2, "python": 1}
+    assert snap["story_topic"] == {"python": 1, "rust": 1}
+    assert snap == _recomputed(db)
+
+    db.execute("UPDATE stories SET last_updated = 0 WHERE title LIKE 'Python%'")
+    deactivate_stale(db, ClusterConfig())
+    assert counters(db, "story_status") == {"active": 1, "inactive": 1}
+
+    # Cascades from deleting an article fire the child tables' triggers
+    db.execute("DELETE FROM articles WHERE url_canonical = 'https://a.com/1'")
+    assert counter(db, "table", "articles") == 2
+    assert counter(db, "table", "mentions") == 2
+    assert counter(db, "source", "hn") == 0
+    assert counters(db, "article_topic") == {"python": 1, "rust": 1}
+    assert _snapshot(db) == _recomputed(db)
+    db.close()
+
+
+def test_migration_backfills_existing_rows(tmp_path, monkeypatch):
+    db_path = tmp_path / "old.db"
+    # A database from before counters existed (migrations 0001-0005)
+    files = db_mod._migration_files()
+    monkeypatch.setattr(db_mod, "_migration_files", lambda: files[:5])
+    with Database(db_path) as db:
+        db.execute("INSERT INTO sources (id, name) VALUES ('hn', 'HN')")
+        for i in range(3):
+            db.execute(
+                """INSERT INTO articles (id, url_original, url_canonical, title, origin_source_id,
+                                         collected_at, score_base, scored_at)
+                   VALUES (?, ?, ?, 't', 'hn', 0, 0, 0)""",
+                (f"a{i}", f"u{i}", f"u{i}"),
+            )
+    monkeypatch.undo()
+
+    with Database(db_path) as db:
+        assert counter(db, "table", "articles") == 3
+        assert counters(db, "source") == {"hn": 3}
+        assert counter(db, "story_status", "active") == 0
+
+
+def test_status_counts_do_not_scan(tmp_path):
+    db = _make_db(tmp_path)
+    ingest_items(db, [RawItem(url="https://a.com/1", title="One", source_id="hn")], SOURCES)
+    statements: list[str] = []
+    db._conn.set_trace_callback(statements.append)
+    status = status_summary(db)
+    db._conn.set_trace_callback(None)
+
+    assert status["articles"] == 1
+    assert not any("COUNT(" in sql.upper() for sql in statements)
+    db.close()
@@ -0,0 +1,122 @@
+"""Tests for herald/daemon.py — long-running pipeline scheduler."""
+from __future__ import annotations
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from herald.daemon import Daemon
+from herald.pipeline import PipelineResult
+
+
+class _FakeClock:
+    """Clock plus stop event whose wait() advances time instead of sleeping."""
+
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+        self.waits: list[float] = []
+        self._set = False
+
+    def __call__(self) -> float:
+        return self.now
+
+    def is_set(self) -> bool:
+        return self._set
+
+    def set(self) -> None:
+        self._set = True
+
+    def wait(self, timeout: float) -> bool:
+        self.waits.append(timeout)
+        self.now += timeout
+        return self._set
+
+
+def _write_config(path, text: str, mtime_ns: int) -> None:
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    _write_config(tmp_path / "config.yaml", "sources: []\nschedule:\n  interval_hours: 2\n", 10**18)
+    return tmp_path
+
+
+def test_runs_reuse_db_session_and_warm_state(data_dir):
+    clock = _FakeClock()
+    calls = []
+
+    def fake_run(config, db, **kwargs):
+        calls.append((db, kwargs["http_session"], kwargs["warm"]))
+        return PipelineResult(run_id=len(calls))
+
+    with patch("herald.daemon.run_pipeline", side_effect=fake_run):
+        with Daemon(data_dir, stop=clock, clock=clock) as daemon:
+            daemon.serve(max_runs=3)
+
+    assert len(calls) == 3
+    assert len({id(c[0]) for c in calls}) == 1
+    assert len({id(c[1]) for c in calls}) == 1
+    assert len({id(c[2]) for c in calls}) == 1
+    # Two 2-hour gaps, waited out in config-poll sized steps
+    assert sum(clock.waits) == pytest.approx(2 * 2 * 3600)
+
+
+def test_failed_run_does_not_stop_daemon(data_dir, capsys):
+    clock = _FakeClock()
+    with patch("herald.daemon.run_pipeline", side_effect=[RuntimeError("boom"), PipelineResult(run_id=2)]) as run:
+        with Daemon(data_dir, stop=clock, clock=clock) as daemon:
+            daemon.serve(max_runs=2)
+
+    assert run.call_count == 2
+    assert "run failed: boom" in capsys.readouterr().err
+
+
+def test_reloads_config_when_mtime_changes(data_dir, capsys):
+    with Daemon(data_dir) as daemon:
+        session = daemon.session
+        assert daemon.reload_config_if_changed() is False
+
+        _write_config(
+            data_dir / "config.yaml",
+            "sources: []\nschedule:\n  interval_hours: 6\ncollect:\n  max_concurrency: 4\n",
+            10**18 + 1,
+        )
+        assert daemon.reload_config_if_changed() is True
+        assert daemon.config.schedule.interval_hours == 6
+        # Collect settings changed, so the HTTP pool was rebuilt
+        assert daemon.session is not session
+
+        _write_config(data_dir / "config.yaml", "sources: [\n", 10**18 + 2)
+        assert daemon.reload_config_if_changed() is False
+        assert daemon.config.schedule.interval_hours == 6
+
+    assert "keeping previous config" in capsys.readouterr().err
+
+
+def test_adaptive_wakes_when_earliest_source_is_due(data_dir):
+    _write_config(
+        data_dir / "config.yaml",
+        "sources:\n"
+        "  - {id: a, name: A, url: 'https://a.example/feed'}\n"
+        "  - {id: b, name: B, url: 'https://b.example/feed'}\n"
+        "schedule:\n  adaptive: true\n  min_interval_minutes: 15\n",
+        10**18 + 1,
+    )
+    clock = _FakeClock()
+    with Daemon(data_dir, clock=clock) as daemon:
+        assert daemon.next_run_at() == clock.now  # never run yet
+
+        daemon.last_started = clock.now
+        # A source that was never polled is due at once, within the minimum gap
+        assert daemon.next_run_at() == clock.now + 15 * 60
+
+        for source_id, due in (("a", clock.now + 7200), ("b", clock.now + 3600)):
+            daemon.db.execute("INSERT INTO sources (id, name) VALUES (?, ?)", (source_id, source_id))
+            daemon.db.execute(
+                "INSERT INTO source_schedule (source_id, interval_secs, next_due_at, polled_at) VALUES (?, 0, ?, 0)",
+                (source_id, int(due)),
+            )
+        assert daemon.next_run_at() == clock.now + 3600 - 300
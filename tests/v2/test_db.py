@@ -6,7 +6,8 @@ from pathlib import Path
 
 import pytest
 
-from herald.db import Database
+import herald.db as db_mod
+from herald.db import PROFILES, Database, DbProfile, resolve_profile, schema_version
 
 
 @pytest.fixture
@@ -62,11 +63,11 @@ def test_database_transaction(db):
     with db.transaction():
         db.execute(
             "INSERT INTO articles "
-            "(id, url_original, url_canonical, title, origin_source_id, "
+            "(ulid, url_original, url_canonical, title, origin_source_id, "
             " collected_at, score_base, scored_at, story_type) "
             "VALUES ('a1', 'http://x.com', 'http://x.com', 'T', 's1', 1000, 0.5, 1000, 'news')"
         )
-    row = db.execute("SELECT id FROM articles WHERE id='a1'").fetchone()
+    row = db.execute("SELECT id FROM articles WHERE ulid='a1'").fetchone()
     assert row is not None, "article should be committed"
 
 
@@ -76,12 +77,12 @@ def test_database_transaction_rollback(db):
         with db.transaction():
             db.execute(
                 "INSERT INTO articles "
-                "(id, url_original, url_canonical, title, origin_source_id, "
+                "(ulid, url_original, url_canonical, title, origin_source_id, "
                 " collected_at, score_base, scored_at, story_type) "
                 "VALUES ('a2', 'http://y.com', 'http://y.com', 'U', 's2', 2000, 0.3, 2000, 'news')"
             )
             raise RuntimeError("forced rollback")
-    row = db.execute("SELECT id FROM articles WHERE id='a2'").fetchone()
+    row = db.execute("SELECT id FROM articles WHERE ulid='a2'").fetchone()
     assert row is None, "article should have been rolled back"
 
 
@@ -89,7 +90,7 @@ def test_fts5_available(db):
     db.execute("INSERT INTO sources (id, name, weight) VALUES ('s3', 'FTS Src', 0.4)")
     db.execute(
         "INSERT INTO articles "
-        "(id, url_original, url_canonical, title, origin_source_id, "
+        "(ulid, url_original, url_canonical, title, origin_source_id, "
         " collected_at, score_base, scored_at, story_type) "
         "VALUES ('a3', 'http://z.com', 'http://z.com', 'Python Releases 3.14', 's3', 3000, 0.4, 3000, 'release')"
     )
@@ -124,7 +125,7 @@ def test_database_foreign_key_enforcement(db):
     with pytest.raises(sqlite3.IntegrityError):
         db.execute(
             "INSERT INTO story_articles (story_id, article_id) "
-            "VALUES ('nonexistent_story', 'nonexistent_article')"
+            "VALUES (404, 404)"
         )
 
 
@@ -135,3 +136,322 @@ def test_database_context_manager(tmp_path):
         db.execute("INSERT INTO sources (id, name, weight) VALUES ('s1', 'Src', 0.5)")
         row = db.execute("SELECT id FROM sources WHERE id='s1'").fetchone()
         assert row is not None
+
+
+# Versioned migrations (PRAGMA user_version)
+
+def test_database_records_schema_version(db):
+    assert schema_version() >= 1
+    assert db.execute("PRAGMA user_version").fetchone()[0] == schema_version()
+
+
+def test_database_reopen_skips_migrations(tmp_path, monkeypatch):
+    db_path = tmp_path / "fast.db"
+    Database(db_path).close()
+
+    def _boom(current):
+        raise AssertionError("migrations must not run when the version matches")
+
+    monkeypatch.setattr(db_mod, "_pending_migrations", _boom)
+    with Database(db_path) as d:
+        assert d.execute("PRAGMA user_version").fetchone()[0] == schema_version()
+
+
+def test_database_upgrades_unversioned_database(tmp_path):
+    """A database created before versioning (user_version 0) upgrades in place."""
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("CREATE TABLE sources (id TEXT PRIMARY KEY, name TEXT NOT NULL, url TEXT, weight REAL NOT NULL DEFAULT 0.2, category TEXT)")
+    conn.execute("INSERT INTO sources (id, name, weight) VALUES ('s1', 'Src', 0.5)")
+    conn.commit()
+    conn.close()
+
+    with Database(db_path) as d:
+        assert d.execute("PRAGMA user_version").fetchone()[0] == schema_version()
+        assert d.execute("SELECT name FROM sources WHERE id = 's1'").fetchone()[0] == "Src"
+        assert d.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 0
+
+
+def test_database_applies_only_newer_migrations(tmp_path, monkeypatch):
+    db_path = tmp_path / "step.db"
+    Database(db_path).close()
+    base = schema_version()
+    extra = tmp_path / f"{base + 1:04d}_add_note.sql"
+    extra.write_text(
+        "-- add a column\nALTER TABLE sources ADD COLUMN note TEXT;\n"
+        "CREATE TRIGGER t_note AFTER INSERT ON sources BEGIN\n"
+        "    UPDATE sources SET note = 'x' WHERE id = new.id;\nEND;\n"
+    )
+    files = db_mod._migration_files() + ((base + 1, extra),)
+    monkeypatch.setattr(db_mod, "_migration_files", lambda: files)
+
+    with Database(db_path) as d:
+        assert d.execute("PRAGMA user_version").fetchone()[0] == base + 1
+        d.execute("INSERT INTO sources (id, name, weight) VALUES ('s1', 'Src', 0.5)")
+        assert d.execute("SELECT note FROM sources").fetchone()[0] == "x"
+    with Database(db_path) as d:  # second open: nothing re-applied
+        assert d.execute("PRAGMA user_version").fetchone()[0] == base + 1
+
+
+def test_database_failed_migration_rolls_back(tmp_path, monkeypatch):
+    db_path = tmp_path / "bad.db"
+    Database(db_path).close()
+    base = schema_version()
+    bad = tmp_path / f"{base + 1:04d}_broken.sql"
+    bad.write_text("CREATE TABLE half_done (x);\nSELECT * FROM no_such_table;\n")
+    files = db_mod._migration_files() + ((base + 1, bad),)
+    monkeypatch.setattr(db_mod, "_migration_files", lambda: files)
+
+    with pytest.raises(sqlite3.OperationalError):
+        Database(db_path)
+
+    conn = sqlite3.connect(str(db_path))
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == base
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'half_done'").fetchone()[0] == 0
+    conn.close()
+
+
+def test_database_newer_schema_rejected(tmp_path):
+    db_path = tmp_path / "future.db"
+    Database(db_path).close()
+    conn = sqlite3.connect(str(db_path))
+    conn.execute(f"PRAGMA user_version = {schema_version() + 5}")
+    conn.close()
+
+    with pytest.raises(RuntimeError, match="newer"):
+        Database(db_path)
+
+
+def test_integer_key_migration_keeps_links_and_fts(tmp_path, monkeypatch):
+    db_path = tmp_path / "v9.db"
+    # A database from before integer keys (migrations 0001-0009): ULID TEXT ids
+    files = db_mod._migration_files()
+    monkeypatch.setattr(db_mod, "_migration_files", lambda: files[:9])
+    with Database(db_path) as d:
+        d.execute("INSERT INTO sources (id, name, weight) VALUES ('s1', 'Src', 0.5)")
+        for n, title in enumerate(["Rust compiler news", "Python release notes"]):
+            d.execute(
+                """
+                INSERT INTO articles
+                    (id, url_original, url_canonical, title, origin_source_id,
+                     collected_at, score_base, scored_at)
+                VALUES (?, ?, ?, ?, 's1', 1, 0.5, 1)
+                """,
+                (f"A{n}", f"http://x.com/{n}", f"http://x.com/{n}", title),
+            )
+            d.execute(
+                "INSERT INTO mentions (article_id, source_id, url, discovered_at) VALUES (?, 's1', 'u', 1)",
+                (f"A{n}",),
+            )
+            d.execute("INSERT INTO article_topics (article_id, topic) VALUES (?, 'lang')", (f"A{n}",))
+        d.execute(
+            """
+            INSERT INTO stories (id, title, score, canonical_article_id, first_seen, last_updated)
+            VALUES ('S0', 'Rust compiler news', 1, 'A0', 1, 1)
+            """
+        )
+        d.execute("INSERT INTO story_articles (story_id, article_id) VALUES ('S0', 'A0')")
+        d.execute("INSERT INTO story_topics (story_id, topic) VALUES ('S0', 'lang')")
+        d.execute("INSERT INTO story_lsh (scheme, bucket, story_id) VALUES ('b1r1', 7, 'S0')")
+    monkeypatch.undo()
+
+    with Database(db_path) as d:
+        assert tuple(d.execute("SELECT typeof(id), ulid FROM stories").fetchone()) == ("integer", "S0")
+        assert tuple(d.execute(
+            """
+            SELECT a.ulid, c.ulid FROM stories s
+            JOIN story_articles sa ON sa.story_id = s.id
+            JOIN articles a ON a.id = sa.article_id
+            JOIN articles c ON c.id = s.canonical_article_id
+            """
+        ).fetchone()) == ("A0", "A0")
+        for table in ("mentions", "article_topics", "story_topics", "story_lsh"):
+            assert d.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] > 0
+        assert d.execute("PRAGMA foreign_key_check").fetchall() == []
+
+        # FTS rows still point at the right articles, without a rebuild
+        d.execute("INSERT INTO articles_fts(articles_fts, rank) VALUES ('integrity-check', 1)")
+        assert [r[0] for r in d.execute(
+            "SELECT a.ulid FROM articles_fts f JOIN articles a ON a.id = f.rowid WHERE articles_fts MATCH 'python'"
+        )] == ["A1"]
+
+        # Triggers are back and new ids continue after the migrated ones
+        new_id = d.execute(
+            """
+            INSERT INTO articles
+                (ulid, url_original, url_canonical, title, origin_source_id,
+                 collected_at, score_base, scored_at)
+            VALUES ('A2', 'http://x.com/2', 'http://x.com/2', 'Go generics', 's1', 1, 0.5, 1)
+            """
+        ).lastrowid
+        assert new_id == 3
+        assert d.execute("SELECT value FROM counters WHERE scope = 'table' AND key = 'articles'").fetchone()[0] == 3
+        assert d.execute("SELECT COUNT(*) FROM articles_fts WHERE articles_fts MATCH 'generics'").fetchone()[0] == 1
+        d.execute("DELETE FROM articles WHERE ulid = 'A0'")
+        assert d.execute("SELECT canonical_article_id FROM stories").fetchone()[0] is None
+        assert d.execute("SELECT COUNT(*) FROM mentions").fetchone()[0] == 1
+
+
+def test_read_only_database_rejects_writes_and_stale_schema(tmp_path):
+    db_path = tmp_path / "ro.db"
+    Database(db_path).close()
+
+    ro = Database(db_path, read_only=True)
+    assert ro.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 0
+    with pytest.raises(sqlite3.OperationalError, match="readonly"):
+        ro.execute("INSERT INTO sources (id, name) VALUES ('x', 'X')")
+    ro.close()
+
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA user_version = 1")
+    conn.close()
+    with pytest.raises(RuntimeError, match="schema version 1"):
+        Database(db_path, read_only=True)
+    with pytest.raises(FileNotFoundError):
+        Database(tmp_path / "missing.db", read_only=True)
+
+
+# Performance profiles
+
+def _pragma(d: Database, name: str):
+    return d.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def test_database_default_profile_applied(db):
+    assert _pragma(db, "synchronous") == 1  # NORMAL
+    assert _pragma(db, "cache_size") == -16 * 1024
+    assert _pragma(db, "temp_store") == 2  # MEMORY
+
+
+def test_database_named_profile(tmp_path):
+    with Database(tmp_path / "ro.db", profile=PROFILES["read-mostly"]) as d:
+        assert _pragma(d, "cache_size") == -64 * 1024
+
+
+def test_resolve_profile_overrides_and_rejects_unknown():
+    p = resolve_profile("bulk-load", cache_size_mb=8, synchronous=None)
+    assert p.cache_size_mb == 8
+    assert p.wal_autocheckpoint == 0
+    with pytest.raises(ValueError, match="Unknown database profile"):
+        resolve_profile("turbo")
+
+
+def test_database_invalid_pragma_value_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        Database(tmp_path / "bad.db", profile=DbProfile(synchronous="SOMETIMES"))
+
+
+def test_use_profile_restores_base(db):
+    with db.use_profile(PROFILES["bulk-load"]):
+        assert _pragma(db, "wal_autocheckpoint") == 0
+        assert _pragma(db, "cache_size") == -128 * 1024
+    assert _pragma(db, "wal_autocheckpoint") == 1000
+    assert _pragma(db, "cache_size") == -16 * 1024
+
+
+def test_maintain_truncates_wal(tmp_path):
+    db_path = tmp_path / "wal.db"
+    with Database(db_path) as d:
+        with d.use_profile(PROFILES["bulk-load"]):
+            d.execute("INSERT INTO sources (id, name, weight) VALUES ('s1', 'Src', 0.5)")
+        d.maintain()
+        wal = tmp_path / "wal.db-wal"
+        assert not wal.exists() or wal.stat().st_size == 0
+
+
+# Column-scoped FTS triggers and FTS maintenance
+
+def _insert_article(d: Database, title: str = "Python release notes") -> None:
+    d.execute("INSERT OR IGNORE INTO sources (id, name, weight) VALUES ('s1', 'Src', 0.5)")
+    d.execute(
+        """
+        INSERT INTO articles
+            (ulid, url_original, url_canonical, title, origin_source_id,
+             collected_at, score_base, scored_at)
+        VALUES ('a1', 'http://x.com/1', 'http://x.com/1', ?, 's1', 1, 0.5, 1)
+        """,
+        (title,),
+    )
+
+
+def _fts_bytes(d: Database, table: str) -> int:
+    return d.execute(f"SELECT SUM(length(block)) FROM {table}_data").fetchone()[0]
+
+
+def test_fts_untouched_by_score_updates(db):
+    _insert_article(db)
+    before = _fts_bytes(db, "articles_fts")
+    db.execute("UPDATE articles SET points = 99, score_base = 2.0, scored_at = 5 WHERE ulid = 'a1'")
+    assert _fts_bytes(db, "articles_fts") == before
+
+    db.execute(
+        "INSERT INTO stories (ulid, title, score, first_seen, last_updated) VALUES ('s1', 'Rust news', 1, 1, 1)"
+    )
+    before = _fts_bytes(db, "stories_fts")
+    db.execute("UPDATE stories SET score = 3.0, last_updated = 9 WHERE ulid = 's1'")
+    assert _fts_bytes(db, "stories_fts") == before
+
+
+def test_fts_follows_title_and_summary_changes(db):
+    _insert_article(db)
+    db.execute("UPDATE articles SET title = 'Rust compiler news' WHERE ulid = 'a1'")
+    match = lambda q: db.execute(
+        "SELECT COUNT(*) FROM articles_fts WHERE articles_fts MATCH ?", (q,)
+    ).fetchone()[0]
+    assert match("rust") == 1
+    assert match("python") == 0
+
+    db.execute(
+        "INSERT INTO stories (ulid, title, score, first_seen, last_updated) VALUES ('s1', 'Rust news', 1, 1, 1)"
+    )
+    db.execute("UPDATE stories SET summary = 'borrow checker' WHERE ulid = 's1'")
+    rows = db.execute("SELECT COUNT(*) FROM stories_fts WHERE stories_fts MATCH 'borrow'").fetchone()[0]
+    assert rows == 1
+
+
+def test_optimize_fts_keeps_index_consistent(db):
+    _insert_article(db)
+    for i in range(5):
+        db.execute("UPDATE articles SET title = ? WHERE ulid = 'a1'", (f"Python release {i}",))
+    db.optimize_fts()
+    db.execute("INSERT INTO articles_fts(articles_fts, rank) VALUES ('integrity-check', 1)")
+    assert db.execute(
+        "SELECT COUNT(*) FROM articles_fts WHERE articles_fts MATCH 'release'"
+    ).fetchone()[0] == 1
+
+
+
+def _churn(d: Database) -> None:
+    """Grow the file by ~2 MB, then free those pages again."""
+    d.execute(
+        "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 500) "
+        "INSERT INTO filler SELECT zeroblob(4000) FROM n"
+    )
+    d.execute("DELETE FROM filler")
+
+
+def test_compact_converts_old_database_then_vacuums_incrementally(tmp_path):
+    db_path = tmp_path / "old.db"
+    # A file created before auto_vacuum=INCREMENTAL was set at creation
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE filler (x)")
+    conn.close()
+
+    with Database(db_path) as d:
+        assert _pragma(d, "auto_vacuum") == 0
+        _churn(d)
+        before, after = d.compact()
+        assert _pragma(d, "auto_vacuum") == 2
+        assert after < before / 5
+
+        _insert_article(d)
+        _churn(d)
+        assert _pragma(d, "freelist_count") > 0
+        d.compact()
+        assert _pragma(d, "freelist_count") == 0
+        assert d.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+
+
+def test_new_database_uses_incremental_auto_vacuum(db):
+    assert _pragma(db, "auto_vacuum") == 2
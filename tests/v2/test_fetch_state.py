@@ -0,0 +1,66 @@
+"""Tests for herald/fetch_state.py — conditional-GET state persistence."""
+from __future__ import annotations
+
+import pytest
+
+from herald.db import Database
+from herald.fetch_state import load_fetch_state, save_fetch_log, save_fetch_state
+from herald.models import FetchLog, FetchState
+
+
+@pytest.fixture
+def db(tmp_path):
+    d = Database(tmp_path / "test.db")
+    d.execute("INSERT INTO sources (id, name, weight) VALUES ('s1', 'Src', 0.5)")
+    d.execute("INSERT INTO sources (id, name, weight) VALUES ('s2', 'Other', 0.5)")
+    yield d
+    d.close()
+
+
+def test_load_empty(db):
+    assert load_fetch_state(db) == {}
+
+
+def test_save_and_load_roundtrip(db):
+    states = {
+        "s1": FetchState(source_id="s1", etag='"e1"', last_modified="LM", body_hash="h1", fetched_at=100),
+    }
+    save_fetch_state(db, states)
+
+    loaded = load_fetch_state(db)
+    assert loaded == states
+
+
+def test_save_upserts_existing_row(db):
+    save_fetch_state(db, {"s1": FetchState(source_id="s1", etag='"old"', fetched_at=100)})
+    save_fetch_state(db, {"s1": FetchState(source_id="s1", etag='"new"', body_hash="h", fetched_at=200)})
+
+    loaded = load_fetch_state(db)
+    assert loaded["s1"].etag == '"new"'
+    assert loaded["s1"].body_hash == "h"
+    assert loaded["s1"].fetched_at == 200
+
+
+def test_save_skips_never_fetched_state(db):
+    save_fetch_state(db, {"s2": FetchState(source_id="s2")})
+    assert load_fetch_state(db) == {}
+
+
+def test_save_fetch_log_rows(db):
+    run_id = db.execute("INSERT INTO pipeline_runs (started_at) VALUES (0)").lastrowid
+    logs = {
+        "s1": FetchLog(source_id="s1", status=200, bytes=512, total_ms=40.0, items_parsed=5, items_new=2),
+        "s2": FetchLog(source_id="s2", retries=2, error="timed out"),
+    }
+    save_fetch_log(db, run_id, logs)
+
+    rows = {
+        r["source_id"]: r
+        for r in db.execute("SELECT * FROM source_fetch_log WHERE run_id = ?", (run_id,))
+    }
+    assert rows["s1"]["status"] == 200
+    assert rows["s1"]["bytes"] == 512
+    assert (rows["s1"]["items_parsed"], rows["s1"]["items_new"]) == (5, 2)
+    assert rows["s2"]["status"] is None
+    assert rows["s2"]["retries"] == 2
+    assert rows["s2"]["error"] == "timed out"
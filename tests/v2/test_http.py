@@ -0,0 +1,141 @@
+"""Tests for herald/http.py — shared pooled HTTP session."""
+from __future__ import annotations
+
+import sys
+import threading
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+if "fastfeedparser" not in sys.modules:
+    _ffp = types.ModuleType("fastfeedparser")
+    _ffp.parse = MagicMock()  # type: ignore[attr-defined]
+    sys.modules["fastfeedparser"] = _ffp
+
+from herald.collect import collect_all  # noqa: E402
+from herald.config import CollectConfig
+from herald.http import ConnectionStats, HttpSession, build_client
+from herald.models import FetchLog, Source
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_stats_since_and_summary():
+    stats = ConnectionStats(requests=5, connections_opened=2)
+    before = stats.snapshot()
+    stats.requests += 3
+    stats.connections_opened += 1
+
+    delta = stats.since(before)
+    assert delta.requests == 3
+    assert delta.connections_opened == 1
+    assert delta.reused == 2
+    assert "3 requests" in delta.summary()
+
+
+def test_sync_client_reuses_keepalive_connection(local_server):
+    stats = ConnectionStats()
+    with build_client(CollectConfig(), stats=stats) as client:
+        for i in range(3):
+            assert client.get(f"{local_server}/feed{i}").status_code == 200
+
+    assert stats.requests == 3
+    assert stats.connections_opened == 1
+    assert stats.reused == 2
+
+
+def test_session_reuses_connections_across_runs(local_server):
+    with HttpSession(CollectConfig()) as session:
+        for _ in range(2):
+            resp = session.run(session.client.get(f"{local_server}/feed"))
+            assert resp.status_code == 200
+
+        assert session.stats.requests == 2
+        assert session.stats.connections_opened == 1
+
+
+def test_fetch_log_times_new_connections_only(local_server):
+    sources = [
+        Source(id=f"f{i}", name=f"Feed {i}", url=f"{local_server}/feed{i}") for i in range(2)
+    ]
+    logs = {s.id: FetchLog(source_id=s.id) for s in sources}
+
+    with HttpSession(CollectConfig()) as session:
+        collect_all(sources, cfg=CollectConfig(), session=session, fetch_log=logs)
+        # The stats hook still sees connection events alongside the per-source trace
+        assert session.stats.connections_opened >= 1
+
+    for log in logs.values():
+        assert log.status == 200
+        assert log.bytes == 2
+        assert log.total_ms > 0
+    # Both feeds are on one host: at most one of them paid for a new connection
+    # when the pool reused it; every opened connection was timed.
+    assert sum(log.connect_ms > 0 for log in logs.values()) == session.stats.connections_opened
+
+
+def test_session_accepts_mock_transport():
+    seen = []
+
+    def handler(request):
+        seen.append(str(request.url))
+        return httpx.Response(200, json={"hits": []})
+
+    with HttpSession(CollectConfig(), transport=httpx.MockTransport(handler)) as session:
+        items = collect_all(
+            [Source(id="hn", name="Hacker News")],
+            adapter_map={"hn": "hn"},
+            cfg=CollectConfig(),
+            session=session,
+        )
+        assert session.stats.requests == 1
+
+    assert items == []
+    assert seen and "hn.algolia.com" in seen[0]
+
+
+def test_session_runs_without_asyncio_runner(monkeypatch):
+    # asyncio.Runner is 3.11+; setup.sh still accepts 3.10
+    monkeypatch.delattr("asyncio.Runner", raising=False)
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, text="ok"))
+    session = HttpSession(CollectConfig(), transport=transport)
+
+    async def fetch():
+        return (await session.client.get("https://example.com/")).text
+
+    assert [session.run(fetch()) for _ in range(2)] == ["ok", "ok"]
+    session.close()
+    session.close()
+
+
+def test_http2_falls_back_without_h2(capsys):
+    with patch("herald.http.importlib.util.find_spec", return_value=None):
+        with HttpSession(CollectConfig(http2=True)) as session:
+            assert session.client is not None
+
+    assert "h2" in capsys.readouterr().err
@@ -0,0 +1,125 @@
+"""Tests for herald/importer.py — bulk import of JSONL history."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from herald.counters import counter, counters
+from herald.db import Database
+from herald.importer import import_batches, import_jsonl, legacy_raw_dir, read_jsonl, ImportResult
+from herald.ingest import sync_sources
+from herald.models import RawItem, Source
+
+
+SOURCES = [
+    Source(id="hn", name="Hacker News", type="hn", weight=0.8, category="community"),
+    Source(id="tavily", name="Tavily", type="tavily", weight=0.4, category="aggregator"),
+    Source(id="simon", name="Simon Willison", weight=0.9, category="official"),
+]
+
+
+@pytest.fixture
+def db(tmp_path):
+    d = Database(tmp_path / "test.db")
+    sync_sources(d, SOURCES)
+    yield d
+    d.close()
+
+
+def _write_jsonl(path, records):
+    path.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+    return path
+
+
+def _schema_objects(db):
+    return db.execute(
+        "SELECT type, name, sql FROM sqlite_master WHERE sql IS NOT NULL ORDER BY name"
+    ).fetchall()
+
+
+def test_read_jsonl_maps_legacy_records(tmp_path):
+    path = _write_jsonl(tmp_path / "2026-01-01.jsonl", [
+        {"url": "https://a.com/1", "title": "One", "source": "Hacker News",
+         "published": "2026-01-01T10:00:00+00:00", "extra": {"points": 120, "comments": 4},
+         "collected_at": "2026-01-01T12:00:00+00:00", "is_new": True},
+        {"url": "https://b.com/2", "title": "Two", "source": "Tavily: llm agents",
+         "published": "Thu, 01 Jan 2026 09:00:00 GMT", "extra": {}},
+        {"url": "https://c.com/3", "title": "Three", "source": "simon willison"},
+        {"url": "https://d.com/4", "title": "Four", "source": "Unknown Feed"},
+    ])
+    result = ImportResult()
+    items = [item for batch in read_jsonl([path], SOURCES, result) for item in batch]
+
+    assert [i.source_id for i in items] == ["hn", "tavily", "simon"]
+    assert items[0].points == 120
+    assert items[0].extra == {"comments": 4}
+    assert items[0].published_at == 1767261600
+    assert items[0].collected_at == 1767268800
+    assert items[1].published_at == 1767258000
+    assert items[2].published_at is None and items[2].collected_at is None
+    assert result.rows_read == 4
+    assert result.skipped == 1
+    assert result.unknown_sources == {"Unknown Feed": 1}
+
+
+def test_read_jsonl_batches_and_skips_bad_lines(tmp_path):
+    path = tmp_path / "v2.jsonl"
+    lines = [json.dumps({"url": f"https://a.com/{i}", "title": f"T{i}", "source_id": "hn"}) for i in range(5)]
+    lines.insert(2, "{not json")
+    path.write_text("\n".join(lines) + "\n\n", encoding="utf-8")
+
+    result = ImportResult()
+    batches = list(read_jsonl([path], SOURCES, result, batch_size=2))
+
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert result.rows_read == 6
+    assert result.skipped == 1
+
+
+def test_import_restores_indexes_and_fts(db, tmp_path):
+    before = _schema_objects(db)
+    path = _write_jsonl(tmp_path / "h.jsonl", [
+        {"url": f"https://a.com/{i}", "title": f"Rust compiler release {i}",
+         "source": "Hacker News", "collected_at": "2026-01-01T12:00:00+00:00"}
+        for i in range(20)
+    ] + [{"url": "https://a.com/0", "title": "Rust compiler release 0", "source": "simon"}])
+
+    result = import_jsonl(db, [path], SOURCES, topic_rules={"rust": ["rust"]}, batch_size=7)
+
+    assert result.articles_new == 20
+    assert result.articles_updated == 1
+    assert result.rows_per_sec > 0
+    assert _schema_objects(db) == before
+    assert db.execute("SELECT COUNT(*) FROM mentions").fetchone()[0] == 21
+    assert db.execute("SELECT COUNT(*) FROM article_topics").fetchone()[0] == 20
+    assert db.execute(
+        "SELECT COUNT(*) FROM articles_fts WHERE articles_fts MATCH 'compiler'"
+    ).fetchone()[0] == 20
+    # Historical collection time is kept rather than stamped with "now"
+    assert db.execute("SELECT MIN(collected_at) FROM articles").fetchone()[0] == 1767268800
+    # Counter triggers were deferred too; the counts were recomputed
+    assert counter(db, "table", "articles") == 20
+    assert counter(db, "table", "mentions") == 21
+    assert counters(db, "source") == {"hn": 20}
+    assert counters(db, "article_topic") == {"rust": 20}
+    db.execute("INSERT INTO articles_fts(articles_fts) VALUES ('integrity-check')")
+
+
+def test_import_failure_rolls_back_everything(db):
+    before = _schema_objects(db)
+
+    def batches():
+        yield [RawItem(url="https://a.com/1", title="First", source_id="hn")]
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        import_batches(db, batches(), {s.id: s for s in SOURCES})
+
+    assert _schema_objects(db) == before
+    assert db.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 0
+
+
+def test_legacy_raw_dir_honours_xdg(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path))
+    assert legacy_raw_dir() == tmp_path / "herald" / "data" / "raw"
@@ -166,3 +166,65 @@ def test_ingest_points_max_on_update(db, sources):
     ingest_items(db, [_make_item(points=5)], sources)  # lower points -> no change
     row = db.execute("SELECT points FROM articles").fetchone()
     assert row["points"] == 100
+
+
+# Batched ingest: repeats within one batch behave like sequential ingestion
+def test_ingest_batch_repeated_url_counts_as_update(db, sources):
+    items = [
+        _make_item(points=10),
+        _make_item(url="https://www.example.com/article/", points=40),  # same canonical URL
+        _make_item(points=20),
+    ]
+    result = ingest_items(db, items, sources)
+
+    assert result.articles_new == 1
+    assert result.articles_updated == 2
+    rows = db.execute("SELECT points FROM articles").fetchall()
+    assert [r["points"] for r in rows] == [40]
+
+
+def test_ingest_batch_matches_sequential(tmp_path, sources):
+    """One batched call leaves the same rows and counts as item-by-item calls."""
+    items = [
+        _make_item(url=f"https://example.com/{i % 7}", title=f"Agent release {i % 7}", points=i * 3)
+        for i in range(30)
+    ]
+    rules = {"agents": ["agent"]}
+
+    def _snapshot(d: Database):
+        articles = d.execute(
+            "SELECT url_canonical, title, points, score_base, story_type FROM articles ORDER BY url_canonical"
+        ).fetchall()
+        topics = d.execute("SELECT COUNT(*) FROM article_topics").fetchone()[0]
+        mentions = d.execute("SELECT COUNT(*) FROM mentions").fetchone()[0]
+        return [tuple(r) for r in articles], topics, mentions
+
+    batch_db = Database(tmp_path / "batch.db")
+    seq_db = Database(tmp_path / "seq.db")
+    for d in (batch_db, seq_db):
+        d.execute("INSERT INTO sources (id, name, weight, category) VALUES ('src1', 'Test Source', 0.5, 'community')")
+
+    batch = ingest_items(batch_db, items, sources, topic_rules=rules)
+    seq = IngestResult()
+    for item in items:
+        r = ingest_items(seq_db, [item], sources, topic_rules=rules)
+        seq.articles_new += r.articles_new
+        seq.articles_updated += r.articles_updated
+        for source_id, n in r.new_by_source.items():
+            seq.new_by_source[source_id] = seq.new_by_source.get(source_id, 0) + n
+
+    assert batch == seq
+    assert _snapshot(batch_db) == _snapshot(seq_db)
+    batch_db.close()
+    seq_db.close()
+
+
+def test_ingest_batch_larger_than_parameter_chunk(db, sources):
+    """Existing-URL resolution spans several IN (...) chunks."""
+    items = [_make_item(url=f"https://example.com/a{i}", points=1) for i in range(1200)]
+    first = ingest_items(db, items, sources)
+    second = ingest_items(db, items, sources)
+
+    assert first.articles_new == 1200
+    assert second.articles_new == 0
+    assert second.articles_updated == 1200
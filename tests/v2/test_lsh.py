@@ -0,0 +1,119 @@
+"""Tests for herald/lsh.py — MinHash LSH candidate index."""
+from __future__ import annotations
+
+import time
+from dataclasses import replace
+
+import pytest
+
+from herald.cluster import cluster, deactivate_stale, normalize_title
+from herald.config import ClusterConfig
+from herald.db import Database
+from herald.lsh import LshIndex
+
+
+@pytest.fixture
+def db(tmp_path):
+    d = Database(tmp_path / "test.db")
+    d.execute("INSERT INTO sources (id, name, weight) VALUES ('hn', 'Hacker News', 0.5)")
+    yield d
+    d.close()
+
+
+def _insert_article(db: Database, ulid: str, title: str, collected_at: int) -> None:
+    url = f"http://example.com/{ulid}"
+    db.execute(
+        """
+        INSERT INTO articles
+            (ulid, url_original, url_canonical, title, origin_source_id,
+             collected_at, score_base, scored_at)
+        VALUES (?, ?, ?, ?, 'hn', ?, 1.0, ?)
+        """,
+        (ulid, url, url, title, collected_at, collected_at),
+    )
+
+
+_LSH = replace(ClusterConfig(), candidate_index="lsh")
+
+
+def test_keys_are_deterministic():
+    norm = normalize_title("Python 3.14 released with free-threading")
+    assert LshIndex(32, 2).keys(norm) == LshIndex(32, 2).keys(norm)
+    assert len(LshIndex(16, 4).keys(norm)) == 16
+
+
+def test_invalid_banding_rejected():
+    with pytest.raises(ValueError):
+        LshIndex(0, 2)
+
+
+def test_near_duplicate_titles_are_candidates(db):
+    index = LshIndex(32, 2)
+    db.execute(
+        "INSERT INTO stories (id, ulid, title, score, first_seen, last_updated) VALUES (1, 's1', 't', 1, 0, 0)"
+    )
+    db.execute(
+        "INSERT INTO stories (id, ulid, title, score, first_seen, last_updated) VALUES (2, 's2', 't', 1, 0, 0)"
+    )
+    index.put(db, 1, normalize_title("OpenAI launches new reasoning model for developers"))
+    index.put(db, 2, normalize_title("Rust compiler gets faster incremental builds"))
+
+    found = index.candidates(index.keys(normalize_title("OpenAI launches a new reasoning model for devs")))
+    assert found == {1}
+
+
+def test_cluster_lsh_merges_like_brute(db):
+    now = int(time.time())
+    _insert_article(db, "a1", "Python 3.14 Released with New Features", now - 100)
+    _insert_article(db, "a2", "Python 3.14 Released with Many New Features", now)
+    _insert_article(db, "a3", "Completely unrelated story about gardening tips", now)
+    result = cluster(db, _LSH)
+
+    assert result.stories_created == 2
+    assert result.stories_updated == 1
+    rows = db.execute("SELECT COUNT(DISTINCT story_id) FROM story_lsh").fetchone()[0]
+    assert rows == 2
+
+
+def test_lsh_buckets_persist_between_runs(db):
+    now = int(time.time())
+    _insert_article(db, "a1", "Python 3.14 Released with New Features", now - 100)
+    cluster(db, _LSH)
+    before = db.execute("SELECT scheme, bucket, story_id FROM story_lsh ORDER BY bucket").fetchall()
+
+    story = db.execute("SELECT id, title FROM stories").fetchone()
+    index = LshIndex.load(db, _LSH.lsh_bands, _LSH.lsh_rows, [(story[0], normalize_title(story[1]))])
+    after = db.execute("SELECT scheme, bucket, story_id FROM story_lsh ORDER BY bucket").fetchall()
+
+    assert len(index) == 1
+    assert [tuple(r) for r in before] == [tuple(r) for r in after]
+
+    _insert_article(db, "a2", "Python 3.14 Released with Many New Features", now)
+    result = cluster(db, _LSH)
+    assert result.stories_updated == 1
+
+
+def test_lsh_backfills_existing_stories_and_drops_old_scheme(db):
+    now = int(time.time())
+    _insert_article(db, "a1", "Python 3.14 Released with New Features", now - 100)
+    cluster(db)  # brute: no buckets written
+    assert db.execute("SELECT COUNT(*) FROM story_lsh").fetchone()[0] == 0
+
+    _insert_article(db, "a2", "Python 3.14 Released with Many New Features", now)
+    result = cluster(db, replace(_LSH, lsh_bands=16, lsh_rows=4))
+    assert result.stories_updated == 1
+    assert {r[0] for r in db.execute("SELECT scheme FROM story_lsh")} == {"b16r4"}
+
+    _insert_article(db, "a3", "Python 3.14 Released with Even More New Features", now)
+    cluster(db, _LSH)
+    assert {r[0] for r in db.execute("SELECT scheme FROM story_lsh")} == {"b32r2"}
+
+
+def test_deactivate_stale_drops_lsh_rows(db):
+    old = int(time.time()) - 30 * 86400
+    _insert_article(db, "a1", "Python 3.14 Released with New Features", old)
+    cluster(db, _LSH)
+    assert db.execute("SELECT COUNT(*) FROM story_lsh").fetchone()[0] > 0
+
+    assert deactivate_stale(db) == 1
+    assert db.execute("SELECT COUNT(*) FROM story_lsh").fetchone()[0] == 0
@@ -0,0 +1,53 @@
+"""Tests for herald/manifest.py and the SessionStart hook that reads it."""
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from herald.db import Database
+from herald.manifest import read_manifest, remove_manifest, write_manifest
+
+_HOOK = Path(__file__).resolve().parents[2] / "hooks" / "session-start.sh"
+
+
+def test_write_read_remove(tmp_path):
+    assert read_manifest(tmp_path) is None
+    write_manifest(tmp_path, {"version": 1, "articles": 3, "last_run_at": 10})
+    assert read_manifest(tmp_path)["articles"] == 3
+    assert '\n  "last_run_at": 10\n' in (tmp_path / "status.json").read_text()
+
+    (tmp_path / "status.json").write_text("{truncated", encoding="utf-8")
+    assert read_manifest(tmp_path) is None
+    remove_manifest(tmp_path)
+    remove_manifest(tmp_path)
+    assert not (tmp_path / "status.json").exists()
+
+
+def _hook(data_dir: Path) -> str:
+    env = dict(os.environ, HERALD_DATA_DIR=str(data_dir))
+    proc = subprocess.run(["bash", str(_HOOK)], capture_output=True, text=True, env=env, timeout=10)
+    assert proc.returncode == 0, proc.stderr
+    return proc.stdout
+
+
+@pytest.mark.skipif(shutil.which("bash") is None, reason="needs bash")
+def test_session_start_hook(tmp_path):
+    assert _hook(tmp_path) == ""  # not set up
+
+    now = int(time.time())
+    with Database(tmp_path / "herald.db") as db:
+        db.execute("INSERT INTO pipeline_runs (started_at, finished_at) VALUES (?, ?)", (now, now))
+    # No manifest yet: read from SQLite
+    assert "ready" in _hook(tmp_path)
+
+    write_manifest(tmp_path, {"version": 1, "last_run_at": now - 2 * 86400, "articles": 0})
+    assert "stale" in _hook(tmp_path)
+    write_manifest(tmp_path, {"version": 1, "last_run_at": now - 60, "articles": 0})
+    assert "ready" in _hook(tmp_path)
+    write_manifest(tmp_path, {"version": 1, "last_run_at": None})
+    assert "stale" in _hook(tmp_path)
@@ -0,0 +1,88 @@
+"""Tests for herald/metrics.py — per-stage pipeline metrics."""
+from __future__ import annotations
+
+import tracemalloc
+
+import pytest
+
+from herald.db import Database
+from herald.metrics import StageRecorder, load_stage_metrics
+
+
+@pytest.fixture
+def db(tmp_path):
+    d = Database(tmp_path / "test.db")
+    yield d
+    d.close()
+
+
+def _run(db) -> int:
+    return db.execute("INSERT INTO pipeline_runs (started_at) VALUES (0)").lastrowid
+
+
+def test_stage_counts_only_its_own_statements(db):
+    recorder = StageRecorder(db)
+    db.execute("SELECT 1")
+    with recorder.stage("a") as m:
+        db.execute("SELECT 1")
+        db.executemany("INSERT INTO sources (id, name) VALUES (?, ?)", [("a", "A"), ("b", "B")])
+        m.items_in, m.items_out = 3, 1
+    db.execute("SELECT 1")
+    with recorder.stage("b"):
+        pass
+
+    a, b = recorder.stages
+    assert (a.stage, a.sql_statements, a.items_in, a.items_out) == ("a", 2, 3, 1)
+    assert b.sql_statements == 0
+    assert a.wall_ms >= 0 and a.cpu_ms >= 0
+
+
+def test_trigger_statements_not_counted(db):
+    db.execute("INSERT INTO sources (id, name) VALUES ('s', 'S')")
+    recorder = StageRecorder(db)
+    with recorder.stage("write"):
+        # Fires the articles_fts insert trigger
+        db.execute(
+            """INSERT INTO articles (ulid, url_original, url_canonical, title, origin_source_id,
+                                     collected_at, score_base, scored_at)
+               VALUES ('a', 'u', 'u', 't', 's', 0, 0, 0)"""
+        )
+    assert recorder.stages[0].sql_statements == 1
+
+
+def test_stage_recorded_when_block_raises(db):
+    recorder = StageRecorder(db)
+    with pytest.raises(ValueError):
+        with recorder.stage("broken"):
+            raise ValueError
+    assert [m.stage for m in recorder.stages] == ["broken"]
+
+
+def test_py_peak_only_while_tracing(db):
+    recorder = StageRecorder(db)
+    with recorder.stage("untraced"):
+        pass
+    tracemalloc.start()
+    try:
+        with recorder.stage("traced"):
+            buf = [0] * 100_000
+            del buf
+    finally:
+        tracemalloc.stop()
+    untraced, traced = recorder.stages
+    assert untraced.py_peak_bytes is None
+    assert traced.py_peak_bytes >= 800_000
+
+
+def test_save_and_load_newest_first(db):
+    for _ in range(3):
+        run_id = _run(db)
+        recorder = StageRecorder(db)
+        for name in ("collect", "ingest"):
+            with recorder.stage(name):
+                pass
+        recorder.save(run_id)
+
+    runs = load_stage_metrics(db, runs=2)
+    assert [run_id for run_id, _ in runs] == [3, 2]
+    assert [m.stage for m in runs[0][1]] == ["collect", "ingest"]
@@ -5,9 +5,12 @@ from unittest.mock import patch
 
 import pytest
 
-from herald.config import HeraldConfig, ClusterConfig
+from herald.config import HeraldConfig, ClusterConfig, RetentionConfig
 from herald.db import Database
-from herald.models import RawItem, Source
+from herald.fetch_state import load_fetch_state
+from herald.ingest import IngestResult
+from herald.manifest import read_manifest
+from herald.models import FetchState, RawItem, Source
 from herald.pipeline import PipelineResult, run_pipeline
 
 
@@ -184,3 +187,226 @@ def test_pipeline_empty_collect(db, config, tmp_path):
     # Brief file should still be created
     brief_path = tmp_path / "briefs" / f"{result.run_id}.md"
     assert brief_path.exists()
+
+
+# ---------------------------------------------------------------------------
+# Adaptive polling: only due sources are collected unless force_all
+# ---------------------------------------------------------------------------
+
+def test_pipeline_adaptive_skips_sources_not_due(db, config, tmp_path):
+    config.schedule.adaptive = True
+
+    with patch("herald.pipeline.collect_all", return_value=[]) as mock_collect:
+        run_pipeline(config, db, data_dir=tmp_path)
+        run_pipeline(config, db, data_dir=tmp_path)
+        run_pipeline(config, db, data_dir=tmp_path, force_all=True)
+
+    polled = [call.args[0] for call in mock_collect.call_args_list]
+    assert [s.id for s in polled[0]] == ["src1"]
+    assert polled[1] == []
+    assert [s.id for s in polled[2]] == ["src1"]
+
+
+# ---------------------------------------------------------------------------
+# Database profiles: bulk profile around ingest/cluster, periodic maintenance
+# ---------------------------------------------------------------------------
+
+def test_pipeline_ingest_and_cluster_use_bulk_profile(db, config, tmp_path):
+    seen = {}
+
+    def _ingest(d, *args, **kwargs):
+        seen["ingest"] = d.execute("PRAGMA wal_autocheckpoint").fetchone()[0]
+        return IngestResult()
+
+    with (
+        patch("herald.pipeline.collect_all", return_value=[]),
+        patch("herald.pipeline.ingest_items", side_effect=_ingest),
+    ):
+        run_pipeline(config, db, data_dir=tmp_path)
+
+    assert seen["ingest"] == 0  # bulk-load
+    assert db.execute("PRAGMA wal_autocheckpoint").fetchone()[0] == 1000  # restored
+
+
+def test_pipeline_runs_maintenance_every_n_runs(db, config, tmp_path):
+    config.database.maintenance_every_runs = 2
+    with (
+        patch("herald.pipeline.collect_all", return_value=[]),
+        patch.object(db, "maintain", wraps=db.maintain) as mock_maintain,
+    ):
+        for _ in range(4):
+            run_pipeline(config, db, data_dir=tmp_path)
+
+    assert mock_maintain.call_count == 2
+
+
+def test_pipeline_records_stage_metrics(db, config, tmp_path):
+    items = [
+        _make_raw_item(url="https://example.com/a", title="Python 3.14 Release Candidate ships today"),
+        _make_raw_item(url="https://example.com/b", title="New research paper on machine learning benchmarks"),
+    ]
+
+    with patch("herald.pipeline.collect_all", return_value=items):
+        result = run_pipeline(config, db, data_dir=tmp_path)
+
+    rows = db.execute(
+        "SELECT * FROM pipeline_stage_metrics WHERE run_id = ? ORDER BY seq", (result.run_id,)
+    ).fetchall()
+    by_stage = {row["stage"]: row for row in rows}
+    assert list(by_stage) == ["collect", "ingest", "cluster", "deactivate", "project"]
+    assert (by_stage["collect"]["items_in"], by_stage["collect"]["items_out"]) == (1, 2)
+    assert (by_stage["ingest"]["items_in"], by_stage["ingest"]["items_out"]) == (2, 2)
+    assert by_stage["cluster"]["items_out"] == 2
+    assert by_stage["ingest"]["sql_statements"] > 0
+    assert all(row["wall_ms"] >= 0 and row["cpu_ms"] >= 0 for row in rows)
+
+
+def test_pipeline_stage_metrics_kept_on_failure(db, config, tmp_path):
+    with patch("herald.pipeline.cluster", side_effect=RuntimeError("boom")):
+        with patch("herald.pipeline.collect_all", return_value=[_make_raw_item()]):
+            with pytest.raises(RuntimeError):
+                run_pipeline(config, db, data_dir=tmp_path)
+
+    stages = [row[0] for row in db.execute("SELECT stage FROM pipeline_stage_metrics ORDER BY seq")]
+    assert stages == ["collect", "ingest", "cluster"]
+
+
+def test_pipeline_logs_source_fetches(db, config, tmp_path):
+    items = [
+        _make_raw_item(url="https://example.com/a", title="Python 3.14 Release Candidate ships today"),
+        _make_raw_item(url="https://example.com/b", title="New research paper on machine learning benchmarks"),
+    ]
+
+    def fake_collect(sources, **kwargs):
+        log = kwargs["fetch_log"]["src1"]
+        log.status, log.items_parsed = 200, len(items)
+        return items
+
+    with patch("herald.pipeline.collect_all", side_effect=fake_collect):
+        first = run_pipeline(config, db, data_dir=tmp_path)
+        second = run_pipeline(config, db, data_dir=tmp_path)
+
+    rows = db.execute(
+        "SELECT run_id, status, items_parsed, items_new FROM source_fetch_log WHERE source_id = 'src1' ORDER BY run_id"
+    ).fetchall()
+    assert [tuple(r) for r in rows] == [(first.run_id, 200, 2, 2), (second.run_id, 200, 2, 0)]
+
+
+def test_pipeline_keeps_fetch_outcomes_when_ingest_fails(db, config, tmp_path):
+    config.sources.append(Source(id="src2", name="Quiet Feed", url="http://example.com/quiet", weight=0.5))
+
+    def fake_collect(sources, **kwargs):
+        logs, states = kwargs["fetch_log"], kwargs["fetch_state"]
+        logs["src1"].status, logs["src1"].items_parsed = 200, 1
+        logs["src2"].status = 304
+        states["src1"] = FetchState(source_id="src1", etag='"new"', fetched_at=1)
+        states["src2"] = FetchState(source_id="src2", etag='"same"', fetched_at=1)
+        return [_make_raw_item()]
+
+    with (
+        patch("herald.pipeline.collect_all", side_effect=fake_collect),
+        patch("herald.pipeline.ingest_items", side_effect=RuntimeError("disk I/O error")),
+    ):
+        with pytest.raises(RuntimeError, match="disk I/O error"):
+            run_pipeline(config, db, data_dir=tmp_path)
+
+    rows = db.execute("SELECT source_id, status, items_new FROM source_fetch_log ORDER BY source_id").fetchall()
+    assert [tuple(r) for r in rows] == [("src1", 200, 0), ("src2", 304, 0)]
+    # The changed feed keeps its old validators so the next run refetches its items
+    assert set(load_fetch_state(db)) == {"src2"}
+
+
+def test_pipeline_refreshes_brief_cache(db, config, tmp_path):
+    db.execute(
+        "INSERT INTO brief_cache (hours, max_stories, topic, run_id, expires_at, body) "
+        "VALUES (48, 10, 'rust', 0, 9999999999, 'stale')"
+    )
+    with patch("herald.pipeline.collect_all", return_value=[_make_raw_item()]):
+        result = run_pipeline(config, db, data_dir=tmp_path)
+
+    rows = db.execute("SELECT hours, max_stories, topic, run_id, body FROM brief_cache").fetchall()
+    assert [tuple(r) for r in rows] == [(24, 25, "", result.run_id, result.brief)]
+
+    db.execute(
+        "INSERT INTO brief_cache (hours, max_stories, topic, run_id, expires_at, body) "
+        "VALUES (48, 10, 'rust', ?, 9999999999, 'stale')",
+        (result.run_id,),
+    )
+    with patch("herald.pipeline.cluster", side_effect=RuntimeError("boom")):
+        with pytest.raises(RuntimeError):
+            run_pipeline(config, db, data_dir=tmp_path)
+    assert db.execute("SELECT COUNT(*) FROM brief_cache").fetchone()[0] == 0
+
+
+def test_pipeline_writes_status_manifest(db, config, tmp_path):
+    with patch("herald.pipeline.collect_all", return_value=[_make_raw_item()]):
+        result = run_pipeline(config, db, data_dir=tmp_path)
+
+    manifest = read_manifest(tmp_path)
+    assert manifest["last_run_id"] == result.run_id
+    assert (manifest["articles"], manifest["stories"]) == (1, 1)
+    assert (manifest["articles_new"], manifest["stories_created"]) == (1, 1)
+    assert manifest["error"] is None
+    assert manifest["brief_path"] == str(tmp_path / "briefs" / f"{result.run_id}.md")
+    assert [s["stage"] for s in manifest["stages"]] == ["collect", "ingest", "cluster", "deactivate", "project"]
+    assert not list(tmp_path.glob(".status.json*"))
+
+    with patch("herald.pipeline.collect_all", side_effect=RuntimeError("network failure")):
+        with pytest.raises(RuntimeError):
+            run_pipeline(config, db, data_dir=tmp_path)
+    manifest = read_manifest(tmp_path)
+    assert manifest["error"] == "network failure"
+    assert manifest["brief_path"] is None
+    assert manifest["articles"] == 1
+
+
+def test_pipeline_manifest_failure_does_not_fail_run(db, config, tmp_path, capsys):
+    with (
+        patch("herald.pipeline.collect_all", return_value=[]),
+        patch("herald.pipeline.write_manifest", side_effect=OSError("disk full")),
+    ):
+        run_pipeline(config, db, data_dir=tmp_path)
+    assert "could not write status manifest: disk full" in capsys.readouterr().err
+
+
+def test_pipeline_cache_failure_keeps_original_error(db, config, tmp_path, capsys):
+    with (
+        patch("herald.pipeline.collect_all", side_effect=RuntimeError("network failure")),
+        patch("herald.pipeline.invalidate_brief_cache", side_effect=RuntimeError("database is locked")),
+    ):
+        with pytest.raises(RuntimeError, match="network failure"):
+            run_pipeline(config, db, data_dir=tmp_path)
+    assert "could not clear the brief cache: database is locked" in capsys.readouterr().err
+    assert db.execute("SELECT error FROM pipeline_runs").fetchone()[0] == "network failure"
+
+
+def test_pipeline_retention_stage_archives_and_deletes(db, config, tmp_path, capsys):
+    items = [
+        _make_raw_item(url="https://example.com/old", title="Old story about compiler internals"),
+        _make_raw_item(url="https://example.com/new", title="Fresh news on database engines"),
+    ]
+    with patch("herald.pipeline.collect_all", return_value=items):
+        run_pipeline(config, db, data_dir=tmp_path)
+    db.execute("UPDATE stories SET last_updated = 1000 WHERE title LIKE 'Old%'")
+
+    config.retention = RetentionConfig(inactive_story_days=90, archive=True)
+    # Without a data dir there is nowhere to archive: the stage is skipped
+    with patch("herald.pipeline.collect_all", return_value=[]):
+        run_pipeline(config, db)
+    assert "skipping retention" in capsys.readouterr().err
+    assert db.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 2
+
+    with patch("herald.pipeline.collect_all", return_value=[]):
+        result = run_pipeline(config, db, data_dir=tmp_path)
+
+    stages = {
+        row["stage"]: row["items_out"]
+        for row in db.execute(
+            "SELECT stage, items_out FROM pipeline_stage_metrics WHERE run_id = ?", (result.run_id,)
+        )
+    }
+    assert stages["retention"] == 1
+    assert [r[0] for r in db.execute("SELECT url_canonical FROM articles")] == ["https://example.com/new"]
+    assert read_manifest(tmp_path)["articles"] == 1
+    (archived,) = (tmp_path / "archive").glob("*.jsonl")
+    assert "https://example.com/old" in archived.read_text()
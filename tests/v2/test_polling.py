@@ -0,0 +1,129 @@
+"""Tests for herald/polling.py — adaptive per-source polling."""
+from __future__ import annotations
+
+import pytest
+
+from herald.config import ScheduleConfig
+from herald.db import Database
+from herald.models import Source
+from herald.polling import due_sources, learn_intervals, schedule_next_poll
+
+NOW = 2_000_000_000
+
+
+@pytest.fixture
+def db(tmp_path):
+    d = Database(tmp_path / "test.db")
+    for sid in ("fast", "slow", "new"):
+        d.execute(
+            "INSERT INTO sources (id, name, weight, category) VALUES (?, ?, 0.2, 'community')",
+            (sid, sid),
+        )
+    yield d
+    d.close()
+
+
+def _add_items(db: Database, source_id: str, stamps: list[int]) -> None:
+    for i, ts in enumerate(stamps):
+        url = f"https://{source_id}.example.com/{i}"
+        article_id = db.execute(
+            """
+            INSERT INTO articles
+                (ulid, url_original, url_canonical, title, origin_source_id,
+                 published_at, collected_at, score_base, scored_at)
+            VALUES (?, ?, ?, 'T', ?, ?, ?, 0.2, ?)
+            """,
+            (f"{source_id}-{i}", url, url, source_id, ts, NOW, NOW),
+        ).lastrowid
+        db.execute(
+            "INSERT INTO mentions (article_id, source_id, url, discovered_at) VALUES (?, ?, ?, ?)",
+            (article_id, source_id, url, NOW),
+        )
+
+
+def test_learn_intervals_uses_median_gap(db):
+    _add_items(db, "fast", [NOW - 3600 * k for k in range(1, 6)])  # hourly
+    cfg = ScheduleConfig(interval_hours=4, min_interval_minutes=15, max_interval_hours=168)
+
+    intervals = learn_intervals(db, ["fast"], cfg, NOW)
+
+    assert intervals["fast"] == 3600
+
+
+def test_learn_intervals_clamps_and_defaults(db):
+    _add_items(db, "fast", [NOW - 60 * k for k in range(1, 6)])  # every minute
+    _add_items(db, "slow", [NOW - 30 * 86400 * k for k in range(1, 4)])  # monthly
+    cfg = ScheduleConfig(interval_hours=4, min_interval_minutes=15, max_interval_hours=168)
+
+    intervals = learn_intervals(db, ["fast", "slow", "new"], cfg, NOW)
+
+    assert intervals["fast"] == 15 * 60
+    assert intervals["slow"] == 168 * 3600
+    assert intervals["new"] == 4 * 3600
+
+
+def test_learn_intervals_ignores_future_timestamps(db):
+    _add_items(db, "fast", [NOW - 3600, NOW - 7200, NOW + 86400 * 365])
+    cfg = ScheduleConfig(min_interval_minutes=1)
+
+    assert learn_intervals(db, ["fast"], cfg, NOW)["fast"] == 3600
+
+
+def test_learn_intervals_reads_only_polled_sources_recent_history(db):
+    _add_items(db, "fast", [NOW - 3600 * k for k in range(1, 6)])
+    _add_items(db, "slow", [NOW - 2 * 3600, NOW - 3600])
+    cfg = ScheduleConfig(interval_hours=4, min_interval_minutes=1, max_interval_hours=1)
+    # Far older than _HISTORY_ITEMS max-length intervals: not read at all
+    _add_items(db, "new", [NOW - 30 * 86400, NOW - 31 * 86400])
+
+    statements: list[str] = []
+    db._conn.set_trace_callback(statements.append)
+    intervals = learn_intervals(db, ["slow", "new"], cfg, NOW)
+    db._conn.set_trace_callback(None)
+
+    assert intervals == {"slow": 3600, "new": 4 * 3600}
+    assert len(statements) == 1
+    assert "'slow'" in statements[0] and "'fast'" not in statements[0]
+
+
+def test_due_sources_and_schedule(db):
+    sources = [Source(id=sid, name=sid) for sid in ("fast", "slow", "new")]
+    _add_items(db, "fast", [NOW - 3600 * k for k in range(1, 6)])
+    _add_items(db, "slow", [NOW - 7 * 86400 * k for k in range(1, 4)])
+    cfg = ScheduleConfig()
+
+    # Nothing polled yet: everything is due
+    assert due_sources(db, sources, NOW) == sources
+
+    schedule_next_poll(db, ["fast", "slow"], cfg, NOW)
+
+    due_soon = due_sources(db, sources, NOW + 3600)
+    assert [s.id for s in due_soon] == ["fast", "new"]
+
+    row = db.execute(
+        "SELECT interval_secs, next_due_at FROM source_schedule WHERE source_id = 'slow'"
+    ).fetchone()
+    assert row["interval_secs"] == 7 * 86400
+    assert row["next_due_at"] == NOW + 7 * 86400
+
+
+def test_failed_fetch_is_retried_with_backoff(db):
+    _add_items(db, "slow", [NOW - 7 * 86400 * k for k in range(1, 4)])
+    cfg = ScheduleConfig(min_interval_minutes=15)
+
+    def schedule(now, failed):
+        schedule_next_poll(db, ["slow"], cfg, now, failed)
+        row = db.execute("SELECT interval_secs, next_due_at, failures FROM source_schedule").fetchone()
+        return row["interval_secs"], row["next_due_at"] - now, row["failures"]
+
+    # The learned interval is kept, but the retry comes after 15, 30, 60 minutes
+    assert schedule(NOW, ["slow"]) == (7 * 86400, 15 * 60, 1)
+    assert schedule(NOW + 900, ["slow"]) == (7 * 86400, 30 * 60, 2)
+    assert schedule(NOW + 2700, ["slow"]) == (7 * 86400, 60 * 60, 3)
+    # Success resets the backoff
+    assert schedule(NOW + 6300, []) == (7 * 86400, 7 * 86400, 0)
+
+    # Never later than the learned interval
+    for k in range(12):
+        last = schedule(NOW + k, ["slow"])
+    assert last == (7 * 86400, 7 * 86400, 12)
@@ -2,12 +2,13 @@
 from __future__ import annotations
 
 import time
+from datetime import datetime, timezone
 from pathlib import Path
 
 import pytest
 
 from herald.db import Database
-from herald.project import project_brief
+from herald.project import cached_brief, invalidate_brief_cache, project_brief
 
 
 # ---------------------------------------------------------------------------
@@ -23,7 +24,7 @@ def _make_db(tmp_path: Path) -> Database:
 
 def _insert_story(
     db: Database,
-    story_id: str,
+    ulid: str,
     title: str,
     score: float = 1.0,
     story_type: str = "news",
@@ -38,17 +39,17 @@ def _insert_story(
         last_updated = now
     db.execute(
         """
-        INSERT INTO stories (id, title, score, story_type, canonical_article_id,
+        INSERT INTO stories (ulid, title, score, story_type, canonical_article_id,
                              first_seen, last_updated, status)
         VALUES (?, ?, ?, ?, NULL, ?, ?, ?)
         """,
-        (story_id, title, score, story_type, first_seen, last_updated, status),
+        (ulid, title, score, story_type, first_seen, last_updated, status),
     )
 
 
 def _insert_article(
     db: Database,
-    article_id: str,
+    ulid: str,
     title: str,
     source_id: str = "src1",
     score_base: float = 1.0,
@@ -59,14 +60,14 @@ def _insert_article(
     db.execute(
         """
         INSERT INTO articles
-            (id, url_original, url_canonical, title, origin_source_id,
+            (ulid, url_original, url_canonical, title, origin_source_id,
              collected_at, score_base, scored_at, story_type)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'news')
         """,
         (
-            article_id,
-            f"http://example.com/{article_id}",
-            f"http://example.com/{article_id}",
+            ulid,
+            f"http://example.com/{ulid}",
+            f"http://example.com/{ulid}",
             title,
             source_id,
             collected_at,
@@ -76,17 +77,20 @@ def _insert_article(
     )
 
 
-def _link_article(db: Database, story_id: str, article_id: str) -> None:
+def _link_article(db: Database, story_ulid: str, article_ulid: str) -> None:
     db.execute(
-        "INSERT INTO story_articles (story_id, article_id) VALUES (?, ?)",
-        (story_id, article_id),
+        """
+        INSERT INTO story_articles (story_id, article_id)
+        SELECT s.id, a.id FROM stories s, articles a WHERE s.ulid = ? AND a.ulid = ?
+        """,
+        (story_ulid, article_ulid),
     )
 
 
-def _add_topic(db: Database, story_id: str, topic: str) -> None:
+def _add_topic(db: Database, story_ulid: str, topic: str) -> None:
     db.execute(
-        "INSERT INTO story_topics (story_id, topic) VALUES (?, ?)",
-        (story_id, topic),
+        "INSERT INTO story_topics (story_id, topic) SELECT id, ? FROM stories WHERE ulid = ?",
+        (topic, story_ulid),
     )
 
 
@@ -473,3 +477,122 @@ def test_project_brief_empty_db(tmp_path):
     assert result.startswith("---\n")
     assert "story_count: 0" in result
     assert "period_hours: 24" in result
+
+
+def test_project_brief_query_count_independent_of_story_count(tmp_path):
+    """Articles and topics are fetched set-based, not once per story."""
+    db = _make_db(tmp_path)
+    for i in range(60):
+        _insert_story(db, f"s{i}", f"Story number {i}", score=float(i))
+        _insert_article(db, f"a{i}", f"Article {i}", source_id="src1" if i % 2 else "src2")
+        _link_article(db, f"s{i}", f"a{i}")
+        _add_topic(db, f"s{i}", "python")
+
+    statements: list[str] = []
+    db._conn.set_trace_callback(statements.append)
+    result = project_brief(db, max_stories=60)
+    db._conn.set_trace_callback(None)
+    db.close()
+
+    assert len(statements) == 3
+    assert result.count("`python`") == 60
+    assert "[Article 59](http://example.com/a59)" in result
+
+
+def test_project_brief_more_stories_than_one_parameter_chunk(tmp_path):
+    db = _make_db(tmp_path)
+    for i in range(600):
+        _insert_story(db, f"s{i:03d}", f"Story number {i}", score=float(i))
+        _insert_article(db, f"a{i:03d}", f"Article {i}")
+        _link_article(db, f"s{i:03d}", f"a{i:03d}")
+
+    result = project_brief(db, max_stories=600)
+    db.close()
+
+    assert "story_count: 600" in result
+    assert result.count("- [Article ") == 600
+
+
+# ---------------------------------------------------------------------------
+# Brief cache
+# ---------------------------------------------------------------------------
+
+def _cache_rows(db: Database) -> list[tuple]:
+    return [tuple(r) for r in db.execute("SELECT hours, max_stories, topic, run_id FROM brief_cache")]
+
+
+def test_cached_brief_reused_until_next_run(tmp_path, monkeypatch):
+    db = _make_db(tmp_path)
+    _insert_story(db, "s1", "Rust 2.0 released")
+    _add_topic(db, "s1", "rust")
+    db.execute("INSERT INTO pipeline_runs (started_at) VALUES (1)")
+
+    clock = [time.time()]
+    monkeypatch.setattr("herald.project.time.time", lambda: clock[0])
+    first = cached_brief(db)
+    assert first == project_brief(db)
+    cached_brief(db, topic_filter="rust")  # separate entry
+    assert sorted(_cache_rows(db)) == [(24, 25, "", 1), (24, 25, "rust", 1)]
+
+    clock[0] += 60
+    statements: list[str] = []
+    db._conn.set_trace_callback(statements.append)
+    hit = cached_brief(db)
+    db._conn.set_trace_callback(None)
+    assert len(statements) == 2  # served from the cache...
+    # ...but generated_at says when it was served, not when it was cached
+    stamp = datetime.fromtimestamp(int(clock[0]), tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    assert f"generated_at: {stamp}\n" in hit
+    assert hit.split("\n", 2)[2] == first.split("\n", 2)[2]
+    assert hit == project_brief(db)
+
+    db.execute("INSERT INTO pipeline_runs (started_at) VALUES (2)")
+    assert cached_brief(db) != first
+    assert (24, 25, "", 2) in _cache_rows(db)
+
+    invalidate_brief_cache(db)
+    assert _cache_rows(db) == []
+    db.close()
+
+
+def test_cached_brief_expires_when_story_leaves_window(tmp_path, monkeypatch):
+    db = _make_db(tmp_path)
+    now = int(time.time())
+    _insert_story(db, "old", "Older story", score=5.0, last_updated=now - 23 * 3600)
+    _insert_story(db, "new", "Newer story", score=1.0, last_updated=now)
+
+    clock = [now]
+    monkeypatch.setattr("herald.project.time.time", lambda: clock[0])
+    assert "story_count: 2" in cached_brief(db)
+
+    clock[0] = now + 3600 - 10
+    assert "story_count: 2" in cached_brief(db)
+    clock[0] = now + 3600 + 10
+    assert "story_count: 1" in cached_brief(db)
+    db.close()
+
+
+def test_cached_brief_read_only_connection_does_not_store(tmp_path):
+    db = _make_db(tmp_path)
+    _insert_story(db, "s1", "Rust 2.0 released")
+    db.close()
+
+    with Database(tmp_path / "test.db", read_only=True) as ro:
+        assert "story_count: 1" in cached_brief(ro)
+        assert _cache_rows(ro) == []
+
+
+def test_cached_brief_served_uncached_while_writer_holds_lock(tmp_path):
+    db = _make_db(tmp_path)
+    _insert_story(db, "s1", "Rust 2.0 released")
+    writer = Database(tmp_path / "test.db")
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.monotonic()
+        assert "story_count: 1" in cached_brief(db)
+        assert time.monotonic() - started < 2
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+    assert _cache_rows(db) == []
+    db.close()
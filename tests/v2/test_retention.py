@@ -0,0 +1,170 @@
+"""Tests for herald/retention.py — chunked deletion of old stories and runs."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from herald.archive import month_of
+from herald.cluster import cluster
+from herald.config import RetentionConfig
+from herald.counters import counter, recompute_counters
+from herald.db import Database
+from herald.importer import import_jsonl
+from herald.ingest import ingest_items
+from herald.models import RawItem, Source
+from herald.retention import apply_retention
+
+SOURCES = {"hn": Source(id="hn", name="Hacker News", weight=0.5)}
+DAY = 86400
+NOW = 1_800_000_000
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(tmp_path / "test.db")
+    db.execute("INSERT INTO sources (id, name, weight) VALUES ('hn', 'Hacker News', 0.5)")
+    titles = [
+        "Alpha compiler release speeds up incremental builds",
+        "Bravo database adds vector search extension",
+        "Charlie browser ships stricter cookie policy",
+        "Delta airline outage grounds regional flights",
+        "Echo smart speaker firmware patched against exploit",
+        "Foxtrot robotics startup raises series funding",
+        "Golf simulator maker open sources physics engine",
+    ]
+    items = [RawItem(url=f"https://ex.com/{i}", title=t, source_id="hn") for i, t in enumerate(titles)]
+    ingest_items(db, items, SOURCES, topic_rules={"alpha": ["alpha"]})
+    cluster(db)
+    # Five old inactive stories, one old but still active, one recent inactive
+    for n, row in enumerate(db.execute("SELECT id FROM stories ORDER BY title").fetchall()):
+        status, age = ("active", 200) if n == 5 else ("inactive", 10 if n == 6 else 100 + 10 * n)
+        db.execute(
+            "UPDATE stories SET status = ?, last_updated = ? WHERE id = ?",
+            (status, NOW - age * DAY, row[0]),
+        )
+    yield db
+    db.close()
+
+
+def _counts(db):
+    return {t: db.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+            for t in ("stories", "articles", "mentions", "story_articles", "article_topics")}
+
+
+def test_deletes_old_inactive_stories_in_batches(db, tmp_path):
+    cfg = RetentionConfig(inactive_story_days=90, archive=True, batch_size=2)
+    result = apply_retention(db, cfg, archive_dir=tmp_path / "archive", now=NOW)
+
+    assert (result.stories_deleted, result.articles_deleted, result.batches) == (5, 5, 3)
+    assert _counts(db) == {"stories": 2, "articles": 2, "mentions": 2, "story_articles": 2, "article_topics": 0}
+    titles = {r[0] for r in db.execute("SELECT title FROM stories")}
+    assert titles == {
+        "Foxtrot robotics startup raises series funding",
+        "Golf simulator maker open sources physics engine",
+    }
+    # FTS rows and counters follow the cascades
+    assert db.execute("SELECT COUNT(*) FROM articles_fts WHERE articles_fts MATCH 'alpha'").fetchone()[0] == 0
+    assert counter(db, "table", "articles") == 2
+    assert counter(db, "story_status", "inactive") == 1
+    with db.transaction():
+        recompute_counters(db)
+    assert counter(db, "table", "articles") == 2
+
+    # One archive file per month of last update; records re-import as RawItems
+    assert [p.name for p in result.archive_files] == ["2026-08.jsonl", "2026-09.jsonl", "2026-10.jsonl"]
+    records = [json.loads(line) for p in result.archive_files for line in p.read_text().splitlines()]
+    assert len(records) == 5
+    alpha = next(r for r in records if r["title"].startswith("Alpha"))
+    assert alpha["topics"] == ["alpha"] and alpha["story"]["last_updated"] == NOW - 100 * DAY
+
+    restored = import_jsonl(db, result.archive_files, list(SOURCES.values()))
+    assert restored.articles_new == 5
+    assert counter(db, "table", "articles") == 7
+
+    # Nothing left to delete
+    assert apply_retention(db, cfg, archive_dir=tmp_path / "archive", now=NOW).stories_deleted == 0
+
+
+def test_deleted_articles_are_not_ingested_again(db):
+    apply_retention(db, RetentionConfig(inactive_story_days=90), now=NOW)
+    stories = _counts(db)["stories"]
+
+    # The feed still lists an old post next to a new one
+    again = ingest_items(db, [
+        RawItem(url="https://ex.com/0", title="Alpha compiler release speeds up incremental builds", source_id="hn"),
+        RawItem(url="https://ex.com/new", title="Hotel booking site leaks customer records", source_id="hn"),
+    ], SOURCES)
+    assert (again.articles_new, again.articles_retired) == (1, 1)
+    cluster(db)
+    assert _counts(db)["stories"] == stories + 1
+    assert db.execute("SELECT COUNT(*) FROM stories WHERE title LIKE 'Alpha%'").fetchone()[0] == 0
+
+
+def test_archived_articles_are_not_ingested_again(db, tmp_path):
+    result = apply_retention(db, RetentionConfig(move_to_archive_days=90), now=NOW)
+    assert result.stories_archived == 5 and (tmp_path / "archive").is_dir()
+
+    again = ingest_items(db, [
+        RawItem(url="https://ex.com/1", title="Bravo database adds vector search extension", source_id="hn"),
+    ], SOURCES)
+    assert (again.articles_new, again.articles_retired) == (0, 1)
+    cluster(db)
+    assert db.execute("SELECT COUNT(*) FROM stories WHERE title LIKE 'Bravo%'").fetchone()[0] == 0
+
+
+def test_storyless_articles_are_moved_or_deleted(db, tmp_path):
+    # Titles too short to cluster: cluster() clears them without a story
+    ingest_items(db, [
+        RawItem(url=f"https://ex.com/short/{age}", title=f"Short {age}", source_id="hn")
+        for age in (200, 120, 10)
+    ], SOURCES)
+    cluster(db)
+    for age in (200, 120, 10):
+        db.execute(
+            "UPDATE articles SET collected_at = ? WHERE url_canonical = ?",
+            (NOW - age * DAY, f"https://ex.com/short/{age}"),
+        )
+    cfg = RetentionConfig(move_to_archive_days=150, inactive_story_days=90, archive=True)
+    result = apply_retention(db, cfg, archive_dir=tmp_path / "archive", now=NOW)
+
+    # The fixture's old stories are all younger than 150 days: only deleted
+    assert (result.articles_archived, result.articles_deleted) == (1, 6)
+    assert {r[0] for r in db.execute("SELECT title FROM articles")} == {
+        "Foxtrot robotics startup raises series funding",
+        "Golf simulator maker open sources physics engine",
+        "Short 10",
+    }
+    with Database(tmp_path / "archive" / f"{month_of(NOW - 200 * DAY)}.db") as archive:
+        assert archive.execute("SELECT title FROM articles").fetchall()[0][0] == "Short 200"
+    records = [json.loads(line) for p in result.archive_files for line in p.read_text().splitlines()]
+    short = next(r for r in records if r["title"] == "Short 120")
+    assert "story" not in short and short["collected_at"] == NOW - 120 * DAY
+    retired = {r[0] for r in db.execute("SELECT url_canonical FROM retired_urls")}
+    assert {"https://ex.com/short/200", "https://ex.com/short/120"} <= retired
+    assert "https://ex.com/short/10" not in retired
+
+
+def test_archive_requires_directory(db):
+    with pytest.raises(ValueError, match="archive"):
+        apply_retention(db, RetentionConfig(inactive_story_days=90, archive=True), now=NOW)
+    assert _counts(db)["stories"] == 7
+
+
+def test_run_history_keeps_latest_run(db):
+    for started in (NOW - 40 * DAY, NOW - 35 * DAY, NOW - 31 * DAY, NOW - DAY):
+        run_id = db.execute("INSERT INTO pipeline_runs (started_at) VALUES (?)", (started,)).lastrowid
+        db.execute(
+            """INSERT INTO pipeline_stage_metrics (run_id, seq, stage, wall_ms, cpu_ms, sql_statements)
+               VALUES (?, 0, 'collect', 1.0, 1.0, 1)""",
+            (run_id,),
+        )
+
+    result = apply_retention(db, RetentionConfig(run_history_days=30, batch_size=2), now=NOW)
+    assert (result.runs_deleted, result.batches) == (3, 2)
+    assert db.execute("SELECT COUNT(*) FROM pipeline_stage_metrics").fetchone()[0] == 1
+
+    # The latest run survives even when it is past the cutoff
+    result = apply_retention(db, RetentionConfig(run_history_days=30), now=NOW + 60 * DAY)
+    assert result.runs_deleted == 0
+    assert db.execute("SELECT COUNT(*) FROM pipeline_runs").fetchone()[0] == 1
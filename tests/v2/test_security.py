@@ -5,7 +5,7 @@ Tests cover:
 - AC02: Title length cap (>500 chars truncated, not dropped)
 - AC03: Null byte rejection (null bytes in URL -> drop; in title -> strip)
 - AC04: Injection pattern scan (patterns stripped; empty result -> drop)
-- AC05: Markdown escaping in project.py _render_story
+- AC05: Markdown escaping in project.py render_story
 """
 from __future__ import annotations
 
@@ -16,7 +16,7 @@ import pytest
 from herald.db import Database
 from herald.ingest import _sanitize_title, ingest_items
 from herald.models import RawItem, Source
-from herald.project import _escape_md, project_brief
+from herald.project import escape_md, project_brief
 
 
 # ---------------------------------------------------------------------------
@@ -250,18 +250,18 @@ class TestInjectionPattern:
 class TestMarkdownEscape:
     """Article and story titles have markdown-significant chars escaped."""
 
-    # Unit tests for _escape_md helper
+    # Unit tests for escape_md helper
     def test_markdown_escape_brackets(self):
-        assert _escape_md("[foo]") == r"\[foo\]"
+        assert escape_md("[foo]") == r"\[foo\]"
 
     def test_markdown_escape_parens(self):
-        assert _escape_md("(bar)") == r"\(bar\)"
+        assert escape_md("(bar)") == r"\(bar\)"
 
     def test_markdown_escape_mixed(self):
-        assert _escape_md("[click](http://evil)") == r"\[click\]\(http://evil\)"
+        assert escape_md("[click](http://evil)") == r"\[click\]\(http://evil\)"
 
     def test_markdown_escape_no_special_chars_unchanged(self):
-        assert _escape_md("Normal Title") == "Normal Title"
+        assert escape_md("Normal Title") == "Normal Title"
 
     # Integration: story title rendered in ### heading is escaped
     def test_markdown_escape_story_title_in_heading(self, tmp_path):
@@ -269,7 +269,7 @@ class TestMarkdownEscape:
         now = int(time.time())
         db.execute("INSERT INTO sources (id, name, weight) VALUES ('src1', 'HN', 0.5)")
         db.execute(
-            "INSERT INTO stories (id, title, score, story_type, canonical_article_id, "
+            "INSERT INTO stories (ulid, title, score, story_type, canonical_article_id, "
             "first_seen, last_updated, status) VALUES (?, ?, 1.0, 'news', NULL, ?, ?, 'active')",
             ("s1", "Title [with] brackets (and parens)", now, now),
         )
@@ -284,16 +284,19 @@ class TestMarkdownEscape:
         now = int(time.time())
         db.execute("INSERT INTO sources (id, name, weight) VALUES ('src1', 'HN', 0.5)")
         db.execute(
-            "INSERT INTO stories (id, title, score, story_type, canonical_article_id, "
+            "INSERT INTO stories (ulid, title, score, story_type, canonical_article_id, "
             "first_seen, last_updated, status) VALUES (?, ?, 1.0, 'news', NULL, ?, ?, 'active')",
             ("s1", "Story Title", now, now),
         )
         db.execute(
-            "INSERT INTO articles (id, url_original, url_canonical, title, origin_source_id, "
+            "INSERT INTO articles (ulid, url_original, url_canonical, title, origin_source_id, "
             "collected_at, score_base, scored_at, story_type) VALUES (?, ?, ?, ?, ?, ?, 1.0, ?, 'news')",
             ("a1", "http://x.com/a1", "http://x.com/a1", "Article [clickbait](evil)", "src1", now, now),
         )
-        db.execute("INSERT INTO story_articles (story_id, article_id) VALUES ('s1', 'a1')")
+        db.execute(
+            "INSERT INTO story_articles (story_id, article_id) "
+            "SELECT s.id, a.id FROM stories s, articles a WHERE s.ulid = 's1' AND a.ulid = 'a1'"
+        )
         result = project_brief(db)
         db.close()
         # The article title brackets and parens inside the link text must be escaped
@@ -0,0 +1,236 @@
+"""Tests for herald/server.py — local read-only query server."""
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import shutil
+import socket
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from herald.db import Database
+from herald.project import project_brief
+from herald.server import DATA_DIR_HEADER, QueryApp, is_loopback, open_server
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "herald.db"
+    db = Database(path)
+    now = int(time.time())
+    db.execute("INSERT INTO sources (id, name, weight) VALUES ('hn', 'Hacker News', 0.5)")
+    for i, (title, score, topic) in enumerate([
+        ("Rust 2.0 released with faster compiles", 3.0, "rust"),
+        ("Kubernetes operators explained", 2.0, None),
+    ]):
+        article_id = db.execute(
+            """INSERT INTO articles (ulid, url_original, url_canonical, title, origin_source_id,
+                                     collected_at, score_base, scored_at)
+               VALUES (?, ?, ?, ?, 'hn', ?, 1.0, ?)""",
+            (f"a{i}", f"https://example.com/{i}", f"https://example.com/{i}", title, now, now),
+        ).lastrowid
+        story_id = db.execute(
+            """INSERT INTO stories (ulid, title, score, story_type, first_seen, last_updated)
+               VALUES (?, ?, ?, 'news', ?, ?)""",
+            (f"s{i}", title, score, now, now),
+        ).lastrowid
+        db.execute("INSERT INTO story_articles (story_id, article_id) VALUES (?, ?)", (story_id, article_id))
+        if topic:
+            db.execute("INSERT INTO story_topics (story_id, topic) VALUES (?, ?)", (story_id, topic))
+    db.execute("INSERT INTO pipeline_runs (started_at, finished_at) VALUES (?, ?)", (now, now))
+    db.close()
+    return path
+
+
+@pytest.fixture
+def app(db_path):
+    db = Database(db_path, read_only=True)
+    yield QueryApp(db)
+    db.close()
+
+
+def _json(response):
+    assert response.status == 200, response.body
+    assert response.content_type == "application/json"
+    return json.loads(response.body)
+
+
+def test_brief_markdown_matches_cli(app, db_path):
+    response = app.handle("/brief")
+    assert response.content_type.startswith("text/markdown")
+    with Database(db_path) as db:
+        expected = project_brief(db)
+    body = response.body.decode()
+    # Only generated_at may differ
+    assert body.split("\n", 2)[2] == expected.split("\n", 2)[2]
+
+    data = _json(app.handle("/brief?format=json&topic=rust"))
+    assert [s["id"] for s in data["stories"]] == ["s0"]
+    assert data["stories"][0]["topics"] == ["rust"]
+    assert data["stories"][0]["articles"][0]["url"] == "https://example.com/0"
+
+
+def test_stories_detail_search_and_status(app):
+    stories = _json(app.handle("/stories?limit=5"))
+    assert [s["id"] for s in stories] == ["s0", "s1"]
+    assert stories[0]["article_count"] == 1
+
+    detail = _json(app.handle("/stories/s1"))
+    assert detail["title"] == "Kubernetes operators explained"
+    assert detail["articles"][0]["source_name"] == "Hacker News"
+    assert app.handle("/stories/nope").status == 404
+
+    results = _json(app.handle("/search?q=rust%20compiles"))
+    assert [s["id"] for s in results["stories"]] == ["s0"]
+    assert [a["id"] for a in results["articles"]] == ["a0"]
+    # FTS syntax in user input is treated as plain text
+    assert _json(app.handle('/search?q="unbalanced OR ('))["stories"] == []
+
+    status = _json(app.handle("/status"))
+    assert (status["articles"], status["stories"], status["last_run_id"]) == (2, 2, 1)
+    md = app.handle("/status", {"Accept": "text/markdown"}).body.decode()
+    assert md.startswith("Articles: 2\nStories:  2\nLast run: ")
+
+
+def test_bad_requests(app):
+    assert app.handle("/stories?limit=abc").status == 400
+    assert app.handle("/brief?format=html").status == 400
+    assert app.handle("/search").status == 400
+    assert app.handle("/nowhere").status == 404
+
+
+def test_etag_and_cache_invalidated_by_writes(app, db_path):
+    first = app.handle("/stories")
+    assert first.etag
+    assert app.handle("/stories") is first
+    not_modified = app.handle("/stories", {"If-None-Match": first.etag})
+    assert (not_modified.status, not_modified.body) == (304, b"")
+
+    with Database(db_path) as writer:
+        writer.execute("UPDATE stories SET score = 9.0 WHERE ulid = 's1'")
+
+    fresh = app.handle("/stories", {"If-None-Match": first.etag})
+    assert fresh.status == 200
+    assert fresh.etag != first.etag
+    assert [s["id"] for s in _json(fresh)] == ["s1", "s0"]
+
+
+def test_cache_expires_so_windows_slide(db_path):
+    now = [0.0]
+    with Database(db_path, read_only=True) as db:
+        app = QueryApp(db, clock=lambda: now[0])
+        first = app.handle("/status")
+        now[0] += 3600
+        assert app.handle("/status") is not first
+
+
+def test_rejects_non_loopback_host(db_path):
+    assert is_loopback("127.0.0.1") and is_loopback("::1") and is_loopback("localhost")
+    with pytest.raises(ValueError, match="non-loopback"):
+        open_server(db_path, host="0.0.0.0", port=0)
+
+
+def _serving(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_serves_http_on_loopback(db_path):
+    server = open_server(db_path, port=0)
+    thread = _serving(server)
+    try:
+        port = server.server_address[1]
+        timings = []
+        for _ in range(20):
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            started = time.perf_counter()
+            conn.request("GET", "/brief")
+            resp = conn.getresponse()
+            body = resp.read()
+            timings.append(time.perf_counter() - started)
+            etag = resp.getheader("ETag")
+            conn.close()
+        assert resp.status == 200 and body.startswith(b"---\n")
+        assert resp.getheader(DATA_DIR_HEADER) == str(db_path.parent.resolve())
+
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        conn.request("GET", "/brief", headers={"If-None-Match": etag})
+        resp = conn.getresponse()
+        assert (resp.status, resp.read()) == (304, b"")
+        conn.close()
+        # Cached responses over loopback stay in the low milliseconds
+        assert sorted(timings)[len(timings) // 2] < 0.05
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def test_serves_http_on_unix_socket(db_path, tmp_path):
+    sock_path = tmp_path / "herald.sock"
+    server = open_server(db_path, socket_path=sock_path)
+    thread = _serving(server)
+    try:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(str(sock_path))
+        client.sendall(b"GET /status HTTP/1.0\r\n\r\n")
+        raw = b""
+        while chunk := client.recv(65536):
+            raw += chunk
+        client.close()
+        head, body = raw.split(b"\r\n\r\n", 1)
+        assert head.startswith(b"HTTP/1.0 200")
+        assert json.loads(body)["articles"] == 2
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+    assert not sock_path.exists()
+
+
+
+_QUERY = Path(__file__).resolve().parents[2] / "hooks" / "query.sh"
+
+
+def _query(data_dir, server: str | None) -> subprocess.CompletedProcess:
+    env = dict(os.environ, HERALD_DATA_DIR=str(data_dir))
+    env.pop("HERALD_SERVER", None)
+    if server is not None:
+        env["HERALD_SERVER"] = server
+    return subprocess.run(["bash", str(_QUERY), "status"], capture_output=True, text=True, env=env, timeout=30)
+
+
+@pytest.mark.skipif(shutil.which("bash") is None or shutil.which("curl") is None, reason="needs bash and curl")
+def test_query_script_trusts_only_its_own_server(db_path, tmp_path):
+    sock = f"unix:{tmp_path / 'herald.sock'}"
+    server = open_server(db_path, socket_path=tmp_path / "herald.sock")
+    thread = _serving(server)
+    statements: list[str] = []
+    server.app.db._conn.set_trace_callback(statements.append)
+    try:
+        # Opt-in: without HERALD_SERVER the CLI answers
+        assert "Articles: 2" in _query(tmp_path, None).stdout
+        assert not statements
+        assert "Articles: 2" in _query(tmp_path, sock).stdout
+        assert statements
+
+        # A server for another data dir is asked but its answer is not used
+        other = tmp_path / "other"
+        other.mkdir()
+        statements.clear()
+        proc = _query(other, sock)
+        assert statements
+        assert "Articles" not in proc.stdout and "database not found" in proc.stderr
+
+        # Only loopback addresses are asked at all
+        assert "must be a loopback" in _query(tmp_path, "http://example.com:8765").stderr
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
@@ -1,7 +1,7 @@
 """Tests for herald.topics.extract_topics."""
 import pytest
 
-from herald.topics import extract_topics
+from herald.topics import TopicMatcher, extract_topics
 
 
 def test_returns_matching_topic():
@@ -42,3 +42,9 @@ def test_all_topics_when_all_match():
     rules = {"a": ["alpha"], "b": ["beta"]}
     result = extract_topics("alpha and beta together", rules)
     assert set(result) == {"a", "b"}
+
+
+def test_matcher_accepts_nested_rules():
+    matcher = TopicMatcher({"agents": {"keywords": ["MCP"]}, "rust": ["Cargo"]})
+    assert matcher.match("New MCP server for cargo") == ["agents", "rust"]
+    assert extract_topics("mcp", matcher) == ["agents"]